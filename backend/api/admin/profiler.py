@@ -0,0 +1,62 @@
+"""Administrative control of the sampling profiler for diagnosing slow requests in production.
+
+Turning the profiler on takes effect immediately, without a restart, and it turns itself off
+when the requested window elapses. Collected stacks are served in the collapsed format that
+flamegraph tools, such as speedscope or `flamegraph.pl`, accept as input.
+
+This API is for administrative purposes only."""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from ...services.profiler import ProfilerService
+from ...models import User, ProfilerSettings, ProfilerStatus
+from ..authentication import registered_user
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+openapi_tags = {
+    "name": "(Admin) Profiler",
+    "description": "Sample stacks of live requests to diagnose slow end points.",
+}
+
+api = APIRouter(prefix="/api/admin/profiler")
+
+
+@api.get("", tags=["(Admin) Profiler"])
+def get_profiler_status(
+    subject: User = Depends(registered_user),
+    profiler_service: ProfilerService = Depends(),
+) -> ProfilerStatus:
+    """Report whether the profiler is on and how much it has collected."""
+    return profiler_service.status(subject)
+
+
+@api.put("", tags=["(Admin) Profiler"])
+def start_profiler(
+    settings: ProfilerSettings,
+    subject: User = Depends(registered_user),
+    profiler_service: ProfilerService = Depends(),
+) -> ProfilerStatus:
+    """Profile a fraction of requests for a window of time, discarding earlier samples."""
+    return profiler_service.start(subject, settings)
+
+
+@api.delete("", tags=["(Admin) Profiler"])
+def stop_profiler(
+    subject: User = Depends(registered_user),
+    profiler_service: ProfilerService = Depends(),
+) -> ProfilerStatus:
+    """Turn the profiler off early, keeping the stacks collected so far."""
+    return profiler_service.stop(subject)
+
+
+@api.get("/stacks", tags=["(Admin) Profiler"], response_class=PlainTextResponse)
+def get_profiler_stacks(
+    route: str | None = None,
+    subject: User = Depends(registered_user),
+    profiler_service: ProfilerService = Depends(),
+) -> str:
+    """Collected stacks in collapsed format, optionally of a single route, e.g. `GET /api/events`."""
+    return profiler_service.collapsed_stacks(subject, route)
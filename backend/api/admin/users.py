@@ -1,8 +1,10 @@
 """User administration API."""
 
-from fastapi import APIRouter, Depends, HTTPException
-from ...services import UserService, UserPermissionException
-from ...models import User, Paginated, PaginationParams
+import io
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
+from ...services import UserService, UserImportService, UserPermissionException
+from ...models import User, Paginated, PaginationParams, UserImportSummary
+from ...models.pagination import MAX_PAGE_SIZE
 from ..authentication import registered_user
 
 
@@ -22,16 +24,38 @@ api = APIRouter(prefix="/api/admin/users")
 def list_users(
     subject: User = Depends(registered_user),
     user_service: UserService = Depends(),
-    page: int = 0,
-    page_size: int = 10,
+    page: int = Query(default=0, ge=0),
+    page_size: int = Query(default=10, ge=1, le=MAX_PAGE_SIZE),
     order_by: str = "first_name",
     filter: str = "",
+    cursor: str = "",
+    count: bool = True,
 ) -> Paginated[User]:
     """List users via standard backend pagination query parameters."""
     try:
         pagination_params = PaginationParams(
-            page=page, page_size=page_size, order_by=order_by, filter=filter
+            page=page,
+            page_size=page_size,
+            order_by=order_by,
+            filter=filter,
+            cursor=cursor,
+            count=count,
         )
         return user_service.list(subject, pagination_params)
     except UserPermissionException as e:
         raise HTTPException(status_code=403, detail=str(e))
+
+
+@api.post("/import", tags=["(Admin) Users"])
+def import_users(
+    file: UploadFile,
+    section_id: int | None = None,
+    subject: User = Depends(registered_user),
+    user_import_service: UserImportService = Depends(),
+) -> UserImportSummary:
+    """Create and update users in bulk from an uploaded CSV file, optionally enrolling them in a section."""
+    try:
+        csv_file = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        return user_import_service.import_csv(subject, csv_file, section_id)
+    except UserPermissionException as e:
+        raise HTTPException(status_code=403, detail=str(e))
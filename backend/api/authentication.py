@@ -48,7 +48,8 @@ In development, the proxy is not present. Instead, there are two options for aut
        request from the development/stage server is made to the production server's `/auth/verify` route
        to verify the token's validity. If the token is valid, the development/staging server then 
        issues a new `token` to the client that is signed by the development/staging server. 
-       This token is then used for all subsequent requests.
+       This token is then used for all subsequent requests. Verification requests reuse pooled
+       connections, time out rather than stall sign in, and their results are cached briefly.
 2. If an unauthenticated user visits /auth/as/{uid}/{pid} in development, they are authenticated
     as the user with the given `uid` and `pid`, which are their ONYEN and PID, respectively. 
     This route is only available in development mode.
@@ -60,7 +61,11 @@ for routes used in the process of registering a user.
 
 import jwt
 import requests
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from time import monotonic, time
+from requests.adapters import HTTPAdapter
 from fastapi import APIRouter, Header, HTTPException, Request, Response, Depends
 from fastapi.exceptions import HTTPException
 from fastapi.security import HTTPBearer
@@ -68,6 +73,7 @@ from fastapi.security.http import HTTPAuthorizationCredentials
 from fastapi.responses import RedirectResponse
 from ..env import getenv
 from ..services import UserService, GitHubService
+from ..services.user_cache import user_cache
 from ..models import User
 
 
@@ -82,19 +88,79 @@ AUTH_SERVER_HOST = "csxl.unc.edu"
 _JWT_SECRET = getenv("JWT_SECRET")
 _JST_ALGORITHM = "HS256"
 
+_AUTH_SERVER_VERIFY_URL = f"https://{AUTH_SERVER_HOST}/verify"
+_AUTH_SERVER_TIMEOUT = (3.05, 10.0)  # Seconds to connect and to wait for a response
+_VERIFIED_TOKEN_TTL_SECONDS = 300.0
+
+
+class _VerifiedTokenCache:
+    """Bounded cache of the claims the authentication server verified for delegated tokens.
+
+    A browser retrying a delegated sign in presents the same token again, which is then
+    reissued without another round trip to the authentication server."""
+
+    def __init__(self, max_size: int = 1_000, ttl_seconds: float = 300.0):
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or monotonic() >= entry[0]:
+                self._entries.pop(token, None)
+                return None
+            return entry[1]
+
+    def put(self, token: str, claims: dict) -> None:
+        with self._lock:
+            self._entries[token] = (monotonic() + self._ttl_seconds, claims)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _auth_server_session() -> requests.Session:
+    """A session that keeps connections to the authentication server open between sign ins."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=10)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_auth_server = _auth_server_session()
+_verified_tokens = _VerifiedTokenCache(ttl_seconds=_VERIFIED_TOKEN_TTL_SECONDS)
+
 
 def registered_user(
     user_service: UserService = Depends(),
     token: HTTPAuthorizationCredentials | None = Depends(HTTPBearer()),
 ) -> User:
-    """Returns the authenticated user or raises a 401 HTTPException if the user is not authenticated."""
+    """Returns the authenticated user or raises a 401 HTTPException if the user is not authenticated.
+
+    Users of recently verified tokens are cached, so most requests authenticate without decoding
+    the token again or querying the database.
+    """
     if token:
+        # Tokens are only cached once verified and never beyond their expiration
+        user = user_cache.get(token.credentials)
+        if user:
+            # Routes may modify their subject, e.g. when linking a GitHub account
+            return user.model_copy()
         try:
             auth_info = jwt.decode(
                 token.credentials, _JWT_SECRET, algorithms=[_JST_ALGORITHM]
             )
-            user = user_service.get(auth_info["pid"])
+            user = user_service.get_by_pid(auth_info["pid"])
             if user:
+                token_ttl = auth_info["exp"] - time() if "exp" in auth_info else None
+                user_cache.put(token.credentials, user.model_copy(), token_ttl)
                 return user
         except:
             ...
@@ -226,17 +292,28 @@ def _delegate_to_auth_server(continue_to: str):
 
 
 def _verify_delegated_auth_token(continue_to: str, token: str):
-    params = {"token": token}
-    response = requests.get(f"https://{AUTH_SERVER_HOST}/verify", params=params)
-    if response.status_code == requests.codes.ok:
-        # Generate a token for development app based on verified information
+    body = _verified_tokens.get(token)
+    if body is None:
+        try:
+            response = _auth_server.get(
+                _AUTH_SERVER_VERIFY_URL,
+                params={"token": token},
+                timeout=_AUTH_SERVER_TIMEOUT,
+            )
+        except requests.exceptions.RequestException:
+            raise HTTPException(
+                status_code=503, detail="The authentication server is unavailable."
+            )
+        if response.status_code != requests.codes.ok:
+            raise HTTPException(status_code=401, detail="You are not authenticated.")
         body = response.json()
-        uid = body["uid"]
-        pid = body["pid"]
-        new_token = _generate_token(uid, pid)
-        return _set_client_token(new_token, continue_to)
-    else:
-        raise HTTPException(status_code=401, detail="You are not authenticated.")
+        _verified_tokens.put(token, body)
+
+    # Generate a token for development app based on verified information
+    uid = body["uid"]
+    pid = body["pid"]
+    new_token = _generate_token(uid, pid)
+    return _set_client_token(new_token, continue_to)
 
 
 def _handle_auth_in_production(
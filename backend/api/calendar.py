@@ -0,0 +1,119 @@
+"""Calendar API
+
+iCalendar feeds of events, for subscribing to from calendar apps. Feeds are cached and served
+conditionally, so that apps polling for changes are cheap to answer."""
+
+from fastapi import APIRouter, Depends, Request, Response
+
+from ..services.calendar import CalendarFeed, CalendarService
+from ..models import User
+from .authentication import registered_user
+from .conditional import conditional_response
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+api = APIRouter(prefix="/api/calendar")
+openapi_tags = {
+    "name": "Calendar",
+    "description": "Subscribe to events from calendar apps.",
+}
+
+# Calendar apps may keep their copy for a few minutes before revalidating it
+_MAX_AGE_SECONDS = 300
+
+
+@api.get("/events.ics", tags=["Calendar"], response_class=Response)
+def get_public_events_feed(
+    request: Request, calendar_service: CalendarService = Depends()
+) -> Response:
+    """
+    Get the iCalendar feed of all public events.
+
+    Returns:
+        Response: The feed, or 304 if the client's copy is current
+    """
+    return _feed_response(request, calendar_service.get_public_feed())
+
+
+@api.get("/organization/{slug}.ics", tags=["Calendar"], response_class=Response)
+def get_organization_events_feed(
+    slug: str, request: Request, calendar_service: CalendarService = Depends()
+) -> Response:
+    """
+    Get the iCalendar feed of the public events of an organization.
+
+    Args:
+        slug: a valid str representing a unique Organization
+
+    Returns:
+        Response: The feed, or 304 if the client's copy is current
+
+    Raises:
+        HTTPException 404 if no organization has the slug
+    """
+    return _feed_response(request, calendar_service.get_organization_feed(slug))
+
+
+@api.get("/user/{token}.ics", tags=["Calendar"], response_class=Response)
+def get_user_events_feed(
+    token: str, request: Request, calendar_service: CalendarService = Depends()
+) -> Response:
+    """
+    Get the iCalendar feed of the events a user is registered for.
+
+    The feed is not authenticated by a bearer token, since calendar apps cannot send one.
+    Instead, its URL contains a token only the user is given, see `get_user_feed_url`.
+
+    Args:
+        token: the user's feed token
+
+    Returns:
+        Response: The feed, or 304 if the client's copy is current
+
+    Raises:
+        HTTPException 404 if the token is invalid
+    """
+    return _feed_response(request, calendar_service.get_user_feed(token))
+
+
+@api.get("/user", tags=["Calendar"])
+def get_user_feed_url(
+    subject: User = Depends(registered_user),
+    calendar_service: CalendarService = Depends(),
+) -> str:
+    """
+    Get the path of the feed of the events the logged in user is registered for.
+
+    Returns:
+        str: The path to subscribe to, which should not be shared
+    """
+    return f"{api.prefix}/user/{calendar_service.get_feed_token(subject)}.ics"
+
+
+@api.post("/user", tags=["Calendar"])
+def reset_user_feed_url(
+    subject: User = Depends(registered_user),
+    calendar_service: CalendarService = Depends(),
+) -> str:
+    """
+    Replace the path of the logged in user's feed, e.g. after it was shared by mistake.
+
+    The previous path stops working.
+
+    Returns:
+        str: The new path to subscribe to, which should not be shared
+    """
+    return f"{api.prefix}/user/{calendar_service.reset_feed_token(subject)}.ics"
+
+
+def _feed_response(request: Request, feed: CalendarFeed) -> Response:
+    return conditional_response(
+        request,
+        feed.body,
+        feed.etag,
+        feed.last_modified,
+        media_type="text/calendar",
+        max_age=_MAX_AGE_SECONDS,
+    )
@@ -0,0 +1,61 @@
+"""Conditional GET support for responses that clients revalidate by ETag and Last-Modified.
+
+Clients that poll a resource send back the validators of the copy they have. When it is still
+current, they are answered with an empty `304 Not Modified` rather than the full body."""
+
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def conditional_response(
+    request: Request,
+    body: str,
+    etag: str,
+    last_modified: datetime,
+    media_type: str,
+    max_age: int = 0,
+) -> Response:
+    """Respond with a body, or with 304 if the client's copy is current.
+
+    Per RFC 9110, `If-None-Match` takes precedence over `If-Modified-Since` when both are sent.
+
+    Args:
+        request (Request): The request, whose conditional headers are checked.
+        body (str): The representation to respond with.
+        etag (str): The quoted entity tag of the representation.
+        last_modified (datetime): When the representation last changed, with a timezone.
+        media_type (str): The media type of the representation.
+        max_age (int): How many seconds clients may use their copy before revalidating.
+
+    Returns:
+        Response: The full response, or an empty 304 response with the same validators.
+    """
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": f"max-age={max_age}, must-revalidate",
+    }
+    if _is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def _is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison, since compression by middleware does not change the content
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
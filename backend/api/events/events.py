@@ -2,11 +2,13 @@
 
 Event routes are used to create, retrieve, and update Events."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from datetime import datetime, timedelta
 from typing import Sequence
-from backend.models.public_user import PublicUser
-from backend.models.pagination import Paginated, PaginationParams
+from pydantic import ValidationError
+from backend.models.public_user import PublicUser, RegisteredUser
+from backend.models.pagination import MAX_PAGE_SIZE, Paginated, PaginationParams
 
 from backend.services.organization import OrganizationService
 
@@ -14,6 +16,7 @@ from ...services.event import EventService
 from ...services.user import UserService
 from ...services.exceptions import ResourceNotFoundException, UserPermissionException
 from ...models.event import DraftEvent
+from ...models.event_registration import RegistrationWindow
 from ...models.event_details import EventDetails
 from ...models.coworking.time_range import TimeRange
 from ...api.authentication import registered_user
@@ -35,6 +38,9 @@ openapi_tags = {
     "description": "Create, update, delete, and retrieve CS Events.",
 }
 
+# Bounds the size of the single query that searches all windows
+MAX_REGISTRATION_WINDOWS = 52
+
 
 @api.get("", response_model=list[EventDetails], tags=["Events"])
 def get_events(
@@ -53,6 +59,38 @@ def get_events(
     return event_service.all(subject)
 
 
+@api.get("/paginated", tags=["Events"])
+def get_paginated_events(
+    subject: User = Depends(registered_user),
+    event_service: EventService = Depends(),
+    start: datetime | None = None,
+    end: datetime | None = None,
+    page: int = Query(default=0, ge=0),
+    page_size: int = Query(default=10, ge=1, le=MAX_PAGE_SIZE),
+    order_by: str = "time",
+    cursor: str = "",
+    count: bool = True,
+) -> Paginated[EventDetails]:
+    """
+    List events in the time range via standard backend pagination query parameters
+
+    Args:
+        subject: a valid User model representing the currently logged in User
+        event_service: a valid EventService
+        start (optional): a datetime object representing the start time of the range.
+        end (optional): a datetime object representing the end time of the range.
+
+    Returns:
+        Paginated[EventDetails]: The `EventDetails`s in the time range, upcoming by default
+    """
+    pagination_params = PaginationParams(
+        page=page, page_size=page_size, order_by=order_by, cursor=cursor, count=count
+    )
+    return event_service.get_paginated_events(
+        pagination_params, _search_time_range(start, end), subject=subject
+    )
+
+
 @api.get("/range", response_model=list[EventDetails], tags=["Events"])
 def get_events_in_time_range(
     subject: User = Depends(registered_user),
@@ -74,12 +112,17 @@ def get_events_in_time_range(
     """
     start = datetime.now() if start is None else start
     end = datetime.now() + timedelta(days=365) if end is None else end
-    time_range = TimeRange(start=start, end=end)
+    time_range = _time_range(start, end)
 
     return event_service.get_events_in_time_range(time_range, subject)
 
 
-@api.get("/organization/{slug}", response_model=list[EventDetails], tags=["Events"])
+@api.get(
+    "/organization/{slug}",
+    response_model=list[EventDetails],
+    tags=["Events"],
+    deprecated=True,
+)
 def get_events_by_organization(
     slug: str,
     subject: User = Depends(registered_user),
@@ -89,6 +132,9 @@ def get_events_by_organization(
     """
     Get all events from an organization
 
+    Deprecated: this lists every event the organization has ever hosted. Use
+    `/organization/{slug}/paginated` instead.
+
     Args:
         slug: a valid str representing a unique Organization
         subject: a valid User model representing the currently logged in User
@@ -98,10 +144,179 @@ def get_events_by_organization(
     Returns:
         list[EventDetails]: All `EventDetails`s in the `Event` database table from a specific organization
     """
-    organization = organization_service.get_by_slug(slug)
+    organization = organization_service.get(slug)
     return event_service.get_events_by_organization(organization, subject)
 
 
+@api.get("/organization/{slug}/paginated", tags=["Events"])
+def get_paginated_events_by_organization(
+    slug: str,
+    subject: User = Depends(registered_user),
+    event_service: EventService = Depends(),
+    organization_service: OrganizationService = Depends(),
+    start: datetime | None = None,
+    end: datetime | None = None,
+    page: int = Query(default=0, ge=0),
+    page_size: int = Query(default=10, ge=1, le=MAX_PAGE_SIZE),
+    order_by: str = "time",
+    cursor: str = "",
+    count: bool = True,
+) -> Paginated[EventDetails]:
+    """
+    List the events of an organization via standard backend pagination query parameters
+
+    Args:
+        slug: a valid str representing a unique Organization
+        subject: a valid User model representing the currently logged in User
+        event_service: a valid EventService
+        organization_service: a valid OrganizationService
+        start (optional): a datetime object representing the start time of the range.
+        end (optional): a datetime object representing the end time of the range.
+
+    Returns:
+        Paginated[EventDetails]: The organization's `EventDetails`s, upcoming by default
+    """
+    pagination_params = PaginationParams(
+        page=page, page_size=page_size, order_by=order_by, cursor=cursor, count=count
+    )
+    organization = organization_service.get(slug)
+    return event_service.get_paginated_events(
+        pagination_params, _search_time_range(start, end), organization, subject
+    )
+
+
+@api.get("/search", tags=["Events"])
+def search_events(
+    subject: User = Depends(registered_user),
+    event_service: EventService = Depends(),
+    filter: str = "",
+    start: datetime | None = None,
+    end: datetime | None = None,
+    page: int = Query(default=0, ge=0),
+    page_size: int = Query(default=10, ge=1, le=MAX_PAGE_SIZE),
+    order_by: str = "rank",
+    cursor: str = "",
+    count: bool = True,
+) -> Paginated[EventDetails]:
+    """
+    Search events by their name, location, and description via standard backend pagination
+    query parameters
+
+    Args:
+        subject: a valid User model representing the currently logged in User
+        event_service: a valid EventService
+        filter: the search query
+        start (optional): a datetime object representing the start time of the range.
+        end (optional): a datetime object representing the end time of the range.
+        order_by: "rank" to order by relevance, or "time"
+
+    Returns:
+        Paginated[EventDetails]: The matching `EventDetails`s, upcoming by default
+    """
+    pagination_params = PaginationParams(
+        page=page,
+        page_size=page_size,
+        order_by=order_by,
+        filter=filter,
+        cursor=cursor,
+        count=count,
+    )
+    return event_service.search(
+        pagination_params, _search_time_range(start, end), subject
+    )
+
+
+@api.get("/search/unauthenticated", tags=["Events"])
+def search_events_unauthenticated(
+    event_service: EventService = Depends(),
+    filter: str = "",
+    start: datetime | None = None,
+    end: datetime | None = None,
+    page: int = Query(default=0, ge=0),
+    page_size: int = Query(default=10, ge=1, le=MAX_PAGE_SIZE),
+    order_by: str = "rank",
+    cursor: str = "",
+    count: bool = True,
+) -> Paginated[EventDetails]:
+    """
+    Search events by their name, location, and description, without registration statuses
+
+    Args:
+        event_service: a valid EventService
+        filter: the search query
+        start (optional): a datetime object representing the start time of the range.
+        end (optional): a datetime object representing the end time of the range.
+        order_by: "rank" to order by relevance, or "time"
+
+    Returns:
+        Paginated[EventDetails]: The matching `EventDetails`s, upcoming by default
+    """
+    pagination_params = PaginationParams(
+        page=page,
+        page_size=page_size,
+        order_by=order_by,
+        filter=filter,
+        cursor=cursor,
+        count=count,
+    )
+    return event_service.search(pagination_params, _search_time_range(start, end))
+
+
+def _search_time_range(start: datetime | None, end: datetime | None) -> TimeRange:
+    """The time range of a paginated listing or search of events, all upcoming by default."""
+    return _time_range(
+        datetime.now() if start is None else start,
+        datetime.max if end is None else end,
+    )
+
+
+def _time_range(start: datetime, end: datetime) -> TimeRange:
+    """Build a time range from query parameters, rejecting one that ends before it starts."""
+    try:
+        return TimeRange(start=start, end=end)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422, detail="; ".join(error["msg"] for error in e.errors())
+        )
+
+
+@api.post("/registrations/user", tags=["Events"])
+def get_registered_events_of_user(
+    windows: list[RegistrationWindow],
+    user_id: int = -1,
+    subject: User = Depends(registered_user),
+    event_service: EventService = Depends(),
+    user_service: UserService = Depends(),
+) -> list[list[EventDetails]]:
+    """
+    Get the events a user is registered for in each of several windows of time at once.
+
+    If the user_id parameter is not passed, the logged in user's registrations are found.
+    Another user's ID is expected when an administrator is looking up a user's registrations.
+
+    Args:
+        windows: the periods, each optionally limited to an organization, to search
+        user_id: (optional) an int representing the user whose registrations are found
+        subject: a valid User model representing the currently logged in User
+        event_service: a valid EventService
+        user_service: a valid UserService
+
+    Returns:
+        list[list[EventDetails]]: For each window, the events the user is registered for
+    """
+    if len(windows) > MAX_REGISTRATION_WINDOWS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {MAX_REGISTRATION_WINDOWS} windows may be searched at once",
+        )
+    if user_id == -1 and subject.id is not None:
+        user = subject
+    else:
+        user = user_service.get_by_id(user_id)
+
+    return event_service.get_registered_events_of_user(subject, user, windows)
+
+
 @api.get(
     "/{id}",
     responses={404: {"model": None}},
@@ -166,7 +381,7 @@ def get_events_in_time_range_unauthenticated(
     """
     start = datetime.now() if start is None else start
     end = datetime.now() + timedelta(days=365) if end is None else end
-    time_range = TimeRange(start=start, end=end)
+    time_range = _time_range(start, end)
 
     return event_service.get_events_in_time_range(time_range)
 
@@ -175,6 +390,7 @@ def get_events_in_time_range_unauthenticated(
     "/organization/{slug}/unauthenticated",
     response_model=list[EventDetails],
     tags=["Events"],
+    deprecated=True,
 )
 def get_events_by_organization_unauthenticated(
     slug: str,
@@ -184,6 +400,9 @@ def get_events_by_organization_unauthenticated(
     """
     Get all events from an organization for unauthenticated users
 
+    Deprecated: this lists every event the organization has ever hosted. Use
+    `/organization/{slug}/paginated/unauthenticated` instead.
+
     Args:
         slug: a valid str representing a unique Organization
         event_service: a valid EventService
@@ -192,10 +411,45 @@ def get_events_by_organization_unauthenticated(
     Returns:
         list[EventDetails]: All `EventDetails`s in the `Event` database table from a specific organization
     """
-    organization = organization_service.get_by_slug(slug)
+    organization = organization_service.get(slug)
     return event_service.get_events_by_organization(organization)
 
 
+@api.get("/organization/{slug}/paginated/unauthenticated", tags=["Events"])
+def get_paginated_events_by_organization_unauthenticated(
+    slug: str,
+    event_service: EventService = Depends(),
+    organization_service: OrganizationService = Depends(),
+    start: datetime | None = None,
+    end: datetime | None = None,
+    page: int = Query(default=0, ge=0),
+    page_size: int = Query(default=10, ge=1, le=MAX_PAGE_SIZE),
+    order_by: str = "time",
+    cursor: str = "",
+    count: bool = True,
+) -> Paginated[EventDetails]:
+    """
+    List the events of an organization for unauthenticated users, without registration statuses
+
+    Args:
+        slug: a valid str representing a unique Organization
+        event_service: a valid EventService
+        organization_service: a valid OrganizationService
+        start (optional): a datetime object representing the start time of the range.
+        end (optional): a datetime object representing the end time of the range.
+
+    Returns:
+        Paginated[EventDetails]: The organization's `EventDetails`s, upcoming by default
+    """
+    pagination_params = PaginationParams(
+        page=page, page_size=page_size, order_by=order_by, cursor=cursor, count=count
+    )
+    organization = organization_service.get(slug)
+    return event_service.get_paginated_events(
+        pagination_params, _search_time_range(start, end), organization
+    )
+
+
 @api.get(
     "/{id}/unauthenticated",
     responses={404: {"model": None}},
@@ -284,7 +538,7 @@ def register_for_event(
     subject: User = Depends(registered_user),
     event_service: EventService = Depends(),
     user_service: UserService = Depends(),
-) -> PublicUser:
+) -> RegisteredUser:
     """
     Register a user event based on the event ID.
 
@@ -299,7 +553,8 @@ def register_for_event(
         event_service: a valid EventService
 
     Returns:
-        EventRegistration details
+        RegisteredUser: The registered user, with the type of their registration, which
+            tells whether they were waitlisted
     """
     if user_id == -1 and subject.id is not None:
         user = subject
@@ -332,6 +587,31 @@ def get_event_registration_of_user(
         return event_registration
 
 
+@api.get("/{event_id}/registration/waitlist_position", tags=["Events"])
+def get_waitlist_position_of_user(
+    event_id: int,
+    subject: User = Depends(registered_user),
+    event_service: EventService = Depends(),
+) -> int:
+    """
+    Get the place in line of the logged in user on the waitlist of an event, raise
+    ResourceNotFound if not waitlisted.
+
+    Args:
+        event_id: the int identifier of an Event
+        subject: the logged in user making the request
+        event_service: the backing service
+
+    Returns:
+        int: The user's position, where 1 is next to be promoted
+    """
+    event: EventDetails = event_service.get_by_id(event_id, subject)
+    position = event_service.get_waitlist_position(subject, subject, event)
+    if position is None:
+        raise ResourceNotFoundException("You are not on the waitlist for this event")
+    return position
+
+
 @api.get("/{event_id}/registrations", tags=["Events"])
 def get_event_registrations(
     event_id: int,
@@ -386,10 +666,12 @@ def get_registered_users_of_event(
     event_id: int,
     subject: User = Depends(registered_user),
     event_service: EventService = Depends(),
-    page: int = 0,
-    page_size: int = 10,
+    page: int = Query(default=0, ge=0),
+    page_size: int = Query(default=10, ge=1, le=MAX_PAGE_SIZE),
     order_by: str = "first_name",
     filter: str = "",
+    cursor: str = "",
+    count: bool = True,
 ) -> Paginated[User]:
     """
         List registered users for an event via standard backend pagination query parameters.
@@ -404,10 +686,50 @@ def get_registered_users_of_event(
     """
     try:
         pagination_params = PaginationParams(
-            page=page, page_size=page_size, order_by=order_by, filter=filter
+            page=page,
+            page_size=page_size,
+            order_by=order_by,
+            filter=filter,
+            cursor=cursor,
+            count=count,
         )
         return event_service.get_registered_users_of_event(
             subject, event_id, pagination_params
         )
     except UserPermissionException as e:
         raise HTTPException(status_code=403, detail=str(e))
+
+
+@api.get(
+    "/{event_id}/registrations/csv",
+    tags=["Events"],
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/csv": {}}}},
+)
+def export_event_registrations(
+    event_id: int,
+    subject: User = Depends(registered_user),
+    event_service: EventService = Depends(),
+) -> StreamingResponse:
+    """
+    Download the registrations of an event as CSV.
+
+    The roster is streamed as it is read from the database, so events of any size export in
+    one request.
+
+    Args:
+        event_id: an int representing a unique Event
+        subject: a valid User model representing the currently logged in User
+        event_service: a valid EventService
+
+    Returns:
+        StreamingResponse: The CSV roster, as an attachment
+    """
+    rows = event_service.export_registrations_csv(subject, event_id)
+    return StreamingResponse(
+        rows,
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="event-{event_id}-registrations.csv"'
+        },
+    )
@@ -2,12 +2,19 @@
 
 Organization routes are used to create, retrieve, and update Organizations."""
 
-from fastapi import APIRouter, Depends
+from datetime import datetime
 
-from ..services import OrganizationService
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import ValidationError
+
+from ..services import EventService, OrganizationService
+from ..models.coworking.time_range import TimeRange
+from ..models.event_details import EventDetails
 from ..models.organization import Organization
 from ..models.organization_details import OrganizationDetails
+from ..models.pagination import MAX_PAGE_SIZE, Paginated, PaginationParams
 from ..api.authentication import registered_user
+from .conditional import conditional_response
 from ..models.user import User
 
 __authors__ = ["Ajay Gandecha", "Jade Keegan", "Brianna Ta", "Audrey Toney"]
@@ -23,20 +30,33 @@ openapi_tags = {
 
 @api.get("", response_model=list[Organization], tags=["Organizations"])
 def get_organizations(
+    request: Request,
     organization_service: OrganizationService = Depends(),
-) -> list[Organization]:
+) -> Response:
     """
     Get all organizations
 
+    The organizations are served from the directory cached in the worker process, and
+    conditionally, so that clients revalidating their copy are answered without a body.
+
     Parameters:
+        request: the request, whose conditional headers are checked
         organization_service: a valid OrganizationService
 
     Returns:
-        list[Organization]: All `Organization`s in the `Organization` database table
+        list[Organization]: All `Organization`s in the `Organization` database table, or 304
+            if the client's copy is current
     """
 
     # Return all organizations
-    return organization_service.all()
+    directory = organization_service.get_directory()
+    return conditional_response(
+        request,
+        directory.body,
+        directory.etag,
+        directory.last_modified,
+        "application/json",
+    )
 
 
 @api.post("", response_model=Organization, tags=["Organizations"])
@@ -89,6 +109,61 @@ def get_organization_by_slug(
     return organization_service.get_by_slug(slug)
 
 
+@api.get(
+    "/{slug}/events",
+    responses={404: {"model": None}},
+    response_model=Paginated[EventDetails],
+    tags=["Organizations"],
+)
+def get_organization_events(
+    slug: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    page: int = Query(default=0, ge=0),
+    page_size: int = Query(default=10, ge=1, le=MAX_PAGE_SIZE),
+    order_by: str = "time",
+    cursor: str = "",
+    count: bool = True,
+    organization_service: OrganizationService = Depends(),
+    event_service: EventService = Depends(),
+) -> Paginated[EventDetails]:
+    """
+    List the events an organization has hosted via standard backend pagination query parameters
+
+    Organization details only include the next few upcoming events, so the organization's
+    history of events is paged through here.
+
+    Parameters:
+        slug: a string representing a unique identifier for an Organization
+        start (optional): a datetime object representing the start time of the range
+        end (optional): a datetime object representing the end time of the range
+        organization_service: a valid OrganizationService
+        event_service: a valid EventService
+
+    Returns:
+        Paginated[EventDetails]: The organization's events in the time range, all by default
+
+    Raises:
+        HTTPException 404 if get() raises an Exception
+    """
+    try:
+        time_range = TimeRange(
+            start=datetime.min if start is None else start,
+            end=datetime.max if end is None else end,
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422, detail="; ".join(error["msg"] for error in e.errors())
+        )
+    pagination_params = PaginationParams(
+        page=page, page_size=page_size, order_by=order_by, cursor=cursor, count=count
+    )
+    organization = organization_service.get(slug)
+    return event_service.get_paginated_events(
+        pagination_params, time_range, organization
+    )
+
+
 @api.put(
     "",
     responses={404: {"model": None}},
@@ -0,0 +1,31 @@
+"""Permission checks open to registered users, answered in batches to save round trips."""
+
+from fastapi import APIRouter, Depends
+from ..services import PermissionService
+from ..models import User, Permission
+from .authentication import registered_user
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+api = APIRouter(prefix="/api/permission")
+openapi_tags = {
+    "name": "Permissions",
+    "description": "Check the permissions of the signed in user.",
+}
+
+
+@api.post("/check", response_model=list[bool], tags=["Permissions"])
+def check_permissions(
+    permissions: list[Permission],
+    subject: User = Depends(registered_user),
+    permission_svc: PermissionService = Depends(),
+) -> list[bool]:
+    """Check whether the signed in user may carry out each action on its resource.
+
+    Returns one decision per requested permission, in the order requested."""
+    return permission_svc.check_many(
+        subject,
+        [(permission.action, permission.resource) for permission in permissions],
+    )
@@ -18,8 +18,10 @@ from .user_entity import UserEntity
 from .role_entity import RoleEntity
 from .room_entity import RoomEntity
 from .permission_entity import PermissionEntity
+from .permission_version_entity import PermissionVersionEntity
 from .user_role_table import user_role_table
 from .organization_entity import OrganizationEntity
+from .organization_version_entity import OrganizationVersionEntity
 from .event_entity import EventEntity
 from .event_registration_entity import EventRegistrationEntity
 
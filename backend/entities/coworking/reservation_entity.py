@@ -19,7 +19,7 @@ __license__ = "MIT"
 class ReservationEntity(EntityBase):
     __tablename__ = "coworking__reservation"
     __table_args__ = (
-        Index("coworking__reservation_time_idx", "start", "end", "state", unique=False),
+        Index("coworking__reservation_time_idx", "end", "start", "state", unique=False),
     )
 
     # Reservation Model Fields
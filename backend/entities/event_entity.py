@@ -1,13 +1,15 @@
 """Definition of SQLAlchemy table-backed object mapping entity for Events."""
 
-from sqlalchemy import Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Computed, Integer, String, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ..models.event_details import EventDetails
 from .entity_base import EntityBase
-from typing import Self
+from typing import NamedTuple, Self
 from ..models.event import DraftEvent, Event
 from ..models.registration_type import RegistrationType
 from ..models.user import User
+from ..models.public_user import PublicUser
 
 from datetime import datetime
 
@@ -22,6 +24,13 @@ class EventEntity(EntityBase):
     # Name for the events table in the PostgreSQL database
     __tablename__ = "event"
 
+    # Events are listed in order of time, with the id breaking ties, see `EventService`
+    __table_args__ = (
+        Index("ix_event_time_id", "time", "id"),
+        Index("ix_event_organization_id_time_id", "organization_id", "time", "id"),
+        Index("ix_event_search", "search_vector", postgresql_using="gin"),
+    )
+
     # Event properties (columns in the database table)
 
     # Unique ID for the event
@@ -38,6 +47,24 @@ class EventEntity(EntityBase):
     public: Mapped[bool] = mapped_column(Boolean)
     # Maximim number of people who can register for the event
     registration_limit: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Number of attendees registered for the event
+    # NOTE: This is maintained by a trigger on the event registration table, see `EventRegistrationEntity`.
+    registration_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
+    # Words of the name, location, and description, weighted in that order, for full-text search
+    # NOTE: This is generated by the database and deferred, since only search reads it.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     # Organization hosting the event
     # NOTE: This defines a one-to-many relationship between the organization and events tables.
@@ -91,37 +118,23 @@ class EventEntity(EntityBase):
             organization_id=model.organization_id,
         )
 
-    def to_model(self, subject: User | None = None) -> Event:
+    def to_model(
+        self,
+        subject: User | None = None,
+        registrations: "EventRegistrationSummary | None" = None,
+    ) -> Event:
         """
         Converts a `EventEntity` object into a `Event` model object
 
+        Parameters:
+            - subject (User | None): The user viewing the event, if any
+            - registrations (EventRegistrationSummary | None): The event's registrations,
+                summarized by a query, rather than loaded from the `registrations` relationship
         Returns:
             Event: `Event` object from the entity
         """
-        attendees = [
-            registration.to_flat_model()
-            for registration in self.registrations
-            if registration.registration_type == RegistrationType.ATTENDEE
-        ]
-        is_attendee = (
-            len([attendee for attendee in attendees if attendee.id == subject.id]) > 0
-            if subject is not None
-            else False
-        )
-
-        # Hide organizer info for unauthenticated users
-        organizers = [
-            registration.to_flat_model()
-            for registration in self.registrations
-            if registration.registration_type == RegistrationType.ORGANIZER
-        ]
-
-        is_organizer = (
-            len([organizer for organizer in organizers if organizer.id == subject.id])
-            > 0
-            if subject is not None
-            else False
-        )
+        if registrations is None:
+            registrations = self._summarize_registrations(subject)
 
         return Event(
             id=self.id,
@@ -132,20 +145,29 @@ class EventEntity(EntityBase):
             public=self.public,
             registration_limit=self.registration_limit,
             organization_id=self.organization_id,
-            registration_count=len(attendees),
-            is_attendee=is_attendee,
-            is_organizer=is_organizer,
-            organizers=organizers,
+            registration_count=registrations.registration_count,
+            is_attendee=registrations.is_attendee,
+            is_organizer=registrations.is_organizer,
+            is_waitlisted=registrations.is_waitlisted,
+            organizers=registrations.organizers,
         )
 
-    def to_details_model(self, subject: User | None = None) -> EventDetails:
+    def to_details_model(
+        self,
+        subject: User | None = None,
+        registrations: "EventRegistrationSummary | None" = None,
+    ) -> EventDetails:
         """Create a EventDetails model from an EventEntity, with permissions and members included.
 
+        Parameters:
+            - subject (User | None): The user viewing the event, if any
+            - registrations (EventRegistrationSummary | None): The event's registrations,
+                summarized by a query, rather than loaded from the `registrations` relationship
         Returns:
             EventDetails: An EventDetails model for API usage.
         """
 
-        event = self.to_model(subject)
+        event = self.to_model(subject, registrations)
 
         return EventDetails(
             id=self.id,
@@ -160,5 +182,56 @@ class EventEntity(EntityBase):
             organization=self.organization.to_model(),
             is_attendee=event.is_attendee,
             is_organizer=event.is_organizer,
+            is_waitlisted=event.is_waitlisted,
             organizers=event.organizers,
         )
+
+    def _summarize_registrations(
+        self, subject: User | None
+    ) -> "EventRegistrationSummary":
+        """Summarize the event's registrations by loading all of them.
+
+        Listings should summarize registrations in a query instead, see `EventService`.
+        """
+        organizers = [
+            registration.to_flat_model()
+            for registration in self.registrations
+            if registration.registration_type == RegistrationType.ORGANIZER
+        ]
+        subject_registration_type = next(
+            (
+                registration.registration_type
+                for registration in self.registrations
+                if subject is not None and registration.user_id == subject.id
+            ),
+            None,
+        )
+        return EventRegistrationSummary.of(
+            self.registration_count, subject_registration_type, organizers
+        )
+
+
+class EventRegistrationSummary(NamedTuple):
+    """The registration information of an event shown to a user, without the registrations."""
+
+    registration_count: int
+    is_attendee: bool
+    is_organizer: bool
+    is_waitlisted: bool
+    organizers: list[PublicUser]
+
+    @classmethod
+    def of(
+        cls,
+        registration_count: int,
+        subject_registration_type: RegistrationType | None,
+        organizers: list[PublicUser],
+    ) -> "EventRegistrationSummary":
+        """Summarize an event given the type of the user's own registration, if any."""
+        return cls(
+            registration_count=registration_count,
+            is_attendee=subject_registration_type == RegistrationType.ATTENDEE,
+            is_organizer=subject_registration_type == RegistrationType.ORGANIZER,
+            is_waitlisted=subject_registration_type == RegistrationType.WAITLIST,
+            organizers=organizers,
+        )
@@ -1,6 +1,6 @@
 """Definition of SQLAlchemy table-backed object mapping entity for Event Registrations."""
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import DDL, ForeignKey, Index, Integer, Sequence, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.entities.event_entity import EventEntity
@@ -47,6 +47,22 @@ class EventRegistrationEntity(EntityBase):
         SQLAlchemyEnum(RegistrationType)
     )
 
+    # Place in line of a waitlisted registration, lower is earlier, or None once promoted
+    # NOTE: Positions are drawn from `waitlist_position_seq`, so they only order registrations.
+    waitlist_position: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    # Serves finding a user's registrations, and then their events by primary key, and
+    # finding the head of an event's waitlist and counting who is ahead of a registration
+    __table_args__ = (
+        Index("ix_event_registration_user_id_event_id", "user_id", "event_id"),
+        Index(
+            "ix_event_registration_waitlist",
+            "event_id",
+            "waitlist_position",
+            postgresql_where=waitlist_position.isnot(None),
+        ),
+    )
+
     @classmethod
     def from_model(cls, model: EventRegistration) -> Self:
         """
@@ -113,3 +129,45 @@ class EventRegistrationEntity(EntityBase):
             email=self.user.email,
             github_avatar=self.user.github_avatar,
         )
+
+
+waitlist_position_seq = Sequence(
+    "event_registration_waitlist_position_seq", metadata=EntityBase.metadata
+)
+"""Sequence from which waitlisted registrations draw their positions."""
+
+
+# Keeps `event.registration_count` equal to the number of attendee registrations, so that the
+# count can be read, and registration guarded against the limit, without counting rows.
+# The function and trigger are created by migration in production. These mirror them for
+# databases created from metadata, e.g. in development and tests.
+event.listen(
+    EventRegistrationEntity.__table__,
+    "after_create",
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION event_registration_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.registration_type = 'ATTENDEE' THEN
+                UPDATE event SET registration_count = registration_count - 1
+                WHERE id = OLD.event_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.registration_type = 'ATTENDEE' THEN
+                UPDATE event SET registration_count = registration_count + 1
+                WHERE id = NEW.event_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    ),
+)
+event.listen(
+    EventRegistrationEntity.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER event_registration_count "
+        "AFTER INSERT OR UPDATE OF registration_type OR DELETE ON event_registration "
+        "FOR EACH ROW EXECUTE FUNCTION event_registration_count()"
+    ),
+)
@@ -6,6 +6,7 @@ from .entity_base import EntityBase
 from typing import Self
 from ..models.organization import Organization
 from ..models.organization_details import OrganizationDetails
+from ..models.event import Event
 
 __authors__ = ["Ajay Gandecha", "Jade Keegan", "Brianna Ta", "Audrey Toney"]
 __copyright__ = "Copyright 2023"
@@ -105,10 +106,20 @@ class OrganizationEntity(EntityBase):
             public=self.public,
         )
 
-    def to_details_model(self) -> OrganizationDetails:
+    def to_details_model(
+        self,
+        events: list[Event],
+        upcoming_event_count: int,
+        event_count: int,
+    ) -> OrganizationDetails:
         """
         Converts a `OrganizationEntity` object into a `OrganizationDetails` model object
 
+        Parameters:
+            - events (list[Event]): The organization's next upcoming events, queried separately
+                rather than loaded from the `events` relationship
+            - upcoming_event_count (int): The number of the organization's upcoming events
+            - event_count (int): The number of events the organization has ever hosted
         Returns:
             OrganizationDetails: `OrganizationDetails` object from the entity
         """
@@ -127,5 +138,7 @@ class OrganizationEntity(EntityBase):
             youtube=self.youtube,
             heel_life=self.heel_life,
             public=self.public,
-            events=[event.to_model() for event in self.events],
+            events=events,
+            upcoming_event_count=upcoming_event_count,
+            event_count=event_count,
         )
@@ -28,12 +28,16 @@ class PermissionEntity(EntityBase):
 
     # The role with the given permissions
     # NOTE: This field establishes a one-to-many relationship between the permissions and roles table.
-    role_id: Mapped[int] = mapped_column(ForeignKey("role.id"), nullable=True)
+    role_id: Mapped[int] = mapped_column(
+        ForeignKey("role.id"), nullable=True, index=True
+    )
     role: Mapped[RoleEntity] = relationship(back_populates="permissions")
 
     # The users with the given permissions
     # NOTE: This field establishes a one-to-many relationship between the permissions and users table.
-    user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id"), nullable=True, index=True
+    )
     user: Mapped[UserEntity] = relationship(back_populates="permissions")
 
     @classmethod
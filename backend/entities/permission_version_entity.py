@@ -0,0 +1,25 @@
+"""Definition of SQLAlchemy table-backed object mapping entity for the permission version counter."""
+
+from sqlalchemy import Integer, BigInteger
+from sqlalchemy.orm import Mapped, mapped_column
+from .entity_base import EntityBase
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class PermissionVersionEntity(EntityBase):
+    """Serves as the database model schema defining the shape of the `PermissionVersion` table
+
+    The table holds a single row whose version is incremented, in the same transaction, by every
+    change to permissions or role memberships. Each worker process compares it against the version
+    its cached permission sets were loaded at to know when they are stale."""
+
+    # Name for the permission version table in the PostgreSQL database
+    __tablename__ = "permission_version"
+
+    # ID of the single row of the table
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Incremented whenever any user's permissions may have changed
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -1,6 +1,6 @@
 """Definition of SQLAlchemy table-backed object mapping entity for Users."""
 
-from sqlalchemy import Integer, String
+from sqlalchemy import DDL, Index, Integer, String, event, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Self
 
@@ -21,6 +21,11 @@ class UserEntity(EntityBase):
 
     # Name for the user table in the PostgreSQL database
     __tablename__ = "user"
+    # Users are paginated by name, with the id breaking ties
+    __table_args__ = (
+        Index("ix_user_first_name_id", "first_name", "id"),
+        Index("ix_user_last_name_id", "last_name", "id"),
+    )
 
     # Unique ID for the user entry
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -44,6 +49,10 @@ class UserEntity(EntityBase):
     github_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
     # GitHub Avatar permalink for the user
     github_avatar: Mapped[str | None] = mapped_column(String(), nullable=True)
+    # Version of the user's calendar feed token, incremented to revoke earlier feed URLs
+    calendar_feed_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     # All of the roles for the given user.
     # NOTE: This field establishes a many-to-many relationship between the users and roles table.
@@ -124,3 +133,45 @@ class UserEntity(EntityBase):
         self.github = model.github
         self.github_id = model.github_id or None
         self.github_avatar = model.github_avatar or ""
+
+
+user_search_text = (
+    UserEntity.first_name
+    + " "
+    + UserEntity.last_name
+    + " "
+    + UserEntity.onyen
+    + " "
+    + UserEntity.email
+)
+"""The text user search matches against, which `ix_user_search_trgm` indexes."""
+
+
+def _pg_trgm_available(ddl, target, bind, **kw) -> bool:
+    """Whether the pg_trgm extension, which the user search index requires, can be installed."""
+    return bool(
+        bind.scalar(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')"
+            )
+        )
+    )
+
+
+# The trigram index is created by migration in production. These mirror it for databases
+# created from metadata, e.g. in development and tests, where the extension is available.
+event.listen(
+    UserEntity.__table__,
+    "after_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(
+        callable_=_pg_trgm_available
+    ),
+)
+event.listen(
+    UserEntity.__table__,
+    "after_create",
+    DDL(
+        'CREATE INDEX ix_user_search_trgm ON "user" USING gin '
+        "((first_name || ' ' || last_name || ' ' || onyen || ' ' || email) gin_trgm_ops)"
+    ).execute_if(callable_=_pg_trgm_available),
+)
@@ -23,3 +23,12 @@ def getenv(variable: str) -> str:
         return value
     else:
         raise NameError(f"Error: {variable} Environment Variable not Defined")
+
+
+def getenv_optional(variable: str, default: str | None = None) -> str | None:
+    """Get value of an optional environment variable, or `default` if it is undefined.
+
+    Use this only for settings that enable optional behavior, such as diagnostics, where the
+    application runs correctly without them being set.
+    """
+    return os.getenv(variable, default)
@@ -0,0 +1,22 @@
+"""Package for request instrumentation used to diagnose backend performance.
+
+The modules in this package are opt-in diagnostic tools. When they are not enabled, the
+hooks they install reduce to a context variable lookup so production requests pay
+effectively nothing for their presence.
+"""
+
+from .tracing import (
+    Span,
+    SpanExporter,
+    JSONLinesFileExporter,
+    TracingMiddleware,
+    traced,
+    start_trace,
+    current_span,
+)
+from .slow_query import SlowQueryLog
+from .profiler import SamplingProfiler, ProfilingMiddleware, profiler
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
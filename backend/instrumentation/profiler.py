@@ -0,0 +1,240 @@
+"""Statistical sampling profiler that can be switched on for live API requests.
+
+While profiling is turned on, `ProfilingMiddleware` selects a fraction of API requests. As
+long as at least one selected request is in flight, a background thread wakes up every
+`interval_ms`, reads the stack of every thread via `sys._current_frames()`, and counts
+each stack executing a route's endpoint function under that route. No tracing hooks are
+installed, so the requests being profiled run at full speed apart from the brief pauses
+the sampler takes to read stacks.
+
+Stacks are kept in the collapsed format understood by flamegraph tools such as
+`flamegraph.pl` and speedscope: one line per distinct stack, frames separated by `;`,
+rooted at the route, followed by the number of samples it was seen in.
+
+Attribution is by endpoint function, so while a selected request is in flight, concurrent
+requests executing endpoints are sampled, too. Dependencies FastAPI resolves before calling
+an endpoint, such as authentication, run outside of the endpoint's frame and are not
+attributed to the route.
+
+Profiling is off until `start` is called, e.g. via the administrative API, and turns itself
+off again when its time window elapses. When off, the middleware costs one comparison.
+"""
+
+import random
+import sys
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from time import monotonic, sleep
+from types import CodeType, FrameType
+
+from starlette.routing import Route
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class SamplingProfiler:
+    """Collects stack samples of selected requests, grouped by route."""
+
+    fraction: float
+    interval_ms: float
+    until: datetime | None
+    requests_profiled: int
+    samples: int
+
+    def __init__(self):
+        self.fraction = 1.0
+        self.interval_ms = 10.0
+        self.until = None
+        self.requests_profiled = 0
+        self.samples = 0
+        self._deadline: float | None = None
+        self._stacks: dict[str, Counter[str]] = {}
+        self._endpoints: dict[CodeType, str] = {}
+        self._in_flight = 0
+        self._sampler: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        """Whether profiling is turned on and its time window has not yet elapsed."""
+        deadline = self._deadline
+        return deadline is not None and monotonic() < deadline
+
+    def start(
+        self,
+        fraction: float = 1.0,
+        duration_seconds: float = 60.0,
+        interval_ms: float = 10.0,
+    ) -> None:
+        """Turn profiling on for a window of time, discarding previously collected stacks.
+
+        Args:
+            fraction (float): The fraction of requests, between 0 and 1, to profile.
+            duration_seconds (float): How long profiling stays on before turning itself off.
+            interval_ms (float): The time between two samples of the profiled requests.
+
+        Raises:
+            ValueError: If any of the arguments is out of range.
+        """
+        if not 0.0 <= fraction <= 1.0:
+            raise ValueError("fraction must be between 0 and 1")
+        if duration_seconds <= 0 or interval_ms <= 0:
+            raise ValueError("duration_seconds and interval_ms must be positive")
+
+        with self._lock:
+            self.fraction = fraction
+            self.interval_ms = interval_ms
+            self.until = datetime.now() + timedelta(seconds=duration_seconds)
+            self.requests_profiled = 0
+            self.samples = 0
+            self._stacks = {}
+            self._deadline = monotonic() + duration_seconds
+
+    def stop(self) -> None:
+        """Turn profiling off. Collected stacks are kept until profiling is started again."""
+        with self._lock:
+            self._deadline = None
+            self.until = None
+
+    def should_profile(self) -> bool:
+        """Decide whether to profile a request that is about to begin."""
+        return self.active and random.random() < self.fraction
+
+    def register_routes(self, routes: list) -> None:
+        """Learn which endpoint functions serve which routes.
+
+        Args:
+            routes (list): The routes of the application, e.g. `app.routes`.
+        """
+        endpoints: dict[CodeType, str] = {}
+        for route in routes:
+            if isinstance(route, Route):
+                code = getattr(route.endpoint, "__code__", None)
+                if code is not None:
+                    methods = ",".join(sorted(route.methods or []))
+                    endpoints[code] = f"{methods} {route.path}".strip()
+        self._endpoints = endpoints
+
+    def begin_request(self) -> None:
+        """Note that a selected request is in flight, starting the sampler if needed."""
+        with self._lock:
+            self._in_flight += 1
+            self.requests_profiled += 1
+            if self._sampler is None:
+                self._sampler = threading.Thread(
+                    target=self._run, name="sampling-profiler", daemon=True
+                )
+                self._sampler.start()
+
+    def end_request(self) -> None:
+        """Note that a selected request has finished."""
+        with self._lock:
+            self._in_flight -= 1
+
+    def collapsed_stacks(self, route: str | None = None) -> str:
+        """The collected samples in the collapsed stack format used by flamegraph tools.
+
+        Args:
+            route (str | None): Only include stacks of this route, e.g. `GET /api/events`.
+
+        Returns:
+            str: One line per distinct stack, rooted at its route, with its sample count.
+        """
+        with self._lock:
+            lines = [
+                f"{stack_route};{stack} {count}"
+                for stack_route, stacks in sorted(self._stacks.items())
+                if route is None or stack_route == route
+                for stack, count in stacks.most_common()
+            ]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def _run(self) -> None:
+        """Body of the sampler thread, which exits once no selected request is in flight."""
+        while True:
+            with self._lock:
+                if self._in_flight == 0:
+                    self._sampler = None
+                    return
+            self._sample()
+            sleep(self.interval_ms / 1000)
+
+    def _sample(self) -> None:
+        sampler = threading.get_ident()
+        collected: list[tuple[str, str]] = []
+        for thread, frame in sys._current_frames().items():
+            if thread != sampler:
+                sample = self._collapse(frame)
+                if sample is not None:
+                    collected.append(sample)
+
+        with self._lock:
+            for route, stack in collected:
+                self._stacks.setdefault(route, Counter())[stack] += 1
+                self.samples += 1
+
+    def _collapse(self, frame: FrameType | None) -> tuple[str, str] | None:
+        """Collapse a thread's stack, from its route's endpoint inward, or None if idle."""
+        frames: list[str] = []
+        route: str | None = None
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}")
+            if code in self._endpoints:
+                route = self._endpoints[code]
+                break
+            frame = frame.f_back
+
+        if route is None:
+            return None
+        return route, ";".join(reversed(frames))
+
+
+profiler = SamplingProfiler()
+"""The process-wide profiler controlled through the administrative API."""
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that hands a fraction of API requests to a `SamplingProfiler`."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        profiler: SamplingProfiler = profiler,
+        path_prefix: str = "/api",
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app (ASGIApp): The application being wrapped.
+            profiler (SamplingProfiler): The profiler requests are sampled by.
+            path_prefix (str): Only requests whose path begins with this prefix are profiled.
+        """
+        self._app = app
+        self._profiler = profiler
+        self._path_prefix = path_prefix
+        self._routes_registered = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith(self._path_prefix)
+            or not self._profiler.should_profile()
+        ):
+            await self._app(scope, receive, send)
+            return
+
+        if not self._routes_registered:
+            # Routes are only final once the application begins serving requests
+            self._profiler.register_routes(scope["app"].routes)
+            self._routes_registered = True
+
+        self._profiler.begin_request()
+        try:
+            await self._app(scope, receive, send)
+        finally:
+            self._profiler.end_request()
@@ -0,0 +1,150 @@
+"""Slow-query log that records SQL statements exceeding a duration threshold.
+
+`SlowQueryLog` hooks SQLAlchemy's cursor execution events on an engine. Every statement
+that takes at least `threshold_ms` is appended to a local JSON-lines file along with its
+parameters, the service method that issued it, and, when `explain` is enabled, the plan
+Postgres produced for it via `EXPLAIN (ANALYZE, BUFFERS)`.
+
+`EXPLAIN ANALYZE` executes the statement a second time, so plans are only captured for
+read-only `SELECT` statements, inside a savepoint, and should only be enabled in
+development and staging environments.
+"""
+
+import json
+import re
+import sys
+import threading
+from datetime import datetime
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+_SERVICES_PACKAGE = "backend.services"
+_START_TIMES = "slow_query_start_times"
+_LOCKING_CLAUSE = re.compile(r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b")
+
+
+def explain(cursor: Any, statement: str, parameters: Any) -> Any:
+    """Produce the JSON-formatted `EXPLAIN (ANALYZE, BUFFERS)` plan of a statement.
+
+    The plan is gathered on a new cursor of the same DBAPI connection, and thus in the same
+    transaction as the original statement, within a savepoint so that a failure to explain
+    never aborts the caller's transaction.
+
+    Args:
+        cursor: The DBAPI cursor the original statement was executed on.
+        statement (str): The SQL statement, as sent to the DBAPI.
+        parameters: The DBAPI parameters of the statement.
+
+    Returns:
+        The plan as parsed JSON.
+    """
+    explain_cursor = cursor.connection.cursor()
+    try:
+        explain_cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            explain_cursor.execute(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters
+            )
+            plan = explain_cursor.fetchone()[0]
+        finally:
+            explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    finally:
+        explain_cursor.close()
+
+
+def _calling_service_method() -> str | None:
+    """Find the innermost service method on the call stack, e.g. `UserService.search`."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_globals.get("__name__", "").startswith(_SERVICES_PACKAGE):
+            return frame.f_code.co_qualname
+        frame = frame.f_back
+    return None
+
+
+def _is_explainable(statement: str, executemany: bool) -> bool:
+    """Only single, read-only SELECT statements are safe to execute again."""
+    normalized = statement.lstrip().upper()
+    return (
+        not executemany
+        and normalized.startswith("SELECT")
+        # Any row-locking clause, e.g. FOR NO KEY UPDATE, takes locks when executed again
+        and _LOCKING_CLAUSE.search(normalized) is None
+    )
+
+
+class SlowQueryLog:
+    """Logs statements slower than a threshold, with their plans, to a JSON-lines file."""
+
+    def __init__(self, path: str, threshold_ms: float, explain: bool = False):
+        """Initialize the slow-query log.
+
+        Args:
+            path (str): The file records are appended to. It is created if it does not exist.
+            threshold_ms (float): Statements taking at least this many milliseconds are logged.
+            explain (bool): Whether to capture `EXPLAIN (ANALYZE, BUFFERS)` plans of slow SELECTs.
+        """
+        self._path = path
+        self._threshold_ms = threshold_ms
+        self._explain = explain
+        self._lock = threading.Lock()
+
+    def install(self, engine: Engine) -> None:
+        """Begin logging slow statements executed by `engine`."""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def uninstall(self, engine: Engine) -> None:
+        """Stop logging slow statements executed by `engine`."""
+        event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.remove(engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault(_START_TIMES, []).append(perf_counter())
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        duration_ms = (perf_counter() - conn.info[_START_TIMES].pop()) * 1000
+        if duration_ms < self._threshold_ms:
+            return
+
+        record: dict[str, Any] = {
+            "time": datetime.now().isoformat(),
+            "duration_ms": duration_ms,
+            "statement": statement,
+            "parameters": parameters,
+            "caller": _calling_service_method(),
+            "plan": None,
+        }
+        if self._explain and _is_explainable(statement, executemany):
+            try:
+                record["plan"] = explain(cursor, statement, parameters)
+            except Exception as e:
+                record["plan"] = f"EXPLAIN failed: {e}"
+        self._write(record)
+
+    def _handle_error(self, exception_context):
+        connection = exception_context.connection
+        start_times = connection.info.get(_START_TIMES) if connection else None
+        if start_times:
+            start_times.pop()
+
+    def _write(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, default=str)
+        with self._lock:
+            with open(self._path, "a") as file:
+                file.write(line + "\n")
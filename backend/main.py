@@ -10,12 +10,14 @@ from backend.services.coworking.reservation import ReservationException
 from .api.events import events
 
 from .api import (
+    calendar,
     health,
     organizations,
     static_files,
     profile,
     authentication,
     user,
+    permission,
     room,
     productivity,
 )
@@ -23,10 +25,20 @@ from .api.coworking import status, reservation, ambassador, operating_hours
 from .api.academics import term, course, section
 from .api.admin import users as admin_users
 from .api.admin import roles as admin_roles
+from .api.admin import profiler as admin_profiler
+from .env import getenv_optional
+from .database import engine
+from .instrumentation import (
+    TracingMiddleware,
+    JSONLinesFileExporter,
+    SlowQueryLog,
+    ProfilingMiddleware,
+)
 from .services.exceptions import (
     EventRegistrationException,
     UserPermissionException,
     ResourceNotFoundException,
+    InvalidPaginationException,
 )
 
 __authors__ = ["Kris Jordan"]
@@ -45,14 +57,17 @@ app = FastAPI(
     openapi_tags=[
         profile.openapi_tags,
         user.openapi_tags,
+        permission.openapi_tags,
         organizations.openapi_tags,
         events.openapi_tags,
+        calendar.openapi_tags,
         reservation.openapi_tags,
         room.openapi_tags,
         course.openapi_tags,
         health.openapi_tags,
         admin_users.openapi_tags,
         admin_roles.openapi_tags,
+        admin_profiler.openapi_tags,
         productivity.openapi_tags,
     ],
 )
@@ -60,13 +75,36 @@ app = FastAPI(
 # Use GZip middleware for compressing HTML responses over the network
 app.add_middleware(GZipMiddleware)
 
+# Optionally trace service calls of API requests to a JSON-lines file for offline analysis
+tracing_export_path = getenv_optional("TRACING_EXPORT_PATH")
+if tracing_export_path:
+    app.add_middleware(
+        TracingMiddleware,
+        exporter=JSONLinesFileExporter(tracing_export_path),
+        threshold_ms=float(getenv_optional("TRACING_THRESHOLD_MS", "0")),
+    )
+
+# Sample stacks of live requests while an administrator has turned the profiler on
+app.add_middleware(ProfilingMiddleware)
+
+# Optionally log slow SQL statements, with query plans outside of production, for tuning
+slow_query_threshold_ms = getenv_optional("SLOW_QUERY_THRESHOLD_MS")
+if slow_query_threshold_ms:
+    SlowQueryLog(
+        path=getenv_optional("SLOW_QUERY_LOG_PATH", "slow_queries.jsonl"),
+        threshold_ms=float(slow_query_threshold_ms),
+        explain=authentication.HOST != authentication.AUTH_SERVER_HOST,
+    ).install(engine)
+
 # Plugging in each of the router APIs
 feature_apis = [
     status,
     reservation,
     operating_hours,
     events,
+    calendar,
     user,
+    permission,
     profile,
     organizations,
     health,
@@ -74,6 +112,7 @@ feature_apis = [
     authentication,
     admin_users,
     admin_roles,
+    admin_profiler,
     term,
     course,
     section,
@@ -101,6 +140,13 @@ def resource_not_found_exception_handler(
     return JSONResponse(status_code=404, content={"message": str(e)})
 
 
+@app.exception_handler(InvalidPaginationException)
+def invalid_pagination_exception_handler(
+    request: Request, e: InvalidPaginationException
+):
+    return JSONResponse(status_code=422, content={"message": str(e)})
+
+
 # Add feature-specific exception handling middleware
 from .api import coworking
 from .api import events
@@ -0,0 +1,33 @@
+"""Migration for indexing events for keyset pagination
+
+Event listings are ordered by time, with the id breaking ties, and continue after the last
+(time, id) of the previous page, optionally among the events of one organization.
+
+Revision ID: 3a8c5e1f7d20
+Revises: e2a95c7d1b68
+Create Date: 2026-10-19 18:05:12.417390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "3a8c5e1f7d20"
+down_revision = "e2a95c7d1b68"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_event_time_id", "event", ["time", "id"], unique=False)
+    op.create_index(
+        "ix_event_organization_id_time_id",
+        "event",
+        ["organization_id", "time", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_organization_id_time_id", table_name="event")
+    op.drop_index("ix_event_time_id", table_name="event")
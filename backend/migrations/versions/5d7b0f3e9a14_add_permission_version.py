@@ -0,0 +1,29 @@
+"""Migration for the permission version counter used to invalidate cached permissions
+
+Revision ID: 5d7b0f3e9a14
+Revises: c4e9d2a61f53
+Create Date: 2026-10-19 15:02:18.730561
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "5d7b0f3e9a14"
+down_revision = "c4e9d2a61f53"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    permission_version = op.create_table(
+        "permission_version",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.bulk_insert(permission_version, [{"id": 1, "version": 0}])
+
+
+def downgrade() -> None:
+    op.drop_table("permission_version")
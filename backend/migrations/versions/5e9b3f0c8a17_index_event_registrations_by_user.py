@@ -0,0 +1,34 @@
+"""Migration for indexing event registrations by user
+
+A user's registrations were found by scanning every registration, since the primary key leads
+with the event. Events themselves are already indexed by time, see revision 3a8c5e1f7d20, so
+registrations in a time range are found via this index and then each event by primary key.
+
+Revision ID: 5e9b3f0c8a17
+Revises: c4a7e2d91f6b
+Create Date: 2026-10-19 22:14:36.581920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "5e9b3f0c8a17"
+down_revision = "c4a7e2d91f6b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_event_registration_user_id_event_id",
+        "event_registration",
+        ["user_id", "event_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_event_registration_user_id_event_id", table_name="event_registration"
+    )
@@ -0,0 +1,43 @@
+"""Migration for leading the reservation time index with its end column
+
+Reservation queries search for reservations overlapping a window near the present, i.e.
+`start < window_end AND end > window_start`. Past reservations all satisfy the first
+condition, so only an index leading with `end` lets Postgres skip over the history.
+
+Revision ID: 8a3c1e5b7d20
+Revises: 17162b9faf79
+Create Date: 2026-10-19 14:10:12.418305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "8a3c1e5b7d20"
+down_revision = "17162b9faf79"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index(
+        "coworking__reservation_time_idx", table_name="coworking__reservation"
+    )
+    op.create_index(
+        "coworking__reservation_time_idx",
+        "coworking__reservation",
+        ["end", "start", "state"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "coworking__reservation_time_idx", table_name="coworking__reservation"
+    )
+    op.create_index(
+        "coworking__reservation_time_idx",
+        "coworking__reservation",
+        ["start", "end", "state"],
+        unique=False,
+    )
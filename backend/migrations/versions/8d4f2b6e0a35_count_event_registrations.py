@@ -0,0 +1,65 @@
+"""Migration for counting event attendees in a column maintained by trigger
+
+Registration is guarded against an event's limit by locking the event row and comparing its
+attendee count to the limit in the same statement. A trigger on the registration table keeps
+the count current however registrations are inserted, updated, or deleted.
+
+Revision ID: 8d4f2b6e0a35
+Revises: 3a8c5e1f7d20
+Create Date: 2026-10-19 18:48:31.062754
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "8d4f2b6e0a35"
+down_revision = "3a8c5e1f7d20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "event",
+        sa.Column(
+            "registration_count", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+    op.execute(
+        """
+        UPDATE event SET registration_count = (
+            SELECT count(*) FROM event_registration
+            WHERE event_registration.event_id = event.id
+            AND event_registration.registration_type = 'ATTENDEE'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION event_registration_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.registration_type = 'ATTENDEE' THEN
+                UPDATE event SET registration_count = registration_count - 1
+                WHERE id = OLD.event_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.registration_type = 'ATTENDEE' THEN
+                UPDATE event SET registration_count = registration_count + 1
+                WHERE id = NEW.event_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER event_registration_count "
+        "AFTER INSERT OR UPDATE OF registration_type OR DELETE ON event_registration "
+        "FOR EACH ROW EXECUTE FUNCTION event_registration_count()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER event_registration_count ON event_registration")
+    op.execute("DROP FUNCTION event_registration_count()")
+    op.drop_column("event", "registration_count")
@@ -0,0 +1,29 @@
+"""Migration for the organization version counter used to invalidate cached organizations
+
+Revision ID: 9c2d7a4e6b15
+Revises: 5e9b3f0c8a17
+Create Date: 2026-10-19 15:31:42.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "9c2d7a4e6b15"
+down_revision = "5e9b3f0c8a17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    organization_version = op.create_table(
+        "organization_version",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.bulk_insert(organization_version, [{"id": 1, "version": 0}])
+
+
+def downgrade() -> None:
+    op.drop_table("organization_version")
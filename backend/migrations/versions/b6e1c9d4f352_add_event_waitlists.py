@@ -0,0 +1,48 @@
+"""Migration for waitlisting registrations to full events
+
+A registration to a full event is kept with the WAITLIST type and a position drawn from a
+sequence. When a seat frees up, the waitlisted registration with the lowest position for that
+event is promoted to ATTENDEE and its position cleared.
+
+Revision ID: b6e1c9d4f352
+Revises: 8d4f2b6e0a35
+Create Date: 2026-10-19 20:12:05.418203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "b6e1c9d4f352"
+down_revision = "8d4f2b6e0a35"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # New enum values cannot be used until committed, and nothing here uses WAITLIST
+    op.execute("ALTER TYPE registrationtype ADD VALUE IF NOT EXISTS 'WAITLIST'")
+    op.execute("CREATE SEQUENCE event_registration_waitlist_position_seq")
+    op.add_column(
+        "event_registration",
+        sa.Column("waitlist_position", sa.Integer(), nullable=True),
+    )
+    op.create_index(
+        "ix_event_registration_waitlist",
+        "event_registration",
+        ["event_id", "waitlist_position"],
+        unique=False,
+        postgresql_where=sa.text("waitlist_position IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    # Postgres cannot drop an enum value, so WAITLIST remains on the type, unused
+    op.execute("DELETE FROM event_registration WHERE registration_type = 'WAITLIST'")
+    op.drop_index(
+        "ix_event_registration_waitlist",
+        table_name="event_registration",
+        postgresql_where=sa.text("waitlist_position IS NOT NULL"),
+    )
+    op.drop_column("event_registration", "waitlist_position")
+    op.execute("DROP SEQUENCE event_registration_waitlist_position_seq")
@@ -0,0 +1,40 @@
+"""Migration for a trigram index over the text user search matches against
+
+User search matches a query anywhere in a user's name, onyen, and email, which a B-tree
+index cannot serve. A pg_trgm GIN index over their concatenation serves both substring
+and similarity matches. Both are skipped where the pg_trgm extension is not available.
+
+Revision ID: b7e31f0c9d42
+Revises: 5d7b0f3e9a14
+Create Date: 2026-10-19 16:05:12.481930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "b7e31f0c9d42"
+down_revision = "5d7b0f3e9a14"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Where pg_trgm is not available, as for `UserEntity`'s DDL, user search falls back to
+    # unranked, unindexed matching, see `UserService._trigram_search_available`
+    pg_trgm_available = op.get_bind().scalar(
+        sa.text(
+            "SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')"
+        )
+    )
+    if not pg_trgm_available:
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        'CREATE INDEX ix_user_search_trgm ON "user" USING gin '
+        "((first_name || ' ' || last_name || ' ' || onyen || ' ' || email) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_user_search_trgm")
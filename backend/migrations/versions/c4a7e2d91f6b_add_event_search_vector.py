@@ -0,0 +1,48 @@
+"""Migration for full-text search of events
+
+Adds a tsvector column generated from each event's name, location, and description, weighted
+in that order, along with a GIN index over it for matching search queries.
+
+Revision ID: c4a7e2d91f6b
+Revises: b6e1c9d4f352
+Create Date: 2026-10-19 21:37:52.903114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "c4a7e2d91f6b"
+down_revision = "b6e1c9d4f352"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "event",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_event_search",
+        "event",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_search", table_name="event", postgresql_using="gin")
+    op.drop_column("event", "search_vector")
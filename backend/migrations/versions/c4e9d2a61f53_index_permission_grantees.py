@@ -0,0 +1,32 @@
+"""Migration for indexing the users and roles permissions are granted to
+
+Permission checks load a user's permissions, and those of the user's roles, by these
+foreign keys on every request.
+
+Revision ID: c4e9d2a61f53
+Revises: 8a3c1e5b7d20
+Create Date: 2026-10-19 14:31:40.219087
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "c4e9d2a61f53"
+down_revision = "8a3c1e5b7d20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_permission_user_id"), "permission", ["user_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_permission_role_id"), "permission", ["role_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_permission_role_id"), table_name="permission")
+    op.drop_index(op.f("ix_permission_user_id"), table_name="permission")
@@ -0,0 +1,28 @@
+"""Migration for the version of each user's calendar feed token, which revokes old feed URLs
+
+Revision ID: d3b8f1a7c092
+Revises: 9c2d7a4e6b15
+Create Date: 2026-10-19 17:12:05.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "d3b8f1a7c092"
+down_revision = "9c2d7a4e6b15"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "user",
+        sa.Column(
+            "calendar_feed_version", sa.Integer(), nullable=False, server_default="0"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("user", "calendar_feed_version")
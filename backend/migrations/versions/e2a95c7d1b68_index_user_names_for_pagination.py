@@ -0,0 +1,28 @@
+"""Migration for indexing user names for keyset pagination
+
+Paginated user lists are ordered by a name, with the id breaking ties, and continue after
+the last (name, id) of the previous page.
+
+Revision ID: e2a95c7d1b68
+Revises: b7e31f0c9d42
+Create Date: 2026-10-19 17:22:48.903155
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "e2a95c7d1b68"
+down_revision = "b7e31f0c9d42"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_user_first_name_id", "user", ["first_name", "id"], unique=False)
+    op.create_index("ix_user_last_name_id", "user", ["last_name", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_last_name_id", table_name="user")
+    op.drop_index("ix_user_first_name_id", table_name="user")
@@ -16,8 +16,11 @@ from .room_details import RoomDetails
 from .event_registration import (
     EventRegistration,
     NewEventRegistration,
+    RegistrationWindow,
 )
 from .registration_type import RegistrationType
+from .profiler import ProfilerSettings, ProfilerStatus
+from .user_import import UserImportSummary
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -38,3 +38,4 @@ class Event(DraftEvent):
     registration_count: int = 0
     is_attendee: bool = False
     is_organizer: bool = False
+    is_waitlisted: bool = False
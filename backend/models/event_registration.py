@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from .event import Event
 from .user import User
 from .registration_type import RegistrationType
+from .coworking.time_range import TimeRange
 
 __authors__ = ["Ajay Gandecha"]
 __copyright__ = "Copyright 2023"
@@ -33,3 +34,15 @@ class EventRegistration(NewEventRegistration):
 
     event: Event
     user: User
+
+
+class RegistrationWindow(TimeRange):
+    """
+    Pydantic model to represent a period, and optionally an organization, over which to find
+    a user's event registrations.
+
+    Several windows, e.g. the weeks of a calendar, are queried together, see
+    `EventService.get_registered_events_of_user`.
+    """
+
+    organization_id: int | None = None
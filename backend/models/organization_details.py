@@ -14,6 +14,11 @@ class OrganizationDetails(Organization):
 
     This model is based on the `OrganizationEntity` model, which defines the shape
     of the `Organization` database in the PostgreSQL database.
+
+    Only the next few upcoming events are included, along with counts of all events. The
+    organization's full history of events is paginated via the events API instead.
     """
 
     events: list[Event]
+    upcoming_event_count: int = 0
+    event_count: int = 0
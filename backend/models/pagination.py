@@ -1,7 +1,15 @@
-"""Models for paginating results via the API."""
+"""Models for paginating results via the API.
 
-from typing import Generic, TypeVar
-from pydantic import BaseModel
+Pages are requested either by number, via `page`, or by continuing after the last item of the
+previous page, via the `cursor` it returned as `next_cursor`. A cursor holds the values of the
+sort column and the id of that last item, so the next page is found by seeking in an index
+rather than skipping over all preceding rows. Counting all results is optional, since a client
+that follows cursors already knows the length from the first page."""
+
+import base64
+import json
+from typing import Any, Generic, TypeVar
+from pydantic import BaseModel, Field
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -9,19 +17,58 @@ __license__ = "MIT"
 
 T = TypeVar("T")
 
+MAX_PAGE_SIZE = 100
+"""The most results a client may request in one page."""
+
 
 class PaginationParams(BaseModel):
     """Parameters passed from the client to paginate results."""
 
-    page: int = 0
-    page_size: int = 10
+    page: int = Field(default=0, ge=0)
+    page_size: int = Field(default=10, ge=1, le=MAX_PAGE_SIZE)
     order_by: str = ""
     filter: str = ""
+    cursor: str = ""
+    count: bool = True
 
 
 class Paginated(BaseModel, Generic[T]):
     """Generic class for returning paginating results to the client."""
 
     items: list[T]
-    length: int
+    length: int | None
     params: PaginationParams
+    next_cursor: str | None = None
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Encode the sort key of the last item of a page as an opaque cursor.
+
+    Args:
+        values (list[Any]): The JSON-serializable values of the sort column and the id.
+
+    Returns:
+        str: The cursor to continue after the item from.
+    """
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): The cursor.
+
+    Returns:
+        list[Any]: The values of the sort column and the id.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception as e:
+        raise ValueError(f"Malformed pagination cursor: {cursor}") from e
+    if not isinstance(values, list):
+        raise ValueError(f"Malformed pagination cursor: {cursor}")
+    return values
@@ -0,0 +1,27 @@
+"""Models for controlling the sampling profiler via the administrative API."""
+
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class ProfilerSettings(BaseModel):
+    """Settings for a window of time during which live requests are profiled."""
+
+    fraction: float = Field(default=1.0, ge=0.0, le=1.0)
+    duration_seconds: float = Field(default=60.0, gt=0.0, le=3600.0)
+    interval_ms: float = Field(default=10.0, ge=1.0)
+
+
+class ProfilerStatus(BaseModel):
+    """Whether the sampling profiler is on and what it has collected so far."""
+
+    active: bool
+    fraction: float
+    interval_ms: float
+    until: datetime | None
+    requests_profiled: int
+    samples: int
@@ -22,3 +22,12 @@ class PublicUser(BaseModel):
     pronouns: str
     email: str
     github_avatar: str | None = None
+
+
+class RegisteredUser(PublicUser):
+    """
+    Pydantic model to represent a user registered for an event, along with the type of
+    their registration, which tells attendees who hold a seat apart from the waitlist.
+    """
+
+    registration_type: RegistrationType
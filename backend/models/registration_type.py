@@ -14,3 +14,4 @@ class RegistrationType(Enum):
 
     ATTENDEE = 0
     ORGANIZER = 1
+    WAITLIST = 2
@@ -0,0 +1,19 @@
+"""Models for reporting the outcome of a bulk user import."""
+
+from pydantic import BaseModel
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class UserImportSummary(BaseModel):
+    """How many users a bulk import created, updated, and enrolled in a section.
+
+    When the import contains errors, nothing is imported and the errors are listed instead.
+    """
+
+    created: int = 0
+    updated: int = 0
+    enrolled: int = 0
+    errors: list[str] = []
@@ -0,0 +1,53 @@
+"""Create and update users in bulk from a CSV file, optionally enrolling them in a section.
+
+The import is carried out as the administrator identified by PID, whose permissions are
+checked as they would be for an import via the API. See `services.user_import` for the
+expected columns of the CSV file.
+
+Usage: python3 -m backend.script.import_users users.csv --as 999999999 [--section 1]
+"""
+
+import argparse
+import sys
+from sqlalchemy.orm import Session
+from ..database import engine
+from ..services import UserService, PermissionService, UserImportService
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+parser = argparse.ArgumentParser(description="Import users from a CSV file.")
+parser.add_argument("csv_path", help="Path of the CSV file to import")
+parser.add_argument(
+    "--as", dest="pid", type=int, required=True, help="PID of the importing admin"
+)
+parser.add_argument(
+    "--section", type=int, default=None, help="Section to enroll all users in"
+)
+args = parser.parse_args()
+
+with Session(engine) as session:
+    permission_svc = PermissionService(session)
+    subject = UserService(session, permission_svc).get_by_pid(args.pid)
+    if subject is None:
+        print(f"No user with PID {args.pid} exists.", file=sys.stderr)
+        exit(1)
+
+    with open(args.csv_path, encoding="utf-8-sig", newline="") as csv_file:
+        summary = UserImportService(session, permission_svc).import_csv(
+            subject, csv_file, args.section
+        )
+
+if summary.errors:
+    print("Nothing was imported due to the following errors:", file=sys.stderr)
+    for error in summary.errors:
+        print(f"  {error}", file=sys.stderr)
+    exit(1)
+
+print(
+    f"Created {summary.created} and updated {summary.updated} user(s), "
+    f"enrolled {summary.enrolled} in the section."
+    if args.section is not None
+    else f"Created {summary.created} and updated {summary.updated} user(s)."
+)
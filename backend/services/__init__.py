@@ -1,9 +1,11 @@
 from .user import UserService
+from .user_import import UserImportService
 from .permission import PermissionService
 from .role import RoleService
 from .github import GitHubService
 from .organization import OrganizationService
 from .event import EventService
+from .calendar import CalendarService
 from .exceptions import ResourceNotFoundException, UserPermissionException
 from .room import RoomService
 from .productivity import ProductivityService
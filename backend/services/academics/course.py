@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ...database import db_session
+from ...instrumentation import traced
 from ...models.academics import Course
 from ...models.academics import CourseDetails
 from ...models.user import User
@@ -21,6 +22,7 @@ __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
+@traced
 class CourseService:
     """Service that performs all of the actions on the `Course` table"""
 
@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ...database import db_session
+from ...instrumentation import traced
 from ...models.academics import Section
 from ...models.academics import SectionDetails
 from ...models import User, Room
@@ -24,6 +25,7 @@ __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
+@traced
 class SectionService:
     """Service that performs all of the actions on the `Section` table"""
 
@@ -0,0 +1,398 @@
+"""
+Calendar Service renders iCalendar feeds of events that calendar apps subscribe to.
+
+Calendar apps poll their subscriptions every few minutes, whether or not anything changed. So
+each rendered feed is cached in the worker process along with a fingerprint of the rows it was
+rendered from, and each poll only runs a single aggregate query to compute the current
+fingerprint. The feed is rendered again only once the fingerprint differs, i.e. after events or
+registrations changed. The fingerprint doubles as the feed's ETag, so that clients which already
+have the current feed are answered without a body.
+
+Fingerprints are built from Postgres' `xmin` system column, which changes whenever a row is
+updated. Since registering or unregistering an attendee updates the event's registration count,
+this covers changes to registrations as well as to events themselves.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Sequence
+from zoneinfo import ZoneInfo
+
+import jwt
+from fastapi import Depends
+from sqlalchemy import Select, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from ..database import db_session
+from ..env import getenv
+from ..entities import (
+    EventEntity,
+    EventRegistrationEntity,
+    OrganizationEntity,
+    UserEntity,
+)
+from ..instrumentation import traced
+from ..models import User
+from ..models.registration_type import RegistrationType
+from .exceptions import ResourceNotFoundException
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+FEED_HISTORY = timedelta(days=30)
+"""How long past events remain in feeds."""
+
+EVENT_DURATION = timedelta(hours=1)
+"""Events are stored with a start time only, so feeds give each this duration."""
+
+EVENT_TIMEZONE = ZoneInfo("America/New_York")
+"""Event times are stored without a timezone, as local times in Chapel Hill."""
+
+_TOKEN_AUDIENCE = "calendar"
+_JWT_ALGORITHM = "HS256"
+
+
+class CalendarFeed(NamedTuple):
+    """A rendered iCalendar feed and the validators clients revalidate it with."""
+
+    etag: str
+    last_modified: datetime
+    body: str
+
+
+class CalendarFeedCache:
+    """Bounded LRU cache of rendered feeds, each kept with the fingerprint it was rendered at."""
+
+    def __init__(self, max_size: int = 1_000):
+        """Initialize an empty cache.
+
+        Args:
+            max_size (int): The number of feeds kept before the least recently used is evicted.
+        """
+        self._max_size = max_size
+        self._feeds: OrderedDict[str, CalendarFeed] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, etag: str) -> CalendarFeed | None:
+        """Get a cached feed, if it was rendered at the given fingerprint."""
+        with self._lock:
+            feed = self._feeds.get(key)
+            if feed is None or feed.etag != etag:
+                return None
+            self._feeds.move_to_end(key)
+            return feed
+
+    def put(self, key: str, feed: CalendarFeed) -> None:
+        """Cache a rendered feed, replacing any earlier rendering of it."""
+        with self._lock:
+            self._feeds[key] = feed
+            self._feeds.move_to_end(key)
+            while len(self._feeds) > self._max_size:
+                self._feeds.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget all cached feeds."""
+        with self._lock:
+            self._feeds.clear()
+
+
+calendar_feed_cache = CalendarFeedCache()
+
+
+@traced
+class CalendarService:
+    """Service that renders, and caches, iCalendar feeds of events."""
+
+    def __init__(self, session: Session = Depends(db_session)):
+        """Initialize the Calendar Service.
+
+        Args:
+            session (Session): The SQLAlchemy session to use for database operations.
+        """
+        self._session = session
+
+    def get_public_feed(self) -> CalendarFeed:
+        """
+        Get the feed of all public events.
+
+        Returns:
+            CalendarFeed: The feed of public events, from `FEED_HISTORY` ago onwards
+        """
+        events = self._public_events()
+        return self._get_feed("public", events, "CSXL Events")
+
+    def get_organization_feed(self, slug: str) -> CalendarFeed:
+        """
+        Get the feed of the public events of an organization.
+
+        Args:
+            slug: The slug of the organization
+
+        Returns:
+            CalendarFeed: The feed of the organization's public events
+
+        Raises:
+            ResourceNotFoundException if no organization has the slug
+        """
+        organization = self._session.execute(
+            select(OrganizationEntity.id, OrganizationEntity.name).where(
+                OrganizationEntity.slug == slug
+            )
+        ).one_or_none()
+        if organization is None:
+            raise ResourceNotFoundException(f"No organization found with slug: {slug}")
+
+        events = self._public_events().where(
+            EventEntity.organization_id == organization.id
+        )
+        return self._get_feed(
+            f"organization/{organization.id}", events, organization.name
+        )
+
+    def get_user_feed(self, token: str) -> CalendarFeed:
+        """
+        Get the feed of the events a user is registered for, via their feed token.
+
+        Events the user is waitlisted for are included as tentative.
+
+        Args:
+            token: The user's feed token, see `get_feed_token`
+
+        Returns:
+            CalendarFeed: The feed of the user's registrations
+
+        Raises:
+            ResourceNotFoundException if the token is invalid or has been reset
+        """
+        try:
+            claims = jwt.decode(
+                token,
+                getenv("JWT_SECRET"),
+                algorithms=[_JWT_ALGORITHM],
+                audience=_TOKEN_AUDIENCE,
+            )
+            user_id = int(claims["sub"])
+            # Tokens given out before feeds could be reset carry no version
+            version = int(claims.get("ver", 0))
+        except (jwt.PyJWTError, KeyError, ValueError, TypeError):
+            raise ResourceNotFoundException("No calendar found for this link")
+
+        current_version = self._session.scalar(
+            select(UserEntity.calendar_feed_version).where(UserEntity.id == user_id)
+        )
+        if current_version != version:
+            raise ResourceNotFoundException("No calendar found for this link")
+
+        events = (
+            select(EventEntity, EventRegistrationEntity.registration_type)
+            .join(
+                EventRegistrationEntity,
+                EventRegistrationEntity.event_id == EventEntity.id,
+            )
+            .where(
+                EventRegistrationEntity.user_id == user_id,
+                EventEntity.time >= self._since(),
+            )
+        )
+        return self._get_feed(
+            f"user/{user_id}",
+            events,
+            "My CSXL Events",
+            ("event", "event_registration"),
+        )
+
+    def get_feed_token(self, subject: User) -> str:
+        """
+        Get the token that the URL of a user's own feed is keyed by.
+
+        Tokens do not expire, since calendar apps keep subscriptions indefinitely. Instead, they
+        carry the version of the user's feed, so that resetting the feed revokes every token
+        given out before, see `reset_feed_token`. They cannot be used to authenticate API
+        requests.
+
+        Args:
+            subject: The user subscribing to their registrations
+
+        Returns:
+            str: The token
+        """
+        version = self._session.scalar(
+            select(UserEntity.calendar_feed_version).where(UserEntity.id == subject.id)
+        )
+        return self._encode_feed_token(subject, version or 0)
+
+    def reset_feed_token(self, subject: User) -> str:
+        """
+        Replace a user's feed token, so that links to their feed given out before stop working.
+
+        Args:
+            subject: The user whose feed link may have been shared
+
+        Returns:
+            str: The new token
+        """
+        version = self._session.scalar(
+            update(UserEntity)
+            .where(UserEntity.id == subject.id)
+            .values(calendar_feed_version=UserEntity.calendar_feed_version + 1)
+            .returning(UserEntity.calendar_feed_version)
+        )
+        self._session.commit()
+        return self._encode_feed_token(subject, version)
+
+    def _encode_feed_token(self, subject: User, version: int) -> str:
+        return jwt.encode(
+            {"sub": str(subject.id), "aud": _TOKEN_AUDIENCE, "ver": version},
+            getenv("JWT_SECRET"),
+            algorithm=_JWT_ALGORITHM,
+        )
+
+    def _public_events(self) -> Select:
+        """Select public events, each with no registration type, from `FEED_HISTORY` ago on."""
+        return select(EventEntity, literal_column("NULL")).where(
+            EventEntity.public, EventEntity.time >= self._since()
+        )
+
+    def _since(self) -> datetime:
+        return datetime.now(EVENT_TIMEZONE).replace(tzinfo=None) - FEED_HISTORY
+
+    def _get_feed(
+        self,
+        key: str,
+        events: Select,
+        name: str,
+        tables: Sequence[str] = ("event",),
+    ) -> CalendarFeed:
+        """
+        Get a feed from the cache if it is current, or render and cache it otherwise.
+
+        Args:
+            key: Identifies the feed in the cache
+            events: Selects the feed's events, each with the subject's registration type
+            name: The name calendar apps show for the feed
+            tables: The tables, selected from, whose changes the feed reflects
+
+        Returns:
+            CalendarFeed: The current feed
+        """
+        etag = self._fingerprint(events, tables)
+        feed = calendar_feed_cache.get(key, etag)
+        if feed is None:
+            rows = self._session.execute(
+                events.order_by(EventEntity.time, EventEntity.id)
+            ).all()
+            feed = CalendarFeed(
+                etag=etag,
+                last_modified=datetime.now(timezone.utc).replace(microsecond=0),
+                body=_render_calendar(name, rows),
+            )
+            calendar_feed_cache.put(key, feed)
+        return feed
+
+    def _fingerprint(self, events: Select, tables: Sequence[str]) -> str:
+        """
+        Compute a fingerprint of the rows a feed would be rendered from, without loading them.
+
+        Args:
+            events: Selects the feed's events, see `_get_feed`
+            tables: The tables, selected from, whose rows' versions make up the fingerprint
+
+        Returns:
+            str: A quoted entity tag that changes whenever any of the rows change
+        """
+        row_versions = func.concat_ws(
+            ".", *(literal_column(f"{table}.xmin") for table in tables)
+        )
+        digest = self._session.scalar(
+            events.with_only_columns(
+                func.md5(
+                    func.coalesce(
+                        func.string_agg(
+                            row_versions, aggregate_order_by(",", EventEntity.id)
+                        ),
+                        "",
+                    )
+                )
+            )
+        )
+        return f'"{digest}"'
+
+
+def _render_calendar(
+    name: str, rows: Sequence[tuple[EventEntity, RegistrationType | None]]
+) -> str:
+    """
+    Render events as an iCalendar (RFC 5545) document.
+
+    Args:
+        name: The name calendar apps show for the calendar
+        rows: Each event, with the registration type of the feed's user, if any
+
+    Returns:
+        str: The document, with CRLF line endings
+    """
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//UNC Computer Science Experience Labs//Events//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ]
+    for event, registration_type in rows:
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:event-{event.id}@{getenv('HOST')}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{_format_time(event.time)}",
+            f"DTEND:{_format_time(event.time + EVENT_DURATION)}",
+            f"SUMMARY:{_escape(event.name)}",
+            f"LOCATION:{_escape(event.location)}",
+            f"DESCRIPTION:{_escape(event.description)}",
+            f"URL:https://{getenv('HOST')}/events/{event.id}",
+            "STATUS:TENTATIVE"
+            if registration_type == RegistrationType.WAITLIST
+            else "STATUS:CONFIRMED",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "".join(_fold(line) + "\r\n" for line in lines)
+
+
+def _format_time(time: datetime) -> str:
+    """Format an event time as a UTC iCalendar date-time."""
+    local = time.replace(tzinfo=EVENT_TIMEZONE)
+    return local.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _escape(text: str) -> str:
+    """Escape a value for an iCalendar TEXT property."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str, limit: int = 75) -> str:
+    """Fold a content line so that no line exceeds `limit` octets, per RFC 5545."""
+    encoded = line.encode()
+    if len(encoded) <= limit:
+        return line
+    parts = []
+    start = 0
+    while start < len(encoded):
+        # Continuation lines begin with a space, which counts towards their length
+        end = min(start + (limit if not parts else limit - 1), len(encoded))
+        # Never split a multi-byte character
+        while end < len(encoded) and encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start = end
+    return "\r\n ".join(parts)
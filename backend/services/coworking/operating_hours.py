@@ -7,6 +7,7 @@ from ..exceptions import ResourceNotFoundException
 from ..permission import PermissionService
 from ...models import User
 from ...database import db_session
+from ...instrumentation import traced
 from ...models.coworking import OperatingHours, TimeRange
 from ...entities.coworking import OperatingHoursEntity
 
@@ -15,6 +16,7 @@ __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
+@traced
 class OperatingHoursService:
     """OperatingHoursService is the access layer to the operating hours data model."""
 
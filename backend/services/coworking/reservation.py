@@ -6,6 +6,7 @@ from random import random
 from typing import Sequence
 from sqlalchemy.orm import Session, joinedload
 from ...database import db_session
+from ...instrumentation import traced
 from ...models.user import User, UserIdentity
 from ..exceptions import UserPermissionException, ResourceNotFoundException
 from ...models.coworking import (
@@ -36,6 +37,7 @@ class ReservationException(Exception):
         super().__init__(message)
 
 
+@traced
 class ReservationService:
     """ReservationService is the access layer to managing reservations for seats and rooms."""
 
@@ -78,13 +80,17 @@ class ReservationService:
 
         # The subject sould _be_ one of the users or have read access on reservations
         # for at least one of the users.
-        has_permission = False
-        for user in reservation.users:
-            if user.id == subject.id or self._permission_svc.check(
-                subject, "coworking.reservation.read", f"user/{user.id}"
-            ):
-                has_permission = True
-                break
+        has_permission = any(
+            user.id == subject.id for user in reservation.users
+        ) or any(
+            self._permission_svc.check_many(
+                subject,
+                [
+                    ("coworking.reservation.read", f"user/{user.id}")
+                    for user in reservation.users
+                ],
+            )
+        )
 
         if not has_permission:
             raise UserPermissionException("coworking.reservation.read", "user/")
@@ -3,6 +3,7 @@
 from fastapi import Depends
 from sqlalchemy.orm import Session
 from ...database import db_session
+from ...instrumentation import traced
 from ...models.coworking import Seat, SeatDetails
 from ...entities.coworking import SeatEntity
 
@@ -11,6 +12,7 @@ __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
+@traced
 class SeatService:
     """SeatService is the access layer to coworking seats."""
 
@@ -4,6 +4,7 @@ from fastapi import Depends
 from datetime import datetime
 from sqlalchemy.orm import Session
 from ...database import db_session
+from ...instrumentation import traced
 from .reservation import ReservationService
 from .operating_hours import OperatingHoursService
 from .seat import SeatService
@@ -16,6 +17,7 @@ __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
+@traced
 class StatusService:
     """RoleService is the access layer to the role data model, its members, and permissions."""
 
@@ -2,20 +2,40 @@
 The Event Service allows the API to manipulate event data in the database.
 """
 
-from typing import Sequence
+import csv
+import io
+import re
+from datetime import datetime
+from typing import Iterator, Sequence
 
 from fastapi import Depends
-from sqlalchemy import func, select, or_
-from sqlalchemy.orm import Session, aliased
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    case,
+    cast,
+    false,
+    func,
+    literal,
+    null,
+    select,
+    or_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased, contains_eager, selectinload
 from backend.entities.user_entity import UserEntity
-from backend.models.event_registration import EventRegistration
-from ..models.public_user import PublicUser
-from backend.models.organization_details import OrganizationDetails
+from backend.models.event_registration import EventRegistration, RegistrationWindow
+from ..models.public_user import PublicUser, RegisteredUser
+from backend.models.organization import Organization
 from backend.models.pagination import Paginated, PaginationParams
 from backend.models.registration_type import RegistrationType
 
 from backend.models.user import User
 from ..database import db_session
+from ..instrumentation import traced
 from backend.models.event import Event, DraftEvent
 from backend.models.event_details import EventDetails
 from backend.models.coworking.time_range import TimeRange
@@ -23,12 +43,17 @@ from ..entities import (
     EventEntity,
     EventRegistrationEntity,
 )
+from ..entities.event_entity import EventRegistrationSummary
+from ..entities.event_registration_entity import waitlist_position_seq
 from .permission import PermissionService
 from .exceptions import (
     ResourceNotFoundException,
     EventRegistrationException,
+    InvalidPaginationException,
 )
 from . import UserService
+from .user import SORTABLE_USER_COLUMNS
+from .pagination import paginate
 
 __authors__ = [
     "Ajay Gandecha",
@@ -40,7 +65,17 @@ __authors__ = [
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+SORTABLE_EVENT_COLUMNS = {"time": EventEntity.time}
+"""Columns events may be paginated by, each of which leads an index."""
+
+SEARCH_RANK = "rank"
+"""Orders search results by relevance, see `EventService.search`."""
+
+ROSTER_EXPORT_BATCH_SIZE = 1000
+"""Rows fetched from the server-side cursor of a roster export at a time."""
+
 
+@traced
 class EventService:
     """Service that performs all of the actions on the `Event` table"""
 
@@ -69,12 +104,151 @@ class EventService:
             list[EventDetails]: List of all `EventDetails`
         """
         # Select all entries in `Event` table
-        event_entities = (self._session.query(EventEntity)).all()
+        statement = select(EventEntity).order_by(EventEntity.time, EventEntity.id)
+        return self._get_details(statement, subject)
 
-        # Convert entities to details models and return
-        return [
-            event_entity.to_details_model(subject) for event_entity in event_entities
-        ]
+    def get_paginated_events(
+        self,
+        pagination_params: PaginationParams,
+        time_range: TimeRange | None = None,
+        organization: Organization | None = None,
+        subject: User | None = None,
+    ) -> Paginated[EventDetails]:
+        """
+        List events in a paginated list, ordered by time.
+
+        Args:
+            pagination_params: The pagination parameters.
+            time_range: The period over which to list events. Defaults to all upcoming events.
+            organization: The organization hosting the events, if only its events are listed.
+            subject: The User making the request.
+
+        Returns:
+            Paginated[EventDetails]: The paginated list of events.
+
+        Raises:
+            InvalidPaginationException: If events cannot be ordered as requested.
+        """
+        statement = select(EventEntity)
+        if time_range is None:
+            statement = statement.where(EventEntity.time >= datetime.now())
+        else:
+            statement = statement.where(
+                EventEntity.time >= time_range.start, EventEntity.time < time_range.end
+            )
+        if organization is not None:
+            statement = statement.where(EventEntity.organization_id == organization.id)
+
+        return paginate(
+            self._session,
+            statement,
+            pagination_params,
+            SORTABLE_EVENT_COLUMNS,
+            EventEntity.id,
+            load=lambda page: self._get_details(page, subject),
+        )
+
+    def search(
+        self,
+        pagination_params: PaginationParams,
+        time_range: TimeRange | None = None,
+        subject: User | None = None,
+    ) -> Paginated[EventDetails]:
+        """
+        Search events by the words of their name, location, and description.
+
+        Each word of the query, given as the `filter` of the pagination parameters, must begin
+        a word of the event, so results narrow as the query is typed. Matches are found via the
+        full-text index of events. They are ordered by relevance, where names outweigh locations,
+        which outweigh descriptions, unless ordered by time. Since relevance depends on the
+        query, ranked results are paged by page number rather than by cursor.
+
+        Args:
+            pagination_params: The pagination parameters, whose filter is the search query.
+            time_range: The period to search for events in. Defaults to all events.
+            subject: The User making the request.
+
+        Returns:
+            Paginated[EventDetails]: The page of matching events.
+
+        Raises:
+            InvalidPaginationException: If results cannot be ordered or paged as requested.
+        """
+        statement = select(EventEntity)
+        if time_range is not None:
+            statement = statement.where(
+                EventEntity.time >= time_range.start, EventEntity.time < time_range.end
+            )
+
+        ranked = pagination_params.order_by in ("", SEARCH_RANK)
+        # Only whole words are kept, so the query cannot contain tsquery operators
+        words = re.findall(r"\w+", pagination_params.filter)
+        if words:
+            query = func.to_tsquery(
+                "english", " & ".join(f"{word}:*" for word in words)
+            )
+            statement = statement.where(EventEntity.search_vector.bool_op("@@")(query))
+            if ranked:
+                return self._search_ranked(statement, query, pagination_params, subject)
+        elif ranked:
+            # Without a query, every event is equally relevant
+            pagination_params = pagination_params.model_copy(
+                update={"order_by": "time"}
+            )
+
+        return paginate(
+            self._session,
+            statement,
+            pagination_params,
+            SORTABLE_EVENT_COLUMNS,
+            EventEntity.id,
+            load=lambda page: self._get_details(page, subject),
+        )
+
+    def _search_ranked(
+        self,
+        statement: Select[tuple[EventEntity]],
+        query: ColumnElement,
+        pagination_params: PaginationParams,
+        subject: User | None,
+    ) -> Paginated[EventDetails]:
+        """
+        Page through matching events in order of relevance, most relevant first.
+
+        Args:
+            statement: A select of the matching `EventEntity`s
+            query: The tsquery the events match
+            pagination_params: The pagination parameters, which must not continue a cursor
+            subject: The User making the request.
+
+        Returns:
+            Paginated[EventDetails]: The page of matching events.
+
+        Raises:
+            InvalidPaginationException: If a cursor is given.
+        """
+        if pagination_params.cursor:
+            raise InvalidPaginationException(
+                "Search results ranked by relevance are paged by page number"
+            )
+
+        length = None
+        if pagination_params.count:
+            length = self._session.scalar(
+                select(func.count()).select_from(statement.subquery())
+            )
+
+        rank = func.ts_rank(EventEntity.search_vector, query)
+        page = (
+            statement.order_by(rank.desc(), EventEntity.id)
+            .offset(pagination_params.page * pagination_params.page_size)
+            .limit(pagination_params.page_size)
+        )
+        return Paginated(
+            items=self._get_details(page, subject),
+            length=length,
+            params=pagination_params,
+        )
 
     def get_events_in_time_range(
         self, time_range: TimeRange, subject: User | None = None
@@ -89,13 +263,14 @@ class EventService:
         Returns:
             list[EventDetails]: list of valid EventDetails models representing the events
         """
-        event_entities = (
-            self._session.query(EventEntity)
+        statement = (
+            select(EventEntity)
             .where(EventEntity.time >= time_range.start)
             .where(EventEntity.time < time_range.end)
+            .order_by(EventEntity.time, EventEntity.id)
         )
 
-        return [entity.to_details_model(subject) for entity in event_entities]
+        return self._get_details(statement, subject)
 
     def create(self, subject: User, event: DraftEvent) -> EventDetails:
         """
@@ -135,9 +310,9 @@ class EventService:
                 )
 
         # Return added object
-        # NOTE: Must re-convert the entity to a model again so that the registration
-        # for the event organizer is automatically populated
-        return event_entity.to_details_model(subject)
+        # NOTE: Must re-load the event so that the registration for the event organizer
+        # is automatically populated
+        return self.get_by_id(event_entity.id, subject)
 
     def get_by_id(self, id: int, subject: User | None = None) -> EventDetails:
         """
@@ -156,17 +331,19 @@ class EventService:
         """
 
         # Query the event with matching id
-        entity = self._session.get(EventEntity, id)
+        events = self._get_details(
+            select(EventEntity).where(EventEntity.id == id), subject
+        )
 
         # Check if result is null
-        if entity is None:
+        if len(events) == 0:
             raise ResourceNotFoundException(f"No event found with matching ID: {id}")
 
-        # Convert entry to a model and return
-        return entity.to_details_model(subject)
+        # Return the model
+        return events[0]
 
     def get_events_by_organization(
-        self, organization: OrganizationDetails, subject: User | None = None
+        self, organization: Organization, subject: User | None = None
     ) -> list[EventDetails]:
         """
         Get all the events hosted by an organization with slug
@@ -179,14 +356,14 @@ class EventService:
             list[EventDetail]: a list of valid EventDetails models
         """
         # Query the event with matching organization slug
-        events = (
-            self._session.query(EventEntity)
-            .filter(EventEntity.organization_id == organization.id)
-            .all()
+        statement = (
+            select(EventEntity)
+            .where(EventEntity.organization_id == organization.id)
+            .order_by(EventEntity.time, EventEntity.id)
         )
 
         # Convert entities to models and return
-        return [event.to_details_model(subject) for event in events]
+        return self._get_details(statement, subject)
 
     def update(self, subject: User, event: Event) -> EventDetails:
         """
@@ -207,7 +384,7 @@ class EventService:
             raise ResourceNotFoundException(f"No event found with matching ID: {id}")
 
         # Ensure that the user has appropriate permissions to update event information
-        event_details = event_entity.to_details_model(subject)
+        event_details = self.get_by_id(event.id, subject)
 
         # If not organizer, enforce permissions
         if not event_details.is_organizer:
@@ -258,11 +435,13 @@ class EventService:
                         RegistrationType.ORGANIZER
                     )
 
-        # Save changes
+        # Fill any seats a raised registration limit opened, then save changes
+        self._session.flush()
+        self._promote_from_waitlist(event.id)
         self._session.commit()
 
         # Return updated object
-        return event_entity.to_details_model(subject)
+        return self.get_by_id(event.id, subject)
 
     def delete(self, subject: User, id: int) -> None:
         """
@@ -364,6 +543,9 @@ class EventService:
         event_registration_entities = (
             self._session.query(EventRegistrationEntity)
             .where(EventRegistrationEntity.event_id == event.id)
+            .where(
+                EventRegistrationEntity.registration_type != RegistrationType.WAITLIST
+            )
             .all()
         )
 
@@ -405,21 +587,26 @@ class EventService:
 
     def register(
         self, subject: User, attendee: User, event: EventDetails
-    ) -> PublicUser:
+    ) -> RegisteredUser:
         """
         Register a user for an event.
 
+        When the event is full, the attendee joins the end of its waitlist instead, to be
+        promoted as attendees unregister. Registering is idempotent: if the attendee is already
+        registered or waitlisted, their existing registration is kept.
+
         Args:
             subject: User making the registration request
             attendee: The user being registered for the event
-            event: The EventDetails being registered for
+            event: The EventDetails being registered for, whose registration count may be stale
 
         Returns:
-            PublicUser
+            RegisteredUser: The attendee, with the type of their registration, which is
+                `RegistrationType.WAITLIST` if they were waitlisted
 
         Raises:
             UserPermissionException if subject does not have permission to register user
-            EventRegistrationException if the event is full
+            EventRegistrationException if the event does not take registrations
         """
         if subject.id != attendee.id and not event.is_organizer:
             self._permission.enforce(
@@ -428,34 +615,60 @@ class EventService:
                 f"organization/{event.organization.id}",
             )
 
-        # Get the registration status.
-        # NOTE: It is preferred to use the service function rather than the list of
-        # registrations passed in from `event` in the case that registrations are added
-        # between when `event` was fetched and this function runs.
-
-        # Raise exception if event is full.
-        if event.registration_count >= event.registration_limit:
-            raise EventRegistrationException(event.id)
-
-        # Enable idemopotency in returning existing registration, if one exists.
-        # Permission to manage / read registration is enforced in EventService#get_registration
-        existing_registration = self.get_registration(subject, attendee, event)
-        if existing_registration:
-            return EventRegistrationEntity.from_model(
-                existing_registration
-            ).to_flat_model()
-
-        # Add new object to table and commit changes
-        event_registration_entity = EventRegistrationEntity(
-            user_id=attendee.id,
-            event_id=event.id,
-            registration_type=RegistrationType.ATTENDEE,
+        # Register the attendee, or waitlist them if the event is full, and otherwise find
+        # their existing registration, in one statement. Locking the event row serializes
+        # concurrent registrations for the event, and the guard is re-checked against the count
+        # as updated by whichever registration held the lock before, so the limit cannot be
+        # exceeded. The count is maintained by a trigger, see `EventRegistrationEntity`.
+        registration_enum = EventRegistrationEntity.registration_type.type
+        has_seat = EventEntity.registration_count < EventEntity.registration_limit
+        registered = (
+            insert(EventRegistrationEntity)
+            .from_select(
+                ["event_id", "user_id", "registration_type", "waitlist_position"],
+                select(
+                    EventEntity.id,
+                    literal(attendee.id),
+                    case(
+                        (has_seat, cast(RegistrationType.ATTENDEE, registration_enum)),
+                        else_=cast(RegistrationType.WAITLIST, registration_enum),
+                    ),
+                    case((has_seat, null()), else_=waitlist_position_seq.next_value()),
+                )
+                .where(EventEntity.id == event.id, EventEntity.registration_limit > 0)
+                .with_for_update(),
+            )
+            .on_conflict_do_nothing()
+            .returning(EventRegistrationEntity.registration_type)
+            .cte("registered")
+        )
+        existing = select(EventRegistrationEntity.registration_type).where(
+            EventRegistrationEntity.event_id == event.id,
+            EventRegistrationEntity.user_id == attendee.id,
+        )
+        registration_type = self._session.scalar(
+            union_all(select(registered.c.registration_type), existing)
         )
-        self._session.add(event_registration_entity)
         self._session.commit()
 
+        # Nothing is returned when the event takes no registrations, or when the same
+        # registration was made concurrently, which only a fresh look can tell apart
+        if registration_type is None:
+            registration = self.get_registration(subject, attendee, event)
+            if registration is None:
+                raise EventRegistrationException(event.id)
+            registration_type = registration.registration_type
+
         # Return registration
-        return event_registration_entity.to_flat_model()
+        return RegisteredUser(
+            id=attendee.id,
+            first_name=attendee.first_name,
+            last_name=attendee.last_name,
+            pronouns=attendee.pronouns,
+            email=attendee.email,
+            github_avatar=attendee.github_avatar,
+            registration_type=registration_type,
+        )
 
     def unregister(self, subject: User, attendee: User, event: EventDetails) -> None:
         """
@@ -484,21 +697,107 @@ class EventService:
         ):
             return
 
-        # Delete object and commit
+        # Delete object, promote from the waitlist into the seat it frees, and commit
         self._session.delete(
             self._session.get(
                 EventRegistrationEntity,
                 (event.id, attendee.id),
             )
         )
+        self._session.flush()
+        self._promote_from_waitlist(event.id)
         self._session.commit()
 
+    def get_waitlist_position(
+        self, subject: User, attendee: User, event: EventDetails
+    ) -> int | None:
+        """
+        Get the place of an attendee in line on the waitlist of an event.
+
+        Only the waitlisted registrations ahead of the attendee's are counted, via an index.
+
+        Args:
+            subject: User requesting the position
+            attendee: User who may be waitlisted for the event
+            event: EventDetails of the event
+
+        Returns:
+            int | None: The attendee's position, where 1 is next to be promoted, or None if the
+                attendee is not waitlisted
+
+        Raises:
+            UserPermissionException if subject does not have permission
+        """
+        if subject.id != attendee.id:
+            self._permission.enforce(
+                subject,
+                "organization.events.manage_registrations",
+                f"organization/{event.organization_id}",
+            )
+
+        own_position = (
+            select(EventRegistrationEntity.waitlist_position)
+            .where(
+                EventRegistrationEntity.event_id == event.id,
+                EventRegistrationEntity.user_id == attendee.id,
+            )
+            .scalar_subquery()
+        )
+        position = self._session.scalar(
+            select(func.count()).where(
+                EventRegistrationEntity.event_id == event.id,
+                EventRegistrationEntity.waitlist_position <= own_position,
+            )
+        )
+        return position or None
+
+    def _promote_from_waitlist(self, event_id: int) -> None:
+        """
+        Promote waitlisted registrations of an event, in order, into its free seats.
+
+        The event row is locked to read the seats free, so that concurrent registrations
+        cannot take the same seats. Must be called before committing the change that freed them.
+
+        Args:
+            event_id: The id of the event
+        """
+        seats = (
+            select(
+                func.greatest(
+                    EventEntity.registration_limit - EventEntity.registration_count, 0
+                )
+            )
+            .where(EventEntity.id == event_id)
+            .with_for_update()
+            .scalar_subquery()
+        )
+        promoted = (
+            select(EventRegistrationEntity.user_id)
+            .where(
+                EventRegistrationEntity.event_id == event_id,
+                EventRegistrationEntity.waitlist_position.isnot(None),
+            )
+            .order_by(EventRegistrationEntity.waitlist_position)
+            .limit(seats)
+        )
+        self._session.execute(
+            update(EventRegistrationEntity)
+            .where(
+                EventRegistrationEntity.event_id == event_id,
+                EventRegistrationEntity.user_id.in_(promoted),
+            )
+            .values(registration_type=RegistrationType.ATTENDEE, waitlist_position=None)
+            .execution_options(synchronize_session=False)
+        )
+
     def get_registrations_of_user(
         self, subject: User, user: User, time_range: TimeRange
     ) -> Sequence[PublicUser]:
         """
         Get a user's registrations to events falling within a given time range.
 
+        Places on waitlists are not registrations, so they are not included.
+
         Args:
             subject: The User making the request.
             user: The User whose registrations are being requested.
@@ -523,6 +822,9 @@ class EventService:
         registration_entities = (
             self._session.query(EventRegistrationEntity)
             .where(EventRegistrationEntity.user_id == user.id)
+            .where(
+                EventRegistrationEntity.registration_type != RegistrationType.WAITLIST
+            )
             .join(EventEntity, EventRegistrationEntity.event_id == EventEntity.id)
             .where(EventEntity.time >= time_range.start)
             .where(EventEntity.time < time_range.end)
@@ -530,6 +832,86 @@ class EventService:
 
         return [entity.to_flat_model() for entity in registration_entities]
 
+    def get_registered_events_of_user(
+        self, subject: User, user: User, windows: list[RegistrationWindow]
+    ) -> list[list[EventDetails]]:
+        """
+        Get the events a user is registered for in each of several windows of time.
+
+        All windows are searched in a single query, which finds the user's registrations via
+        their index and then each event by primary key. The events are then loaded once each,
+        however many windows they fall in, so the number of queries does not grow with the
+        number of windows.
+
+        Args:
+            subject: The User making the request.
+            user: The User whose registrations are being requested.
+            windows: The periods, each optionally limited to an organization, to search.
+
+        Returns:
+            list[list[EventDetails]]: For each window, in order, the events it contains that
+                the user is registered, or waitlisted, for, in order of time. Registration
+                statuses are those of the user.
+
+        Raises:
+            UserPermissionException when the user is requesting the registrations
+            of another user and does not have 'user.event_registrations' permission.
+        """
+        # Feature-specific authorization: User is getting their own registrations
+        # Administrative Permission: user.event_registrations : user/{user_id}
+        if subject.id != user.id:
+            self._permission.enforce(
+                subject,
+                "user.event_registrations",
+                f"user/{user.id}",
+            )
+        if not windows:
+            return []
+
+        searches = []
+        for index, window in enumerate(windows):
+            search = (
+                select(
+                    literal(index).label("window"),
+                    EventEntity.id.label("event_id"),
+                    EventEntity.time.label("time"),
+                )
+                .join(
+                    EventRegistrationEntity,
+                    EventRegistrationEntity.event_id == EventEntity.id,
+                )
+                .where(
+                    EventRegistrationEntity.user_id == user.id,
+                    EventEntity.time >= window.start,
+                    EventEntity.time < window.end,
+                )
+            )
+            if window.organization_id is not None:
+                search = search.where(
+                    EventEntity.organization_id == window.organization_id
+                )
+            searches.append(search)
+        matches = union_all(*searches).subquery()
+        rows = self._session.execute(
+            select(matches.c.window, matches.c.event_id).order_by(
+                matches.c.window, matches.c.time, matches.c.event_id
+            )
+        ).all()
+
+        found: list[list[int]] = [[] for _ in windows]
+        for window, event_id in rows:
+            found[window].append(event_id)
+        event_ids = {event_id for _, event_id in rows}
+        details = {}
+        if event_ids:
+            details = {
+                event.id: event
+                for event in self._get_details(
+                    select(EventEntity).where(EventEntity.id.in_(event_ids)), user
+                )
+            }
+        return [[details[event_id] for event_id in ids] for ids in found]
+
     def get_registered_users_of_event(
         self, subject: User, event_id: int, pagination_params: PaginationParams
     ) -> Paginated[User]:
@@ -546,9 +928,9 @@ class EventService:
 
         Raises:
             PermissionException: If the subject does not have the required permission.
+            InvalidPaginationException: If users cannot be ordered as requested.
         """
-        event_entity = self._session.get(EventEntity, event_id)
-        event = event_entity.to_details_model(subject)
+        event = self.get_by_id(event_id, subject)
 
         # Ensure that the user has appropriate permissions to view event information
         if not event.is_organizer:
@@ -577,19 +959,6 @@ class EventService:
             )
         )
 
-        # Statement to determine number of rows in query result
-        length_statement = (
-            select(func.count())
-            .select_from(UserEntity)
-            .join(
-                EventRegistrationAlias, EventRegistrationAlias.user_id == UserEntity.id
-            )
-            .where(
-                EventRegistrationAlias.event_id == event_id,
-                EventRegistrationAlias.registration_type == RegistrationType.ATTENDEE,
-            )
-        )
-
         # Filter results by query
         if pagination_params.filter != "":
             query = pagination_params.filter
@@ -598,30 +967,158 @@ class EventService:
                 UserEntity.last_name.ilike(f"%{query}%"),
                 UserEntity.onyen.ilike(f"%{query}%"),
             )
-
             statement = statement.where(criteria)
-            length_statement = length_statement.where(criteria)
 
-        # Calculate where to begin retrieving rows and how many to retrieve
-        offset = pagination_params.page * pagination_params.page_size
-        limit = pagination_params.page_size
+        # Retrieve the requested page of `UserEntity`s as models
+        return paginate(
+            self._session,
+            statement,
+            pagination_params,
+            SORTABLE_USER_COLUMNS,
+            UserEntity.id,
+            UserEntity.to_model,
+        )
 
-        # Order results by order by attribute
-        if pagination_params.order_by != "":
-            statement = statement.order_by(
-                getattr(UserEntity, pagination_params.order_by)
-            )
+    def export_registrations_csv(self, subject: User, event_id: int) -> Iterator[str]:
+        """
+        Export the registrations of an event as CSV, for check-in and reporting.
 
-        # Retrieve limited items
-        statement = statement.offset(offset).limit(limit)
+        Permission is checked before this returns, so that a response can be started from the
+        iterator once it does. The iterator reads registrations through a server-side cursor,
+        in batches, so that memory use does not grow with the size of the roster. It must be
+        consumed while this service's session is open.
 
-        # Execute statement and retrieve entities
-        length = self._session.execute(length_statement).scalar()
-        entities = self._session.execute(statement).scalars()
+        Args:
+            subject: The user performing the action.
+            event_id: a valid int representing a unique Event
 
-        # Convert `UserEntity`s to model and return page
-        return Paginated(
-            items=[entity.to_model() for entity in entities],
-            length=length,
-            params=pagination_params,
+        Returns:
+            Iterator[str]: Chunks of CSV, beginning with a header row, of the registered users,
+                attendees first, then organizers, then the waitlist in order
+
+        Raises:
+            ResourceNotFoundException: If the event does not exist.
+            UserPermissionException: If the subject does not have the required permission.
+        """
+        event = self.get_by_id(event_id, subject)
+        if not event.is_organizer:
+            self._permission.enforce(
+                subject,
+                "organization.events.manage_registrations",
+                f"organization/{event.organization_id}",
+            )
+
+        statement = (
+            select(
+                UserEntity.pid,
+                UserEntity.onyen,
+                UserEntity.first_name,
+                UserEntity.last_name,
+                UserEntity.pronouns,
+                UserEntity.email,
+                EventRegistrationEntity.registration_type,
+            )
+            .join(
+                EventRegistrationEntity,
+                EventRegistrationEntity.user_id == UserEntity.id,
+            )
+            .where(EventRegistrationEntity.event_id == event_id)
+            .order_by(
+                EventRegistrationEntity.registration_type,
+                EventRegistrationEntity.waitlist_position,
+                UserEntity.last_name,
+                UserEntity.first_name,
+                UserEntity.id,
+            )
+            .execution_options(yield_per=ROSTER_EXPORT_BATCH_SIZE)
+        )
+        return self._write_roster_csv(statement)
+
+    def _write_roster_csv(self, statement: Select) -> Iterator[str]:
+        """Write the rows of a roster selection as CSV, one chunk per batch of rows."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(
+            [
+                "pid",
+                "onyen",
+                "first_name",
+                "last_name",
+                "pronouns",
+                "email",
+                "registration_type",
+            ]
         )
+        yield buffer.getvalue()
+
+        for rows in self._session.execute(statement).partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            for *user, registration_type in rows:
+                writer.writerow(
+                    [_csv_cell(value) for value in user] + [registration_type.name]
+                )
+            yield buffer.getvalue()
+
+    def _get_details(
+        self, statement: Select[tuple[EventEntity]], subject: User | None
+    ) -> list[EventDetails]:
+        """
+        Run a query of events and convert the events to details models.
+
+        Rather than loading every registration of every event, attendee counts are read from
+        the events' counter column and the subject's own registration is joined by primary key.
+        Only organizer registrations are loaded, in one further query, and the hosting
+        organizations in another.
+
+        Args:
+            statement: A select of `EventEntity`s, possibly filtered, ordered, and limited
+            subject: The User making the request.
+
+        Returns:
+            list[EventDetails]: The selected events, in the order selected
+        """
+        subject_registration = aliased(EventRegistrationEntity)
+        rows = self._session.execute(
+            statement.add_columns(subject_registration.registration_type)
+            .outerjoin(
+                subject_registration,
+                and_(
+                    subject_registration.event_id == EventEntity.id,
+                    subject_registration.user_id == subject.id if subject else false(),
+                ),
+            )
+            .options(selectinload(EventEntity.organization))
+        ).all()
+
+        organizers: dict[int, list[PublicUser]] = {event.id: [] for event, _ in rows}
+        if organizers:
+            organizer_registrations = self._session.scalars(
+                select(EventRegistrationEntity)
+                .join(EventRegistrationEntity.user)
+                .options(contains_eager(EventRegistrationEntity.user))
+                .where(
+                    EventRegistrationEntity.event_id.in_(organizers.keys()),
+                    EventRegistrationEntity.registration_type
+                    == RegistrationType.ORGANIZER,
+                )
+            )
+            for organizer in organizer_registrations:
+                organizers[organizer.event_id].append(organizer.to_flat_model())
+
+        return [
+            event.to_details_model(
+                subject,
+                EventRegistrationSummary.of(
+                    event.registration_count, registration_type, organizers[event.id]
+                ),
+            )
+            for event, registration_type in rows
+        ]
+
+
+def _csv_cell(value: object) -> object:
+    """Keep spreadsheet apps from evaluating user-entered text in an export as a formula."""
+    if isinstance(value, str) and value.startswith(("=", "+", "-", "@", "\t", "\r")):
+        return f"'{value}"
+    return value
@@ -31,3 +31,9 @@ class EventRegistrationException(Exception):
 
     def __init__(self, event_id: int):
         super().__init__(f"Unable to register user for the event with id: {event_id}")
+
+
+class InvalidPaginationException(Exception):
+    """InvalidPaginationException is raised when results are requested in an unsupported order or after a malformed cursor."""
+
+    ...
@@ -9,12 +9,14 @@ from github import Github
 from ..models import User
 from .user import UserService
 from ..env import getenv
+from ..instrumentation import traced
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
+@traced
 class GitHubService:
     """GitHubService is the access layer to the GitHub OAuth2 API."""
 
@@ -1,15 +1,38 @@
 """
 The Organizations Service allows the API to manipulate organizations data in the database.
+
+Organizations change only a few times per semester, yet are looked up on nearly every page view.
+So each worker process keeps a directory of all organizations, indexed by id and slug. Every
+change to an organization increments a version counter in the database, in the same transaction
+as the change. A worker compares the counter against the version its directory was loaded at at
+most once per `DIRECTORY_CHECK_SECONDS`, and trusts the directory without reaching the database
+in between. Changes made through a worker's own process are visible there immediately.
 """
 
+import hashlib
+import threading
+from datetime import datetime, timezone
+from time import monotonic
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
 from fastapi import Depends
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, contains_eager
 
 from ..database import db_session
+from ..instrumentation import traced
+from ..models.event import Event
 from ..models.organization import Organization
 from ..models.organization_details import OrganizationDetails
+from ..models.public_user import PublicUser
+from ..models.registration_type import RegistrationType
+from ..entities.event_entity import EventEntity, EventRegistrationSummary
+from ..entities.event_registration_entity import EventRegistrationEntity
 from ..entities.organization_entity import OrganizationEntity
+from ..entities.organization_version_entity import OrganizationVersionEntity
 from ..models import User
 from .permission import PermissionService
 
@@ -20,7 +43,98 @@ __authors__ = ["Ajay Gandecha", "Jade Keegan", "Brianna Ta", "Audrey Toney"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+UPCOMING_EVENTS_LIMIT = 5
+"""The number of upcoming events included in an organization's details."""
+
+DIRECTORY_CHECK_SECONDS = 10.0
+"""How long a worker trusts its organization directory before checking the version again."""
+
+_organizations_adapter = TypeAdapter(list[Organization])
+
+
+class OrganizationDirectory(NamedTuple):
+    """All organizations, indexed by id and slug, as loaded at one organization version.
+
+    The directory is also rendered as the JSON body of the organization list, along with the
+    validators clients revalidate it with. It is shared by every request of its process, so its
+    organizations must not be modified; `OrganizationService` hands out copies instead.
+    """
+
+    version: int
+    organizations: tuple[Organization, ...]
+    by_id: Mapping[int, Organization]
+    by_slug: Mapping[str, Organization]
+    etag: str
+    last_modified: datetime
+    body: str
+
+    @classmethod
+    def of(
+        cls, version: int, organizations: list[Organization]
+    ) -> "OrganizationDirectory":
+        """Index and render organizations loaded at the given version."""
+        body = _organizations_adapter.dump_json(organizations).decode()
+        return cls(
+            version=version,
+            organizations=tuple(organizations),
+            by_id=MappingProxyType(
+                {organization.id: organization for organization in organizations}
+            ),
+            by_slug=MappingProxyType(
+                {organization.slug: organization for organization in organizations}
+            ),
+            etag=f'"{hashlib.md5(body.encode()).hexdigest()}"',
+            last_modified=datetime.now(timezone.utc).replace(microsecond=0),
+            body=body,
+        )
+
 
+class OrganizationDirectoryCache:
+    """Process-wide cache of the organization directory, and of when its version was checked."""
+
+    def __init__(self, check_seconds: float = DIRECTORY_CHECK_SECONDS):
+        """Initialize an empty cache.
+
+        Parameters:
+            check_seconds (float): How long the directory is trusted before its version is checked
+        """
+        self._check_seconds = check_seconds
+        self._directory: OrganizationDirectory | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> OrganizationDirectory | None:
+        """Get the directory, if its version was checked recently enough to trust it."""
+        with self._lock:
+            if monotonic() - self._checked_at >= self._check_seconds:
+                return None
+            return self._directory
+
+    def get_at(self, version: int) -> OrganizationDirectory | None:
+        """Get the directory, if it was loaded at the given, just checked, version."""
+        with self._lock:
+            if self._directory is None or self._directory.version != version:
+                return None
+            self._checked_at = monotonic()
+            return self._directory
+
+    def put(self, directory: OrganizationDirectory) -> None:
+        """Cache a directory, just loaded at its version."""
+        with self._lock:
+            self._directory = directory
+            self._checked_at = monotonic()
+
+    def clear(self) -> None:
+        """Forget the cached directory."""
+        with self._lock:
+            self._directory = None
+            self._checked_at = 0.0
+
+
+organization_directory_cache = OrganizationDirectoryCache()
+
+
+@traced
 class OrganizationService:
     """Service that performs all of the actions on the `Organization` table"""
 
@@ -35,17 +149,49 @@ class OrganizationService:
 
     def all(self) -> list[Organization]:
         """
-        Retrieves all organizations from the table
+        Retrieves all organizations from the directory
 
         Returns:
-            list[Organization]: List of all `Organization`
+            list[Organization]: List of all `Organization`, copied from the shared directory
         """
-        # Select all entries in `Organization` table
-        query = select(OrganizationEntity)
-        entities = self._session.scalars(query).all()
+        return [
+            organization.model_copy(deep=True)
+            for organization in self.get_directory().organizations
+        ]
 
-        # Convert entries to a model and return
-        return [entity.to_model() for entity in entities]
+    def get_directory(self) -> OrganizationDirectory:
+        """
+        Get the directory of all organizations
+
+        The directory comes from the process-wide cache while it is trusted, without querying
+        the database. Otherwise, the organization version is read, and all organizations are
+        loaded again only if it changed since the cached directory was loaded.
+
+        Returns:
+            OrganizationDirectory: All organizations, indexed by id and slug, which are shared
+                and must not be modified
+        """
+        directory = organization_directory_cache.get()
+        if directory is not None:
+            return directory
+
+        version = self._session.scalar(
+            select(OrganizationVersionEntity.version).where(
+                OrganizationVersionEntity.id == 1
+            )
+        )
+        version = version if version is not None else 0
+        directory = organization_directory_cache.get_at(version)
+        if directory is None:
+            # Loaded after the version is read, so a concurrent change is at worst reloaded again
+            entities = self._session.scalars(
+                select(OrganizationEntity).order_by(OrganizationEntity.id)
+            ).all()
+            directory = OrganizationDirectory.of(
+                version, [entity.to_model() for entity in entities]
+            )
+            organization_directory_cache.put(directory)
+        return directory
 
     def create(self, subject: User, organization: Organization) -> Organization:
         """
@@ -74,32 +220,118 @@ class OrganizationService:
 
         # Add new object to table and commit changes
         self._session.add(organization_entity)
+        self._invalidate()
         self._session.commit()
+        organization_directory_cache.clear()
 
         # Return added object
         return organization_entity.to_model()
 
+    def get(self, slug: str) -> Organization:
+        """
+        Get the organization from a slug, without any of its events
+
+        Parameters:
+            slug: a string representing a unique organization slug
+
+        Returns:
+            Organization: Object with corresponding slug, copied from the shared directory
+
+        Raises:
+            ResourceNotFoundException if no organization is found with the corresponding slug
+        """
+        organization = self.get_directory().by_slug.get(slug)
+        if organization is None:
+            raise ResourceNotFoundException(
+                f"No organization found with matching slug: {slug}"
+            )
+        return organization.model_copy(deep=True)
+
     def get_by_slug(self, slug: str) -> OrganizationDetails:
         """
-        Get the organization from a slug
+        Get the organization from a slug, along with its next upcoming events
         If none retrieved, a debug description is displayed.
 
+        Only the next `UPCOMING_EVENTS_LIMIT` events are loaded, and counted from the events'
+        registration counter rather than their registrations, so the cost of this lookup does
+        not grow with the organization's history. The full history is paginated by the
+        `EventService`.
+
+        Parameters:
+            slug: a string representing a unique organization slug
+
+        Returns:
+            OrganizationDetails: Object with corresponding slug
+
+        Raises:
+            ResourceNotFoundException if no organization is found with the corresponding slug
+        """
+        organization = self.get(slug)
+        now = datetime.now()
+
+        # Count all events and upcoming events in one pass over the organization's events
+        upcoming = EventEntity.time >= now
+        event_count, upcoming_event_count = self._session.execute(
+            select(func.count(), func.count().filter(upcoming)).where(
+                EventEntity.organization_id == organization.id
+            )
+        ).one()
+
+        events = self._session.scalars(
+            select(EventEntity)
+            .where(EventEntity.organization_id == organization.id, upcoming)
+            .order_by(EventEntity.time, EventEntity.id)
+            .limit(UPCOMING_EVENTS_LIMIT)
+        ).all()
+
+        # Load the organizers of the events, the only registrations shown, in one query
+        organizers: dict[int, list[PublicUser]] = {event.id: [] for event in events}
+        if organizers:
+            organizer_registrations = self._session.scalars(
+                select(EventRegistrationEntity)
+                .join(EventRegistrationEntity.user)
+                .options(contains_eager(EventRegistrationEntity.user))
+                .where(
+                    EventRegistrationEntity.event_id.in_(organizers.keys()),
+                    EventRegistrationEntity.registration_type
+                    == RegistrationType.ORGANIZER,
+                )
+            )
+            for organizer in organizer_registrations:
+                organizers[organizer.event_id].append(organizer.to_flat_model())
+
+        return OrganizationDetails(
+            **organization.model_dump(),
+            events=[
+                event.to_model(
+                    registrations=EventRegistrationSummary.of(
+                        event.registration_count, None, organizers[event.id]
+                    )
+                )
+                for event in events
+            ],
+            upcoming_event_count=upcoming_event_count,
+            event_count=event_count,
+        )
+
+    def _get_entity(self, slug: str) -> OrganizationEntity:
+        """
+        Get the entity of the organization with a slug
+
         Parameters:
             slug: a string representing a unique organization slug
 
         Returns:
-            Organization: Object with corresponding slug
+            OrganizationEntity: Entity with corresponding slug
 
         Raises:
             ResourceNotFoundException if no organization is found with the corresponding slug
         """
 
         # Query the organization with matching slug
-        organization = (
-            self._session.query(OrganizationEntity)
-            .filter(OrganizationEntity.slug == slug)
-            .one_or_none()
-        )
+        organization = self._session.scalars(
+            select(OrganizationEntity).where(OrganizationEntity.slug == slug)
+        ).one_or_none()
 
         # Check if result is null
         if organization is None:
@@ -107,7 +339,7 @@ class OrganizationService:
                 f"No organization found with matching slug: {slug}"
             )
 
-        return organization.to_details_model()
+        return organization
 
     def update(self, subject: User, organization: Organization) -> Organization:
         """
@@ -155,7 +387,9 @@ class OrganizationService:
         obj.public = organization.public
 
         # Save changes
+        self._invalidate()
         self._session.commit()
+        organization_directory_cache.clear()
 
         # Return updated object
         return obj.to_model()
@@ -176,19 +410,29 @@ class OrganizationService:
         self._permission.enforce(subject, "organization.delete", f"organization")
 
         # Find object to delete
-        obj = (
-            self._session.query(OrganizationEntity)
-            .filter(OrganizationEntity.slug == slug)
-            .one_or_none()
-        )
-
-        # Ensure object exists
-        if obj is None:
-            raise ResourceNotFoundException(
-                f"No organization found with matching slug: {slug}"
-            )
+        obj = self._get_entity(slug)
 
         # Delete object and commit
         self._session.delete(obj)
         # Save changes
+        self._invalidate()
         self._session.commit()
+        organization_directory_cache.clear()
+
+    def _invalidate(self) -> None:
+        """
+        Invalidate the organization directory as part of a change to an organization.
+
+        The organization version is incremented in the session's current transaction, so
+        callers must call this before committing their change, and clear this process' cached
+        directory once committed. Other worker processes reload their directories once they
+        next check the version.
+        """
+        self._session.execute(
+            insert(OrganizationVersionEntity)
+            .values(id=1, version=1)
+            .on_conflict_do_update(
+                index_elements=[OrganizationVersionEntity.id],
+                set_={"version": OrganizationVersionEntity.version + 1},
+            )
+        )
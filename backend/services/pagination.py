@@ -0,0 +1,126 @@
+"""Helper for services to paginate the results of a query by page number or cursor.
+
+See `models.pagination` for the API of paginated results.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Sequence, TypeVar
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Session
+from ..models.pagination import (
+    Paginated,
+    PaginationParams,
+    decode_cursor,
+    encode_cursor,
+)
+from .exceptions import InvalidPaginationException
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+T = TypeVar("T")
+
+
+def paginate(
+    session: Session,
+    statement: Select,
+    params: PaginationParams,
+    sortable: dict[str, InstrumentedAttribute],
+    key: InstrumentedAttribute,
+    to_model: Callable[[Any], T] | None = None,
+    load: Callable[[Select], Sequence[T]] | None = None,
+) -> Paginated[T]:
+    """Retrieve one page of the entities selected by a statement.
+
+    Results are ordered by the `order_by` column, which must be one of `sortable`, followed by
+    `key` to break ties. Each sortable column should lead an index that also includes `key`, so
+    that continuing after a cursor is an index seek however deep the page is.
+
+    Each selected entity is converted with `to_model`. Alternatively, `load` converts the whole
+    page at once, for models that need more than their entity, e.g. aggregates from a subquery.
+    Either way, the models must have attributes named like the sortable columns and `key`.
+
+    Args:
+        session (Session): The session to execute the statement in.
+        statement (Select): The filtered, but unordered and unlimited, selection of entities.
+        params (PaginationParams): The page requested by the client.
+        sortable (dict[str, InstrumentedAttribute]): The columns results may be ordered by.
+        key (InstrumentedAttribute): The unique column that breaks ties, e.g. the id.
+        to_model (Callable[[Any], T] | None): Converts a selected entity to the model returned.
+        load (Callable[[Select], Sequence[T]] | None): Executes the statement of a page and
+            returns its models, in order, instead of `to_model`.
+
+    Returns:
+        Paginated[T]: The page, along with the cursor to continue after it.
+
+    Raises:
+        InvalidPaginationException: If the order is not sortable or the cursor is malformed.
+    """
+    order_by = params.order_by or key.key
+    column = sortable.get(order_by)
+    if column is None:
+        raise InvalidPaginationException(f"Results cannot be ordered by {order_by}")
+
+    length = None
+    if params.count:
+        length = session.scalar(select(func.count()).select_from(statement.subquery()))
+
+    page = statement.order_by(column, key).limit(params.page_size)
+    if params.cursor:
+        try:
+            cursor_order_by, value, id = decode_cursor(params.cursor)
+            value = _cursor_value(column, value)
+            id = _cursor_value(key, id)
+        except ValueError as e:
+            raise InvalidPaginationException(str(e))
+        if cursor_order_by != order_by:
+            raise InvalidPaginationException(
+                f"Cursor continues an order by {cursor_order_by}, not {order_by}"
+            )
+        page = page.where(tuple_(column, key) > tuple_(value, id))
+    else:
+        page = page.offset(params.page * params.page_size)
+
+    if load is not None:
+        items = list(load(page))
+    else:
+        items = [to_model(entity) for entity in session.scalars(page)]
+
+    next_cursor = None
+    if len(items) == params.page_size:
+        last = items[-1]
+        value = getattr(last, column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        next_cursor = encode_cursor([order_by, value, getattr(last, key.key)])
+
+    return Paginated(
+        items=items,
+        length=length,
+        params=params,
+        next_cursor=next_cursor,
+    )
+
+
+def _cursor_value(column: InstrumentedAttribute, value: Any) -> Any:
+    """Check that a value decoded from a cursor can be compared with a column.
+
+    Cursors come back from clients, so their values are checked before they reach SQL.
+
+    Args:
+        column (InstrumentedAttribute): The column the value is compared with.
+        value (Any): The value, as decoded from JSON.
+
+    Returns:
+        Any: The value, converted to the column's type.
+
+    Raises:
+        ValueError: If the value is not of the column's type.
+    """
+    python_type = column.type.python_type
+    if python_type is datetime and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if isinstance(value, python_type) and not isinstance(value, bool):
+        return value
+    raise ValueError(f"Malformed pagination cursor value for {column.key}: {value!r}")
@@ -1,29 +1,89 @@
 """
 Permission Service grants, revokes, tests, and enforces permissions for users and roles in the system.
 
-This Service is more of an internal service that other services take dependency on. It is not directly
-exposed via the API.
+This Service is more of an internal service that other services take dependency on. It is only exposed
+via the API for users to check their own permissions in batches.
+
+Loaded permission sets are cached across requests in each worker process. Every change to
+permissions or role memberships increments a version counter in the database, in the same
+transaction as the change, and each request compares the counter against the version the
+cached sets were loaded at before trusting them.
 """
 
-import re
+import threading
+from typing import Iterable
 from fastapi import Depends
-from functools import lru_cache
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import select, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, aliased
 from ..database import db_session
+from ..instrumentation import traced
 from ..models import User, Permission, Role, RoleDetails
-from ..entities import UserEntity, PermissionEntity, RoleEntity
+from ..entities import (
+    UserEntity,
+    PermissionEntity,
+    PermissionVersionEntity,
+    RoleEntity,
+    user_role_table,
+)
 from ..services.exceptions import UserPermissionException
+from .permission_index import PermissionIndex
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
+class PermissionSetCache:
+    """Process-wide cache of users' compiled permission sets, all loaded at one permission version."""
+
+    def __init__(self, max_size: int = 10_000):
+        """Initialize an empty cache.
+
+        Args:
+            max_size (int): The number of users whose permission sets are kept before starting over.
+        """
+        self._max_size = max_size
+        self._version: int | None = None
+        self._sets: dict[int, PermissionIndex] = {}
+        self._lock = threading.Lock()
+
+    def get(self, version: int, user_id: int) -> PermissionIndex | None:
+        """Get a user's cached permission set, if it was loaded at the given version."""
+        with self._lock:
+            if version != self._version:
+                return None
+            return self._sets.get(user_id)
+
+    def put(self, version: int, user_id: int, permissions: PermissionIndex) -> None:
+        """Cache a user's permission set, loaded at the given version."""
+        with self._lock:
+            if version != self._version or len(self._sets) >= self._max_size:
+                self._version = version
+                self._sets = {}
+            self._sets[user_id] = permissions
+
+    def clear(self) -> None:
+        """Forget all cached permission sets."""
+        with self._lock:
+            self._version = None
+            self._sets = {}
+
+
+permission_set_cache = PermissionSetCache()
+
+
+@traced
 class PermissionService:
-    """PermissionService grants, revokes, tests, and enforces permissions for users and roles in the system."""
+    """PermissionService grants, revokes, tests, and enforces permissions for users and roles in the system.
+
+    FastAPI constructs one PermissionService per request and shares it among the services that
+    depend on it, so a subject's permissions are looked up at most once per request and reused by
+    every subsequent `check`, `enforce`, and `get_permissions` call."""
 
     _session: Session
+    _permission_sets: dict[int | None, PermissionIndex]
+    _version: int | None
 
     def __init__(self, session: Session = Depends(db_session)):
         """Initialize a new PermissionService instance.
@@ -31,6 +91,8 @@ class PermissionService:
         Args:
             session (Session): The SQLAlchemy session to use for database operations."""
         self._session = session
+        self._permission_sets = {}
+        self._version = None
 
     def get_permissions(self, subject: User) -> list[Permission]:
         """Get the permissions for a user.
@@ -40,10 +102,7 @@ class PermissionService:
 
         Returns:
             list[Permission]: The permissions for the user."""
-        user_permissions = self._get_user_permissions(subject)
-        roles_permissions = self._get_user_roles_permissions(subject)
-        permissions = user_permissions + roles_permissions
-        return [permission.to_model() for permission in permissions]
+        return list(self._get_permission_index(subject).permissions)
 
     def grant(
         self, grantor: User, grantee: User | Role | RoleDetails, permission: Permission
@@ -82,6 +141,7 @@ class PermissionService:
             raise ValueError("grantee must be User or Role")
 
         self._session.add(permission_entity)
+        self.invalidate()
         self._session.commit()
         return True
 
@@ -109,9 +169,27 @@ class PermissionService:
         self.enforce(revoker, permission_entity.action, permission_entity.resource)
 
         self._session.delete(permission_entity)
+        self.invalidate()
         self._session.commit()
         return True
 
+    def invalidate(self) -> None:
+        """Invalidate loaded permissions as part of a change to grants or role memberships.
+
+        The permission version is incremented in the session's current transaction, so callers
+        must call this before committing their change. Once committed, every worker process
+        reloads permission sets on their next use."""
+        self._session.execute(
+            insert(PermissionVersionEntity)
+            .values(id=1, version=1)
+            .on_conflict_do_update(
+                index_elements=[PermissionVersionEntity.id],
+                set_={"version": PermissionVersionEntity.version + 1},
+            )
+        )
+        self._permission_sets.clear()
+        self._version = None
+
     def enforce(self, subject: User, action: str, resource: str) -> None:
         """Enforce a permission for a user.
 
@@ -138,96 +216,88 @@ class PermissionService:
         Returns:
             bool: True if the user has permission to carry out the action on the resource, False otherwise.
         """
-        # Check user permissions
-        user_perms = self._get_user_permissions(subject)
-        if self._has_permission(user_perms, action, resource):
-            return True
+        return self._get_permission_index(subject).allows(action, resource)
 
-        # Check role permissions
-        role_permissions = self._get_user_roles_permissions(subject)
-        return self._has_permission(role_permissions, action, resource)
+    def check_many(self, subject: User, pairs: Iterable[tuple[str, str]]) -> list[bool]:
+        """Check if a user has permission to carry out each of several actions on resources.
 
-    def _get_user_permissions(self, subject: User) -> list[PermissionEntity]:
-        """Get the permissions for a user.
+        The subject's permissions are looked up once for the whole batch.
 
         Args:
-            subject (User): The user to get permissions for.
+            subject (User): The user to check permissions for.
+            pairs (Iterable[tuple[str, str]]): The (action, resource) pairs to check.
 
         Returns:
-            list[PermissionEntity]: The permissions for the user."""
-        user_query = select(PermissionEntity).where(
-            PermissionEntity.user_id == subject.id
-        )
-        user_perms = [p for p in self._session.execute(user_query).scalars()]
-        return user_perms
-
-    def _get_user_roles_permissions(self, subject: User) -> list[PermissionEntity]:
-        """Get the permissions for a user's roles.
-
-        Args:
-            subject (User): The user to get permissions for.
+            list[bool]: Whether the user has permission for each pair, in the order given.
+        """
+        index = self._get_permission_index(subject)
+        return [index.allows(action, resource) for action, resource in pairs]
 
-        Returns:
-            list[PermissionEntity]: The permissions for the user's roles."""
-        user_entity = self._session.get(UserEntity, subject.id)
-        if user_entity == None:
-            return []
-        role_ids = [role.id for role in user_entity.roles]
-        if len(role_ids) == 0:
-            return []
-        role_query = select(PermissionEntity).where(
-            PermissionEntity.role_id.in_(role_ids)
-        )
-        return [p for p in self._session.execute(role_query).scalars()]
+    def _get_permission_index(self, subject: User) -> PermissionIndex:
+        """Get the compiled permissions granted to a user directly and via their roles.
 
-    def _has_permission(
-        self, permissions: list[PermissionEntity], action: str, resource: str
-    ) -> bool:
-        """Check if a user has permission to carry out an action on a resource in a list of permissions.
+        The permissions come from the process-wide cache when it is current. Otherwise, they
+        are loaded in a single query. Either way, they are reused for the lifetime of this
+        service, i.e. the request, until `invalidate` is called.
 
         Args:
-            permissions (list[PermissionEntity]): The permissions to check.
-            action (str): The action in question.
-            resource (str): The resource in question.
+            subject (User): The user to get permissions for.
 
         Returns:
-            bool: True if the user has permission to carry out the action on the resource, False otherwise.
+            PermissionIndex: The user's own permissions followed by those of their roles.
         """
-        for permission in permissions:
-            if self._check_permission(permission, action, resource):
-                return True
-        return False
+        if subject.id in self._permission_sets:
+            return self._permission_sets[subject.id]
+
+        version = self._get_version()
+        permissions = permission_set_cache.get(version, subject.id)
+        if permissions is None:
+            # A union, rather than an OR, lets each half use its own foreign key index
+            user_grants = select(PermissionEntity).where(
+                PermissionEntity.user_id == subject.id
+            )
+            role_grants = (
+                select(PermissionEntity)
+                .join(
+                    user_role_table,
+                    user_role_table.c.role_id == PermissionEntity.role_id,
+                )
+                .where(user_role_table.c.user_id == subject.id)
+            )
+            grant = aliased(
+                PermissionEntity, union_all(user_grants, role_grants).subquery()
+            )
+            query = select(grant).order_by(grant.user_id.is_(None), grant.id)
+            permissions = PermissionIndex(
+                entity.to_model() for entity in self._session.scalars(query)
+            )
+            permission_set_cache.put(version, subject.id, permissions)
+
+        self._permission_sets[subject.id] = permissions
+        return permissions
+
+    def _get_version(self) -> int:
+        """Get the current permission version, reading it at most once per request."""
+        if self._version is None:
+            version = self._session.scalar(
+                select(PermissionVersionEntity.version).where(
+                    PermissionVersionEntity.id == 1
+                )
+            )
+            self._version = version if version is not None else 0
+        return self._version
 
     def _check_permission(
-        self, permission: PermissionEntity, action: str, resource: str
+        self, permission: Permission, action: str, resource: str
     ) -> bool:
-        """Check if a user has permission to carry out an action on a resource.
+        """Check if a single permission allows carrying out an action on a resource.
 
         Args:
-            permission (PermissionEntity): The permission to check.
+            permission (Permission): The permission to check.
             action (str): The action in question.
             resource (str): The resource in question.
 
         Returns:
-            bool: True if the user has permission to carry out the action on the resource, False otherwise.
+            bool: True if the permission allows the action on the resource, False otherwise.
         """
-        action_re = self._expand_pattern(permission.action)
-        if action_re.fullmatch(action) is not None:
-            resource_re = self._expand_pattern(permission.resource)
-            return resource_re.fullmatch(resource) is not None
-        else:
-            return False
-
-    @lru_cache()
-    def _expand_pattern(self, pattern: str) -> re.Pattern:
-        """Expand a permission pattern into a regular expression.
-
-        This function is memoized to avoid recompiling the same regular expression multiple times.
-
-        Args:
-            pattern (str): The pattern to expand.
-
-        Returns:
-            re.Pattern: The compiled regular expression."""
-        search = pattern.replace("*", ".*")
-        return re.compile(f"^{search}$")
+        return PermissionIndex([permission]).allows(action, resource)
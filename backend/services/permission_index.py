@@ -0,0 +1,120 @@
+"""
+A compiled index of permission grants that answers whether an action on a resource is permitted.
+
+Grants are patterns over actions and resources in which `*` matches any run of characters,
+e.g. `coworking.reservation.*` on `*`. Every other character, including `.`, matches only
+itself. Rather than testing each grant in turn, `PermissionIndex`
+compiles a subject's grants into a trie of action patterns whose entries are tries of resource
+patterns. A check walks each trie one character at a time, so it costs roughly the length of the
+action and resource strings no matter how many grants the subject holds.
+"""
+
+from typing import Iterable, Iterator
+from ..models import Permission
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class _Node:
+    """A node of a pattern trie.
+
+    A node reached via a `*` in a pattern loops back onto itself for every character, since the
+    wildcard may consume any number of them."""
+
+    __slots__ = ("children", "star", "loops", "entry")
+
+    children: dict[str, "_Node"]
+    star: "_Node | None"
+    loops: bool
+    entry: "_PatternTrie | bool | None"
+
+    def __init__(self, loops: bool = False):
+        self.children = {}
+        self.star = None
+        self.loops = loops
+        self.entry = None
+
+
+class _PatternTrie:
+    """A trie of wildcard patterns that finds the entries of all patterns matching a string."""
+
+    def __init__(self):
+        self._root = _Node()
+
+    def add(self, pattern: str) -> _Node:
+        """Add a pattern to the trie, returning the node where its entry is stored."""
+        node = self._root
+        for char in pattern:
+            if char == "*":
+                if node.loops:
+                    continue  # Consecutive wildcards match the same as a single one
+                if node.star is None:
+                    node.star = _Node(loops=True)
+                node = node.star
+            else:
+                node = node.children.setdefault(char, _Node())
+        return node
+
+    def matches(self, text: str) -> Iterator["_PatternTrie | bool"]:
+        """Yield the entries of all patterns in the trie that match `text` in full."""
+        states = self._closure([self._root])
+        for char in text:
+            advanced: list[_Node] = []
+            for node in states:
+                child = node.children.get(char)
+                if child is not None:
+                    advanced.append(child)
+                if node.loops:
+                    advanced.append(node)
+            states = self._closure(advanced)
+            if not states:
+                return
+        for node in states:
+            if node.entry is not None:
+                yield node.entry
+
+    def _closure(self, nodes: list[_Node]) -> set[_Node]:
+        """The given nodes along with the wildcard nodes reachable without consuming a character."""
+        closure: set[_Node] = set()
+        for node in nodes:
+            while node is not None and node not in closure:
+                closure.add(node)
+                node = node.star
+        return closure
+
+
+class PermissionIndex:
+    """The compiled grants of a subject, which may be shared across requests and threads."""
+
+    permissions: list[Permission]
+
+    def __init__(self, permissions: Iterable[Permission]):
+        """Compile the grants of a subject.
+
+        Args:
+            permissions (Iterable[Permission]): The permissions granted to the subject.
+        """
+        self.permissions = list(permissions)
+        self._actions = _PatternTrie()
+        for permission in self.permissions:
+            action = self._actions.add(permission.action)
+            if action.entry is None:
+                action.entry = _PatternTrie()
+            action.entry.add(permission.resource).entry = True
+
+    def allows(self, action: str, resource: str) -> bool:
+        """Check if any of the compiled grants permits carrying out an action on a resource.
+
+        Args:
+            action (str): The action in question.
+            resource (str): The resource in question.
+
+        Returns:
+            bool: True if the action on the resource is permitted, False otherwise.
+        """
+        for resources in self._actions.matches(action):
+            for _ in resources.matches(resource):  # type: ignore
+                return True
+        return False
@@ -5,6 +5,7 @@ The Productivity Service allows the API to manipulate pomodoro timer data in the
 from fastapi import Depends
 from pytest import Session
 from backend.database import db_session
+from ..instrumentation import traced
 from backend.entities.pomodoro_timer_entity import PomodoroTimerEntity
 
 from backend.models.user import User
@@ -19,6 +20,7 @@ __copyright__ = "Copyright 2024"
 __license__ = "MIT"
 
 
+@traced
 class ProductivityService:
     """Backend service that enables direct modification of pomodoro timer data."""
 
@@ -0,0 +1,106 @@
+"""
+The Profiler Service lets administrators turn the sampling profiler on and off for live requests
+and retrieve the stacks it collected.
+"""
+
+from fastapi import Depends
+from ..instrumentation import SamplingProfiler, profiler, traced
+from ..models import User, ProfilerSettings, ProfilerStatus
+from .permission import PermissionService
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+@traced
+class ProfilerService:
+    """Service that controls the process-wide sampling profiler."""
+
+    _profiler: SamplingProfiler = profiler
+
+    def __init__(self, permission: PermissionService = Depends()):
+        """Initializes the `ProfilerService`.
+
+        Args:
+            permission (PermissionService): Used to restrict the profiler to administrators.
+        """
+        self._permission = permission
+
+    def status(self, subject: User) -> ProfilerStatus:
+        """Report whether the profiler is on and how much it has collected.
+
+        Args:
+            subject (User): The user requesting the status.
+
+        Returns:
+            ProfilerStatus: The current state of the profiler.
+
+        Raises:
+            UserPermissionException: If the subject may not manage the profiler.
+        """
+        self._permission.enforce(subject, "profiler.manage", "profiler")
+        return self._status()
+
+    def start(self, subject: User, settings: ProfilerSettings) -> ProfilerStatus:
+        """Profile a fraction of requests for a window of time, discarding earlier samples.
+
+        Args:
+            subject (User): The user turning the profiler on.
+            settings (ProfilerSettings): The fraction of requests, window, and sampling interval.
+
+        Returns:
+            ProfilerStatus: The state of the profiler after turning it on.
+
+        Raises:
+            UserPermissionException: If the subject may not manage the profiler.
+        """
+        self._permission.enforce(subject, "profiler.manage", "profiler")
+        self._profiler.start(
+            fraction=settings.fraction,
+            duration_seconds=settings.duration_seconds,
+            interval_ms=settings.interval_ms,
+        )
+        return self._status()
+
+    def stop(self, subject: User) -> ProfilerStatus:
+        """Turn the profiler off, keeping the stacks collected so far.
+
+        Args:
+            subject (User): The user turning the profiler off.
+
+        Returns:
+            ProfilerStatus: The state of the profiler after turning it off.
+
+        Raises:
+            UserPermissionException: If the subject may not manage the profiler.
+        """
+        self._permission.enforce(subject, "profiler.manage", "profiler")
+        self._profiler.stop()
+        return self._status()
+
+    def collapsed_stacks(self, subject: User, route: str | None = None) -> str:
+        """Retrieve collected samples in the collapsed stack format used by flamegraph tools.
+
+        Args:
+            subject (User): The user requesting the stacks.
+            route (str | None): Only include stacks of this route, e.g. `GET /api/events`.
+
+        Returns:
+            str: One line per distinct stack, rooted at its route, with its sample count.
+
+        Raises:
+            UserPermissionException: If the subject may not manage the profiler.
+        """
+        self._permission.enforce(subject, "profiler.manage", "profiler")
+        return self._profiler.collapsed_stacks(route)
+
+    def _status(self) -> ProfilerStatus:
+        return ProfilerStatus(
+            active=self._profiler.active,
+            fraction=self._profiler.fraction,
+            interval_ms=self._profiler.interval_ms,
+            until=self._profiler.until if self._profiler.active else None,
+            requests_profiled=self._profiler.requests_profiled,
+            samples=self._profiler.samples,
+        )
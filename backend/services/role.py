@@ -6,11 +6,13 @@ from fastapi import Depends
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 from ..database import db_session
+from ..instrumentation import traced
 from ..models import User, Role, RoleDetails, Permission
 from ..entities import RoleEntity, PermissionEntity, UserEntity
 from .permission import PermissionService
 
 
+@traced
 class RoleService:
     """RoleService is the access layer to the role data model, its members, and permissions."""
 
@@ -119,6 +121,7 @@ class RoleService:
         user = self._session.get(UserEntity, member.id)
         if user:
             role.users.append(user)
+            self._permission.invalidate()
             self._session.commit()
         return self.details(subject, id)
 
@@ -151,5 +154,6 @@ class RoleService:
         role = self._session.get(RoleEntity, id)
         user = self._session.get(UserEntity, userId)
         role.users.remove(user)
+        self._permission.invalidate()
         self._session.commit()
         return True
@@ -4,22 +4,41 @@ The User Service provides access to the User model and its associated database o
 """
 
 from fastapi import Depends
-from sqlalchemy import select, or_, func
+from sqlalchemy import ColumnElement, select, or_, func, text
 from sqlalchemy.orm import Session
 from ..database import db_session
+from ..instrumentation import traced
 from ..models import User, UserDetails, Paginated, PaginationParams
 from ..entities import UserEntity
+from ..entities.user_entity import user_search_text
 from .exceptions import ResourceNotFoundException
+from .pagination import paginate
 from .permission import PermissionService
+from .user_cache import user_cache
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
+_PID_DIGITS = 9
+
+SORTABLE_USER_COLUMNS = {
+    "id": UserEntity.id,
+    "pid": UserEntity.pid,
+    "onyen": UserEntity.onyen,
+    "email": UserEntity.email,
+    "first_name": UserEntity.first_name,
+    "last_name": UserEntity.last_name,
+}
+"""Columns users may be paginated by, each of which leads an index."""
+
+
+@traced
 class UserService:
     _session: Session
     _permission: PermissionService
+    _trigram_search: bool | None = None
 
     def __init__(
         self,
@@ -30,25 +49,46 @@ class UserService:
         self._session = session
         self._permission = permission
 
-    def get(self, pid: int) -> UserDetails | None:
-        """Get a User by PID.
+    def get_by_pid(self, pid: int) -> User | None:
+        """Get a User by PID, without loading their permissions.
 
         Args:
             pid: The PID of the user.
 
         Returns:
-            UserDetails | None: The user or None if not found.
+            User | None: The user or None if not found.
         """
         query = select(UserEntity).where(UserEntity.pid == pid)
         user_entity: UserEntity | None = self._session.scalar(query)
-        if user_entity is None:
+        return None if user_entity is None else user_entity.to_model()
+
+    def get(self, pid: int) -> UserDetails | None:
+        """Get a User by PID, along with their permissions.
+
+        Args:
+            pid: The PID of the user.
+
+        Returns:
+            UserDetails | None: The user or None if not found.
+        """
+        user = self.get_by_pid(pid)
+        if user is None:
             return None
         else:
-            user = user_entity.to_model()
-            user_fields = user.model_dump()
-            user_fields["permissions"] = self._permission.get_permissions(user)
-            user_details = UserDetails(**user_fields)
-            return user_details
+            return self.get_details(user)
+
+    def get_details(self, user: User) -> UserDetails:
+        """Attach a User's permissions to them.
+
+        Args:
+            user: The user, e.g. as resolved by `get_by_pid`.
+
+        Returns:
+            UserDetails: The user along with their permissions.
+        """
+        user_fields = user.model_dump()
+        user_fields["permissions"] = self._permission.get_permissions(user)
+        return UserDetails(**user_fields)
 
     def get_by_id(self, id: int) -> User:
         """Get a User by their id.
@@ -69,7 +109,10 @@ class UserService:
         return user_entity.to_model()
 
     def search(self, _subject: User, query: str) -> list[User]:
-        """Search for users by their name, onyen, email.
+        """Search for users by their name, onyen, email, or a prefix of their PID.
+
+        Users whose onyen begins with the query come first, followed by the rest in order of
+        their similarity to the query.
 
         Args:
             subject: The user performing the action.
@@ -78,23 +121,58 @@ class UserService:
         Returns:
             list[User]: The list of users matching the query.
         """
-        statement = select(UserEntity)
-        criteria = or_(
-            UserEntity.first_name.ilike(f"%{query}%"),
-            UserEntity.last_name.ilike(f"%{query}%"),
-            UserEntity.onyen.ilike(f"%{query}%"),
-            UserEntity.email.ilike(f"%{query}%"),
+        ranking = [UserEntity.onyen.ilike(f"{query}%").desc()]
+        if self._trigram_search_available():
+            ranking.append(func.word_similarity(query, user_search_text).desc())
+        statement = (
+            select(UserEntity)
+            .where(self._search_criteria(query))
+            .order_by(*ranking, UserEntity.id)
+            .limit(10)
         )
-        statement = statement.where(criteria).limit(10)
         entities = self._session.execute(statement).scalars()
         return [entity.to_model() for entity in entities]
 
+    def _search_criteria(self, query: str) -> ColumnElement[bool]:
+        """Criteria matching users by their name, onyen, email, or a prefix of their PID.
+
+        Both the substring and the similarity match use the trigram index over the user search
+        text, and a PID prefix is matched as a range of the PID index, so that no criterion
+        requires a sequential scan of the user table."""
+        criteria = [user_search_text.ilike(f"%{query}%")]
+        if self._trigram_search_available():
+            criteria.append(user_search_text.op("%>")(query))
+        # Only ASCII digits, since `str.isdigit` also accepts e.g. superscripts
+        if query.isascii() and query.isdigit() and len(query) <= _PID_DIGITS:
+            scale = 10 ** (_PID_DIGITS - len(query))
+            prefix = int(query)
+            criteria.append(
+                UserEntity.pid.between(prefix * scale, (prefix + 1) * scale - 1)
+            )
+        return or_(*criteria)
+
+    def _trigram_search_available(self) -> bool:
+        """Whether the pg_trgm extension is installed, which ranked search depends on.
+
+        Checked once per process, since installing the extension requires a migration.
+        """
+        if UserService._trigram_search is None:
+            UserService._trigram_search = bool(
+                self._session.scalar(
+                    text(
+                        "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')"
+                    )
+                )
+            )
+        return UserService._trigram_search
+
     def list(
         self, subject: User, pagination_params: PaginationParams
     ) -> Paginated[User]:
         """List Users.
 
-        The subject must have the 'user.list' permission on the 'user/' resource.
+        The subject must have the 'user.list' permission on the 'user/' resource. A filter
+        matches users by the same criteria as `search`.
 
         Args:
             subject: The user performing the action.
@@ -105,38 +183,21 @@ class UserService:
 
         Raises:
             PermissionException: If the subject does not have the required permission.
+            InvalidPaginationException: If users cannot be ordered as requested.
         """
         self._permission.enforce(subject, "user.list", "user/")
 
         statement = select(UserEntity)
-        length_statement = select(func.count()).select_from(UserEntity)
         if pagination_params.filter != "":
-            query = pagination_params.filter
-            criteria = or_(
-                UserEntity.first_name.ilike(f"%{query}%"),
-                UserEntity.last_name.ilike(f"%{query}%"),
-                UserEntity.onyen.ilike(f"%{query}%"),
-            )
-            statement = statement.where(criteria)
-            length_statement = length_statement.where(criteria)
-
-        offset = pagination_params.page * pagination_params.page_size
-        limit = pagination_params.page_size
-
-        if pagination_params.order_by != "":
-            statement = statement.order_by(
-                getattr(UserEntity, pagination_params.order_by)
-            )
-
-        statement = statement.offset(offset).limit(limit)
-
-        length = self._session.execute(length_statement).scalar()
-        entities = self._session.execute(statement).scalars()
-
-        return Paginated(
-            items=[entity.to_model() for entity in entities],
-            length=length,
-            params=pagination_params,
+            statement = statement.where(self._search_criteria(pagination_params.filter))
+
+        return paginate(
+            self._session,
+            statement,
+            pagination_params,
+            SORTABLE_USER_COLUMNS,
+            UserEntity.id,
+            UserEntity.to_model,
         )
 
     def create(self, subject: User, user: User) -> User:
@@ -179,6 +240,9 @@ class UserService:
         if subject != user:
             self._permission.enforce(subject, "user.update", f"user/{user.id}")
         entity = self._session.get(UserEntity, user.id)
+        previous_pid = entity.pid
         entity.update(user)
         self._session.commit()
+        user_cache.invalidate(previous_pid)
+        user_cache.invalidate(entity.pid)
         return entity.to_model()
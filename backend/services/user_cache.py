@@ -0,0 +1,102 @@
+"""
+Process-wide cache of the users that verified bearer tokens resolve to.
+
+Authenticating a request means verifying its token and then loading the user from the database.
+Since a client sends the same token with every request, the `registered_user` dependency keeps the
+users of recently seen tokens here, so that most requests authenticate without touching the
+database.
+
+Entries are evicted least recently used first once the cache is full and expire after a time to
+live, or when the token itself expires, whichever comes first. Profile updates made through this
+process invalidate entries immediately. Updates made by other worker processes become visible
+here once the time to live elapses. Permissions are not cached with users, see `PermissionService`.
+"""
+
+import threading
+from collections import OrderedDict
+from time import monotonic
+from ..models import User
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class UserCache:
+    """Bounded LRU cache, with a time to live, of verified tokens to the users they resolve to."""
+
+    def __init__(self, max_size: int = 10_000, ttl_seconds: float = 60.0):
+        """Initialize an empty cache.
+
+        Args:
+            max_size (int): The number of tokens kept before the least recently used is evicted.
+            ttl_seconds (float): How long a resolved user is trusted before it is loaded again.
+        """
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> User | None:
+        """Get the user a token resolves to, if cached and not yet expired.
+
+        Args:
+            token (str): A bearer token whose signature has been verified.
+
+        Returns:
+            User | None: The user, or None if the token must be resolved again.
+        """
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            expires, user = entry
+            if monotonic() >= expires:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return user
+
+    def put(
+        self, token: str, user: User, token_ttl_seconds: float | None = None
+    ) -> None:
+        """Cache the user a token resolves to.
+
+        Args:
+            token (str): A bearer token whose signature has been verified.
+            user (User): The user the token resolves to.
+            token_ttl_seconds (float | None): The time left until the token expires, if it does.
+        """
+        ttl_seconds = self._ttl_seconds
+        if token_ttl_seconds is not None:
+            ttl_seconds = min(ttl_seconds, token_ttl_seconds)
+        if ttl_seconds <= 0:
+            return
+
+        with self._lock:
+            self._entries[token] = (monotonic() + ttl_seconds, user)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, pid: int) -> None:
+        """Forget the cached tokens of a user, e.g. after their profile changed.
+
+        Args:
+            pid (int): The PID of the user.
+        """
+        with self._lock:
+            tokens = [
+                token for token, (_, user) in self._entries.items() if user.pid == pid
+            ]
+            for token in tokens:
+                del self._entries[token]
+
+    def clear(self) -> None:
+        """Forget all cached tokens."""
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+"""The cache consulted by the `registered_user` dependency."""
@@ -0,0 +1,280 @@
+"""
+The User Import Service creates and updates users in bulk from CSV, e.g. to onboard a semester.
+
+Rows are validated in a single streaming pass that writes valid rows to a buffer in CSV form.
+The buffer is then loaded with Postgres `COPY` into a temporary staging table and upserted into
+the user table with one `INSERT ... ON CONFLICT (pid)` statement. Importing thousands of users
+therefore costs a handful of statements and one permission check, rather than an ORM insert,
+commit, and permission check per user.
+
+A CSV file must have a header row with at least the `pid` and `onyen` columns. The `email`,
+`first_name`, `last_name`, and `pronouns` columns are optional. Existing users keep the values of
+columns missing from the file, and of blank fields, so a roster of only PIDs and onyens does not
+erase anyone's profile. Emails are unique, so creating a user requires one. When importing a
+section roster, the optional `roster_role` column holds each user's role in the section, which
+defaults to `STUDENT`.
+"""
+
+import csv
+import io
+from typing import TextIO
+import psycopg2
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from ..database import db_session
+from ..instrumentation import traced
+from ..models import User, UserImportSummary
+from ..models.roster_role import RosterRole
+from ..entities.academics import SectionEntity
+from .exceptions import ResourceNotFoundException
+from .permission import PermissionService
+from .user_cache import user_cache
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+# Columns of the staging table, in the order valid rows are written to the buffer
+_COLUMNS = (
+    "pid",
+    "onyen",
+    "email",
+    "first_name",
+    "last_name",
+    "pronouns",
+    "roster_role",
+)
+
+# Maximum lengths of the text columns of the user table
+_MAX_LENGTHS = {
+    "onyen": 32,
+    "email": 32,
+    "first_name": 64,
+    "last_name": 64,
+    "pronouns": 32,
+}
+
+# Stop reporting errors beyond this many, so that a wrong file does not produce a huge response
+_MAX_ERRORS = 100
+
+
+@traced
+class UserImportService:
+    """Service that imports users, and optionally a section roster, from CSV."""
+
+    _session: Session
+    _permission: PermissionService
+
+    def __init__(
+        self,
+        session: Session = Depends(db_session),
+        permission: PermissionService = Depends(),
+    ):
+        """Initialize the User Import Service.
+
+        Args:
+            session (Session): The session to import users in.
+            permission (PermissionService): Used to restrict imports to administrators.
+        """
+        self._session = session
+        self._permission = permission
+
+    def import_csv(
+        self, subject: User, csv_file: TextIO, section_id: int | None = None
+    ) -> UserImportSummary:
+        """Create users who do not exist yet and update those who do, matched by PID.
+
+        The subject must have the `user.import` permission on `user/`, and to import a section
+        roster, the `academics.section.update` permission on the section.
+
+        Args:
+            subject (User): The user performing the import.
+            csv_file (TextIO): The CSV file, with a header row, opened in text mode.
+            section_id (int | None): The section to enroll all imported users in, if any.
+
+        Returns:
+            UserImportSummary: The number of users created, updated, and enrolled, or the
+                errors found, in which case nothing was imported.
+
+        Raises:
+            UserPermissionException: If the subject may not import users or the roster.
+            ResourceNotFoundException: If the section does not exist.
+        """
+        self._permission.enforce(subject, "user.import", "user/")
+        if section_id is not None:
+            self._permission.enforce(
+                subject, "academics.section.update", f"section/{section_id}"
+            )
+            if self._session.get(SectionEntity, section_id) is None:
+                raise ResourceNotFoundException(
+                    f"Section with id: {section_id} does not exist."
+                )
+
+        staged, columns, errors = self._validate(csv_file)
+        if errors:
+            return UserImportSummary(errors=errors)
+
+        cursor = self._session.connection().connection.cursor()
+        try:
+            self._stage(cursor, staged)
+            if "email" not in columns:
+                errors = self._new_users_without_email(cursor)
+                if errors:
+                    self._session.rollback()
+                    return UserImportSummary(errors=errors)
+            created, updated = self._upsert(cursor, columns)
+            enrolled = 0
+            if section_id is not None:
+                enrolled = self._enroll(cursor, section_id)
+        except psycopg2.IntegrityError as e:
+            self._session.rollback()
+            return UserImportSummary(errors=[e.pgerror or str(e)])
+        finally:
+            cursor.close()
+
+        self._session.commit()
+        user_cache.clear()
+        return UserImportSummary(created=created, updated=updated, enrolled=enrolled)
+
+    def _validate(self, csv_file: TextIO) -> tuple[io.StringIO, set[str], list[str]]:
+        """Validate the rows of a CSV file, writing the valid ones to a buffer to COPY from.
+
+        Returns the buffer, the columns of the file's header, and the errors found."""
+        staged = io.StringIO()
+        errors: list[str] = []
+        reader = csv.DictReader(csv_file)
+        columns = set(reader.fieldnames or [])
+        missing = {"pid", "onyen"} - columns
+        if missing:
+            return staged, columns, [f"Missing column(s): {', '.join(sorted(missing))}"]
+
+        writer = csv.writer(staged)
+        pids: set[int] = set()
+        onyens: set[str] = set()
+        emails: set[str] = set()
+        for row in reader:
+            line = reader.line_num
+            values = {column: (row.get(column) or "").strip() for column in _COLUMNS}
+            problems: list[str] = []
+
+            if not (values["pid"].isdigit() and len(values["pid"]) == 9):
+                problems.append("pid must be 9 digits")
+            elif int(values["pid"]) in pids:
+                problems.append("pid appears more than once")
+            else:
+                pids.add(int(values["pid"]))
+
+            if values["onyen"] == "":
+                problems.append("onyen is required")
+            elif values["onyen"] in onyens:
+                problems.append("onyen appears more than once")
+            else:
+                onyens.add(values["onyen"])
+
+            if "email" in columns:
+                if values["email"] == "":
+                    problems.append("email is required")
+                elif values["email"].lower() in emails:
+                    problems.append("email appears more than once")
+                else:
+                    emails.add(values["email"].lower())
+
+            for column, max_length in _MAX_LENGTHS.items():
+                if len(values[column]) > max_length:
+                    problems.append(f"{column} is longer than {max_length} characters")
+
+            values["roster_role"] = values["roster_role"].upper() or "STUDENT"
+            if values["roster_role"] not in RosterRole.__members__:
+                problems.append(
+                    f"roster_role must be one of {', '.join(RosterRole.__members__)}"
+                )
+
+            if problems:
+                if len(errors) < _MAX_ERRORS:
+                    errors.append(f"Line {line}: {'; '.join(problems)}")
+            else:
+                writer.writerow([values[column] for column in _COLUMNS])
+
+        if len(errors) == _MAX_ERRORS:
+            errors.append("Further errors were not reported.")
+        staged.seek(0)
+        return staged, columns, errors
+
+    def _stage(self, cursor, staged: io.StringIO) -> None:
+        """Load the validated rows into a temporary staging table."""
+        cursor.execute(
+            """
+            CREATE TEMPORARY TABLE user_import (
+                pid integer PRIMARY KEY,
+                onyen varchar(32) NOT NULL,
+                email varchar(32) NOT NULL,
+                first_name varchar(64) NOT NULL,
+                last_name varchar(64) NOT NULL,
+                pronouns varchar(32) NOT NULL,
+                roster_role rosterrole NOT NULL
+            ) ON COMMIT DROP
+            """
+        )
+        # Empty fields are empty strings, as in the user table, rather than NULL
+        cursor.copy_expert(
+            f"COPY user_import ({', '.join(_COLUMNS)}) FROM STDIN WITH (FORMAT csv,"
+            f" FORCE_NOT_NULL ({', '.join(_MAX_LENGTHS)}))",
+            staged,
+        )
+
+    def _new_users_without_email(self, cursor) -> list[str]:
+        """Report staged users who do not exist yet, when the file has no emails to create them."""
+        cursor.execute(
+            """
+            SELECT user_import.pid
+            FROM user_import LEFT JOIN "user" ON "user".pid = user_import.pid
+            WHERE "user".id IS NULL
+            ORDER BY user_import.pid
+            LIMIT %(limit)s
+            """,
+            {"limit": _MAX_ERRORS + 1},
+        )
+        errors = [
+            f"PID {pid}: email is required to create a user"
+            for (pid,) in cursor.fetchall()
+        ]
+        if len(errors) > _MAX_ERRORS:
+            errors[_MAX_ERRORS:] = ["Further errors were not reported."]
+        return errors
+
+    def _upsert(self, cursor, columns: set[str]) -> tuple[int, int]:
+        """Upsert the staged rows into the user table.
+
+        Existing users are only updated from the given columns of the file, and only from
+        fields that are not blank."""
+        updates = ["onyen = EXCLUDED.onyen"] + [
+            f"{column} = COALESCE(NULLIF(EXCLUDED.{column}, ''), \"user\".{column})"
+            for column in _MAX_LENGTHS
+            if column != "onyen" and column in columns
+        ]
+        # A row's xmax is 0 when it was inserted rather than updated by this statement
+        cursor.execute(
+            f"""
+            INSERT INTO "user" (pid, onyen, email, first_name, last_name, pronouns, github)
+            SELECT pid, onyen, email, first_name, last_name, pronouns, ''
+            FROM user_import
+            ON CONFLICT (pid) DO UPDATE SET {", ".join(updates)}
+            RETURNING xmax = 0
+            """
+        )
+        inserted = [created for (created,) in cursor.fetchall()]
+        return inserted.count(True), inserted.count(False)
+
+    def _enroll(self, cursor, section_id: int) -> int:
+        """Enroll the staged users in a section, updating the roles of existing members."""
+        cursor.execute(
+            """
+            INSERT INTO academics__user_section (section_id, user_id, member_role)
+            SELECT %(section_id)s, "user".id, user_import.roster_role
+            FROM user_import JOIN "user" ON "user".pid = user_import.pid
+            ON CONFLICT (section_id, user_id) DO UPDATE SET
+                member_role = EXCLUDED.member_role
+            """,
+            {"section_id": section_id},
+        )
+        return cursor.rowcount
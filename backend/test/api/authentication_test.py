@@ -0,0 +1,142 @@
+"""Tests for delegated authentication against a local stand-in for the authentication server."""
+
+import json
+import sys
+import threading
+import jwt
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import sleep
+from urllib.parse import parse_qs, urlparse
+from fastapi import HTTPException
+
+from ...api import authentication
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class StubAuthServer(ThreadingHTTPServer):
+    """Answers `/verify` the way the production server does, recording each request."""
+
+    daemon_threads = True
+    delay_seconds: float = 0.0
+    requests: list[tuple[str, int]]
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _StubAuthHandler)
+        self.requests = []
+
+    def handle_error(self, request, client_address):
+        # Clients that time out hang up before their response is written
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    @property
+    def verify_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/verify"
+
+
+class _StubAuthHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep connections alive, as production does
+    server: StubAuthServer
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.client_address[1]))
+        sleep(self.server.delay_seconds)
+        token = parse_qs(urlparse(self.path).query).get("token", [""])[0]
+        try:
+            status, body = 200, authentication.auth_verify(token)
+        except jwt.exceptions.PyJWTError:
+            status, body = 401, {"detail": "Invalid token"}
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        ...
+
+
+@pytest.fixture()
+def auth_server(monkeypatch):
+    server = StubAuthServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(authentication, "_AUTH_SERVER_VERIFY_URL", server.verify_url)
+    monkeypatch.setattr(authentication, "_AUTH_SERVER_TIMEOUT", (1.0, 0.5))
+    monkeypatch.setattr(
+        authentication, "_auth_server", authentication._auth_server_session()
+    )
+    authentication._verified_tokens.clear()
+    yield server
+    authentication._auth_server.close()
+    server.shutdown()
+    server.server_close()
+
+
+def _reissued_token(response) -> dict:
+    content = response.body.decode()
+    token = content.split("localStorage.setItem('bearerToken', '")[1].split("'")[0]
+    return jwt.decode(token, authentication._JWT_SECRET, algorithms=["HS256"])
+
+
+def test_verify_delegated_token(auth_server: StubAuthServer):
+    token = authentication._generate_token("ambassador", 888888888)
+    response = authentication._verify_delegated_auth_token("/", token)
+    claims = _reissued_token(response)
+    assert (claims["uid"], claims["pid"]) == ("ambassador", 888888888)
+    assert len(auth_server.requests) == 1
+
+
+def test_verified_token_is_cached(auth_server: StubAuthServer):
+    token = authentication._generate_token("ambassador", 888888888)
+    authentication._verify_delegated_auth_token("/", token)
+    response = authentication._verify_delegated_auth_token("/", token)
+    assert _reissued_token(response)["pid"] == 888888888
+    assert len(auth_server.requests) == 1
+
+
+def test_connections_are_reused(auth_server: StubAuthServer):
+    authentication._verify_delegated_auth_token(
+        "/", authentication._generate_token("ambassador", 888888888)
+    )
+    authentication._verify_delegated_auth_token(
+        "/", authentication._generate_token("user", 111111111)
+    )
+    ports = {port for _, port in auth_server.requests}
+    assert len(auth_server.requests) == 2
+    assert len(ports) == 1
+
+
+def test_invalid_token_is_rejected(auth_server: StubAuthServer):
+    forged = jwt.encode({"uid": "root", "pid": 999999999}, "not-the-secret")
+    with pytest.raises(HTTPException) as e:
+        authentication._verify_delegated_auth_token("/", forged)
+    assert e.value.status_code == 401
+
+    # Rejections are not cached
+    with pytest.raises(HTTPException):
+        authentication._verify_delegated_auth_token("/", forged)
+    assert len(auth_server.requests) == 2
+
+
+def test_slow_auth_server_times_out(auth_server: StubAuthServer):
+    auth_server.delay_seconds = 1.0
+    token = authentication._generate_token("ambassador", 888888888)
+    with pytest.raises(HTTPException) as e:
+        authentication._verify_delegated_auth_token("/", token)
+    assert e.value.status_code == 503
+
+
+def test_unreachable_auth_server(auth_server: StubAuthServer, monkeypatch):
+    monkeypatch.setattr(
+        authentication, "_AUTH_SERVER_VERIFY_URL", "http://127.0.0.1:9/verify"
+    )
+    token = authentication._generate_token("ambassador", 888888888)
+    with pytest.raises(HTTPException) as e:
+        authentication._verify_delegated_auth_token("/", token)
+    assert e.value.status_code == 503
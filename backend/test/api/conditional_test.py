@@ -0,0 +1,74 @@
+"""Tests for answering conditional GET requests."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from fastapi import Request
+
+from ...api.conditional import conditional_response
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+ETAG = '"abc123"'
+LAST_MODIFIED = datetime(2023, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _request(**headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [
+                (name.replace("_", "-").encode(), value.encode())
+                for name, value in headers.items()
+            ],
+        }
+    )
+
+
+def _respond(request: Request):
+    return conditional_response(
+        request, "body", ETAG, LAST_MODIFIED, "text/plain", max_age=60
+    )
+
+
+def test_unconditional_request_gets_body_and_validators():
+    response = _respond(_request())
+    assert response.status_code == 200
+    assert response.body == b"body"
+    assert response.headers["etag"] == ETAG
+    assert response.headers["last-modified"] == "Sun, 01 Oct 2023 12:00:00 GMT"
+    assert response.headers["cache-control"] == "max-age=60, must-revalidate"
+
+
+def test_matching_etag_is_not_modified():
+    response = _respond(_request(if_none_match=f'"other", W/{ETAG}'))
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == ETAG
+
+
+def test_stale_etag_gets_body():
+    assert _respond(_request(if_none_match='"other"')).status_code == 200
+
+
+def test_etag_takes_precedence_over_modification_time():
+    request = _request(
+        if_none_match='"other"',
+        if_modified_since=format_datetime(LAST_MODIFIED, usegmt=True),
+    )
+    assert _respond(request).status_code == 200
+
+
+def test_if_modified_since():
+    since = format_datetime(LAST_MODIFIED, usegmt=True)
+    assert _respond(_request(if_modified_since=since)).status_code == 304
+
+    before = format_datetime(LAST_MODIFIED - timedelta(seconds=1), usegmt=True)
+    assert _respond(_request(if_modified_since=before)).status_code == 200
+
+
+def test_malformed_if_modified_since_gets_body():
+    assert _respond(_request(if_modified_since="yesterday")).status_code == 200
@@ -0,0 +1,61 @@
+"""Tests for the response shapes of event listing routes."""
+
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from ...api.events.events import _search_time_range
+from ...main import app
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+client = TestClient(app)
+
+
+def _response_schema(path: str) -> dict:
+    return app.openapi()["paths"][path]["get"]["responses"]["200"]["content"][
+        "application/json"
+    ]["schema"]
+
+
+def test_get_events_lists_events():
+    schema = _response_schema("/api/events")
+    assert schema["type"] == "array"
+
+
+def test_get_paginated_events_pages_events():
+    schema = _response_schema("/api/events/paginated")
+    assert schema["$ref"].endswith("Paginated_EventDetails_")
+
+
+def test_organization_events_are_paginated():
+    for path in [
+        "/api/events/organization/{slug}/paginated",
+        "/api/events/organization/{slug}/paginated/unauthenticated",
+    ]:
+        assert _response_schema(path)["$ref"].endswith("Paginated_EventDetails_")
+
+
+def test_unbounded_organization_listings_are_deprecated():
+    paths = app.openapi()["paths"]
+    assert paths["/api/events/organization/{slug}"]["get"]["deprecated"]
+    assert paths["/api/events/organization/{slug}/unauthenticated"]["get"]["deprecated"]
+
+
+def test_organization_events_page_size_zero_is_unprocessable():
+    response = client.get(
+        "/api/events/organization/cssg/paginated/unauthenticated?page_size=0"
+    )
+    assert response.status_code == 422
+
+
+def test_paginated_routes_default_to_upcoming_events():
+    before = datetime.now()
+    time_range = _search_time_range(None, None)
+    assert before <= time_range.start <= datetime.now()
+    assert time_range.end == datetime.max
+
+    start = before - timedelta(days=30)
+    assert _search_time_range(start, None).start == start
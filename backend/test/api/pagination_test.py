@@ -0,0 +1,35 @@
+"""Tests for rejecting malformed pagination parameters in API routes."""
+
+from fastapi.testclient import TestClient
+
+from ...main import app
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+client = TestClient(app)
+
+
+def test_page_size_zero_is_unprocessable():
+    response = client.get("/api/organizations/cssg/events?page_size=0")
+    assert response.status_code == 422
+
+
+def test_negative_page_is_unprocessable():
+    response = client.get("/api/organizations/cssg/events?page=-1")
+    assert response.status_code == 422
+
+
+def test_page_size_above_maximum_is_unprocessable():
+    response = client.get("/api/organizations/cssg/events?page_size=101")
+    assert response.status_code == 422
+
+
+def test_inverted_time_range_is_unprocessable():
+    response = client.get(
+        "/api/organizations/cssg/events"
+        "?start=2024-01-02T00:00:00&end=2024-01-01T00:00:00"
+    )
+    assert response.status_code == 422
+    assert "end must be greater than start" in response.json()["detail"]
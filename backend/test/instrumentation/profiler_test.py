@@ -0,0 +1,117 @@
+"""Tests for the sampling profiler and its middleware."""
+
+import pytest
+from time import perf_counter
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from ...instrumentation.profiler import SamplingProfiler, ProfilingMiddleware
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def busy_work(duration: float) -> None:
+    deadline = perf_counter() + duration
+    while perf_counter() < deadline:
+        ...
+
+
+def slow_endpoint(request):
+    busy_work(0.1)
+    return PlainTextResponse("OK")
+
+
+def _client(profiler: SamplingProfiler) -> TestClient:
+    app = Starlette(routes=[Route("/api/slow", slow_endpoint)])
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+    return TestClient(app)
+
+
+def test_profiler_is_off_by_default():
+    profiler = SamplingProfiler()
+    client = _client(profiler)
+
+    assert client.get("/api/slow").status_code == 200
+    assert not profiler.active
+    assert profiler.requests_profiled == 0
+    assert profiler.collapsed_stacks() == ""
+
+
+def test_profiler_collapses_stacks_per_route():
+    profiler = SamplingProfiler()
+    profiler.start(fraction=1.0, duration_seconds=60, interval_ms=1)
+    client = _client(profiler)
+
+    assert client.get("/api/slow").status_code == 200
+
+    assert profiler.requests_profiled == 1
+    assert profiler.samples > 0
+    lines = profiler.collapsed_stacks().splitlines()
+    assert len(lines) > 0
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert stack.startswith("GET,HEAD /api/slow;")
+    assert any(f"{__name__}:busy_work" in line for line in lines)
+    assert (
+        profiler.collapsed_stacks("GET,HEAD /api/slow") == profiler.collapsed_stacks()
+    )
+    assert profiler.collapsed_stacks("GET /api/other") == ""
+
+
+def test_profiler_fraction_zero_profiles_nothing():
+    profiler = SamplingProfiler()
+    profiler.start(fraction=0.0, duration_seconds=60)
+    client = _client(profiler)
+
+    assert client.get("/api/slow").status_code == 200
+    assert profiler.requests_profiled == 0
+
+
+def test_profiler_ignores_non_api_requests():
+    profiler = SamplingProfiler()
+    profiler.start()
+    app = Starlette(routes=[Route("/slow", slow_endpoint)])
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+    assert TestClient(app).get("/slow").status_code == 200
+    assert profiler.requests_profiled == 0
+
+
+def test_profiler_stop_keeps_stacks_until_restarted():
+    profiler = SamplingProfiler()
+    profiler.start(interval_ms=1)
+    client = _client(profiler)
+    client.get("/api/slow")
+
+    profiler.stop()
+    assert not profiler.active
+    client.get("/api/slow")
+    assert profiler.requests_profiled == 1
+    assert profiler.collapsed_stacks() != ""
+
+    profiler.start()
+    assert profiler.collapsed_stacks() == ""
+
+
+def test_profiler_window_elapses():
+    profiler = SamplingProfiler()
+    profiler.start(duration_seconds=0.001)
+    busy_work(0.01)
+
+    assert not profiler.active
+    assert not profiler.should_profile()
+
+
+def test_profiler_start_validates_arguments():
+    profiler = SamplingProfiler()
+    with pytest.raises(ValueError):
+        profiler.start(fraction=1.5)
+    with pytest.raises(ValueError):
+        profiler.start(duration_seconds=0)
+    with pytest.raises(ValueError):
+        profiler.start(interval_ms=-1)
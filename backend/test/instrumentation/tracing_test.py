@@ -0,0 +1,147 @@
+"""Tests for service-method tracing and the JSON-lines trace exporter."""
+
+import json
+import pytest
+from pathlib import Path
+from sqlalchemy import create_engine, text
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from ...instrumentation.tracing import (
+    Span,
+    SpanExporter,
+    JSONLinesFileExporter,
+    TracingMiddleware,
+    traced,
+    start_trace,
+    current_span,
+)
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+@traced
+class FakeService:
+    def __init__(self):
+        self._engine = create_engine("sqlite://")
+
+    def outer(self) -> int:
+        with self._engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return self._inner() + 1
+
+    def _inner(self) -> int:
+        with self._engine.connect() as connection:
+            connection.execute(text("SELECT 2"))
+            connection.execute(text("SELECT 3"))
+        return 1
+
+    def fail(self) -> None:
+        raise ValueError("Expected")
+
+
+class ListExporter(SpanExporter):
+    def __init__(self):
+        self.traces: list[Span] = []
+
+    def export(self, trace: Span) -> None:
+        self.traces.append(trace)
+
+
+def test_traced_method_without_trace_is_passthrough():
+    """Traced methods behave exactly like the originals when no trace is active."""
+    assert FakeService().outer() == 2
+    assert current_span() is None
+
+
+def test_traced_constructor_is_untouched():
+    """Dunder methods are not wrapped so dependency injection sees the real signature."""
+    assert not hasattr(FakeService.__init__, "__wrapped__")
+    assert hasattr(FakeService.outer, "__wrapped__")
+
+
+def test_nested_spans_and_sql_counts():
+    """Spans nest by call structure and count SQL statements inclusively."""
+    with start_trace("GET /test") as trace:
+        FakeService().outer()
+
+    assert trace.duration_ms is not None
+    assert trace.sql_count == 3
+    assert len(trace.children) == 1
+
+    outer = trace.children[0]
+    assert outer.name == "FakeService.outer"
+    assert outer.sql_count == 3
+    assert [child.name for child in outer.children] == ["FakeService._inner"]
+    assert outer.children[0].sql_count == 2
+    assert current_span() is None
+
+
+def test_span_records_error():
+    """Exceptions are recorded on the span and re-raised."""
+    with pytest.raises(ValueError):
+        with start_trace("GET /test") as trace:
+            FakeService().fail()
+    assert trace.error == "ValueError"
+    assert trace.children[0].error == "ValueError"
+
+
+def test_json_lines_file_exporter(tmp_path: Path):
+    """Each exported trace is appended as one line of JSON."""
+    path = tmp_path / "traces.jsonl"
+    exporter = JSONLinesFileExporter(str(path))
+    for _ in range(2):
+        with start_trace("GET /test") as trace:
+            FakeService().outer()
+        exporter.export(trace)
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    document = json.loads(lines[0])
+    assert document["name"] == "GET /test"
+    assert document["sql_count"] == 3
+    assert document["children"][0]["children"][0]["name"] == "FakeService._inner"
+    assert "trace_id" in document["attributes"]
+
+
+def _app(exporter: SpanExporter, threshold_ms: float = 0.0) -> TestClient:
+    def endpoint(request):
+        FakeService().outer()
+        return PlainTextResponse("OK")
+
+    app = Starlette(routes=[Route("/api/test", endpoint), Route("/other", endpoint)])
+    app.add_middleware(TracingMiddleware, exporter=exporter, threshold_ms=threshold_ms)
+    return TestClient(app)
+
+
+def test_middleware_traces_api_requests():
+    """Synchronous endpoints run in a thread pool and still attach spans to the request."""
+    exporter = ListExporter()
+    client = _app(exporter)
+    assert client.get("/api/test").status_code == 200
+
+    assert len(exporter.traces) == 1
+    trace = exporter.traces[0]
+    assert trace.name == "GET /api/test"
+    assert trace.attributes["status_code"] == 200
+    assert trace.sql_count == 3
+    assert trace.children[0].name == "FakeService.outer"
+
+
+def test_middleware_ignores_non_api_requests():
+    exporter = ListExporter()
+    client = _app(exporter)
+    client.get("/other")
+    assert exporter.traces == []
+
+
+def test_middleware_threshold():
+    """Traces faster than the threshold are not exported."""
+    exporter = ListExporter()
+    client = _app(exporter, threshold_ms=60_000)
+    client.get("/api/test")
+    assert exporter.traces == []
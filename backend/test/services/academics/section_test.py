@@ -29,15 +29,17 @@ __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
-def test_all(section_svc: SectionService):
-    sections = section_svc.all()
+def test_all(section_svc: SectionService, statement_budget):
+    with statement_budget(15):
+        sections = section_svc.all()
 
     assert len(sections) == len(section_data.sections)
     assert isinstance(sections[0], SectionDetails)
 
 
-def test_get_by_term(section_svc: SectionService):
-    sections = section_svc.get_by_term(term_data.f_23.id)
+def test_get_by_term(section_svc: SectionService, statement_budget):
+    with statement_budget(14):
+        sections = section_svc.get_by_term(term_data.f_23.id)
 
     assert len(sections) == len(section_data.sections)
     assert isinstance(sections[0], SectionDetails)
@@ -62,11 +64,12 @@ def test_get_by_subject_not_found(section_svc: SectionService):
     assert len(sections) == 0
 
 
-def test_get_by_id(section_svc: SectionService):
+def test_get_by_id(section_svc: SectionService, statement_budget):
     if section_data.comp_101_001.id is None:
         raise ResourceNotFoundException("Invalid ID for section.")
 
-    section = section_svc.get_by_id(section_data.comp_101_001.id)
+    with statement_budget(7):
+        section = section_svc.get_by_id(section_data.comp_101_001.id)
 
     assert isinstance(section, SectionDetails)
     assert section.id == section_data.comp_101_001.id
@@ -9,6 +9,11 @@ from sqlalchemy.exc import OperationalError, ProgrammingError
 from ...database import _engine_str
 from ...env import getenv
 from ... import entities
+from ...services.calendar import calendar_feed_cache
+from ...services.organization import organization_directory_cache
+from ...services.permission import permission_set_cache
+from ...services.user_cache import user_cache
+from .statement_budget import max_statements
 
 POSTGRES_DATABASE = f'{getenv("POSTGRES_DATABASE")}_test'
 POSTGRES_USER = getenv("POSTGRES_USER")
@@ -51,8 +56,25 @@ def test_engine() -> Engine:
 def session(test_engine: Engine):
     entities.EntityBase.metadata.drop_all(test_engine)
     entities.EntityBase.metadata.create_all(test_engine)
+    # Process-wide caches of database state are stale once the database is recreated
+    permission_set_cache.clear()
+    user_cache.clear()
+    calendar_feed_cache.clear()
+    organization_directory_cache.clear()
     session = Session(test_engine)
     try:
         yield session
     finally:
         session.close()
+
+
+@pytest.fixture()
+def statement_budget(session: Session):
+    """Context manager factory asserting a block executes at most a number of SQL statements.
+
+    Usage: `with statement_budget(3): service.method()`"""
+
+    def budget(max_count: int):
+        return max_statements(session, max_count)
+
+    return budget
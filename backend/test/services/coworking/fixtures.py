@@ -64,3 +64,14 @@ def status_svc():
     return StatusService(
         policies_mock, operating_hours_mock, seat_mock, reservation_mock
     )
+
+
+@pytest.fixture()
+def status_svc_integration(
+    policy_svc: PolicyService,
+    operating_hours_svc: OperatingHoursService,
+    seat_svc: SeatService,
+    reservation_svc: ReservationService,
+):
+    """StatusService fixture backed by the database rather than mocks."""
+    return StatusService(policy_svc, operating_hours_svc, seat_svc, reservation_svc)
@@ -43,12 +43,13 @@ __license__ = "MIT"
 
 
 def test_draft_reservation_open_seats(
-    reservation_svc: ReservationService, time: dict[str, datetime]
+    reservation_svc: ReservationService, time: dict[str, datetime], statement_budget
 ):
     """Request with an open seat."""
-    reservation = reservation_svc.draft_reservation(
-        user_data.ambassador, reservation_data.test_request()
-    )
+    with statement_budget(13):
+        reservation = reservation_svc.draft_reservation(
+            user_data.ambassador, reservation_data.test_request()
+        )
     assert reservation is not None
     assert reservation.id is not None
     assert reservation.state == ReservationState.DRAFT
@@ -1,6 +1,14 @@
 """Test coworking StatusService"""
 
-from .fixtures import status_svc
+from .fixtures import (
+    status_svc,
+    status_svc_integration,
+    reservation_svc,
+    permission_svc,
+    seat_svc,
+    policy_svc,
+    operating_hours_svc,
+)
 from ....services.coworking.status import StatusService
 from ....models.coworking.availability import SeatAvailability
 from datetime import timedelta
@@ -59,3 +67,14 @@ def test_status_dispatch(status_svc: StatusService):
     assert status.my_reservations == [reservation_data.reservation_1]
     assert status.seat_availability == seat_availability
     assert status.operating_hours == [operating_hours_data.today]
+
+
+def test_status_statement_budget(
+    status_svc_integration: StatusService, statement_budget
+):
+    """The status endpoint is polled by every open coworking page, so its query count is budgeted."""
+    with statement_budget(8):
+        status = status_svc_integration.get_coworking_status(user_data.user)
+
+    assert reservation_data.reservation_1.id in [r.id for r in status.my_reservations]
+    assert len(status.operating_hours) > 0
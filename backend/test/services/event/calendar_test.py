@@ -0,0 +1,181 @@
+"""Tests for the CalendarService class."""
+
+import pytest
+from datetime import timedelta, timezone
+from zoneinfo import ZoneInfo
+from sqlalchemy.orm import Session
+
+from ....entities import EventEntity
+from ....services import CalendarService, EventService
+from ....services.exceptions import ResourceNotFoundException
+
+# Injected Service Fixtures
+from ..fixtures import calendar_svc, event_svc_integration, user_svc_integration
+
+# Explicitly import Data Fixture to load entities in database
+from ..core_data import setup_insert_data_fixture
+
+from ..organization.organization_test_data import cads, cssg
+from ..user_data import ambassador, root, user
+from .event_test_data import event_one, event_three, event_two
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def _summaries(body: str) -> list[str]:
+    return [
+        line.removeprefix("SUMMARY:")
+        for line in body.split("\r\n")
+        if line.startswith("SUMMARY:")
+    ]
+
+
+def test_public_feed(calendar_svc: CalendarService):
+    """Tests that the public feed is a calendar of the public events, in order of time."""
+    feed = calendar_svc.get_public_feed()
+    assert feed.body.startswith("BEGIN:VCALENDAR\r\n")
+    assert feed.body.endswith("END:VCALENDAR\r\n")
+    assert _summaries(feed.body) == [event_one.name, event_two.name, event_three.name]
+    assert feed.etag.startswith('"') and feed.etag.endswith('"')
+
+
+def test_feed_times_are_utc(calendar_svc: CalendarService):
+    """Tests that event times, stored as local times in Chapel Hill, are given in UTC."""
+    start = event_one.time.replace(tzinfo=ZoneInfo("America/New_York"))
+    start = start.astimezone(timezone.utc)
+    body = calendar_svc.get_public_feed().body
+    assert f"DTSTART:{start:%Y%m%dT%H%M%SZ}" in body
+    assert f"DTEND:{start + timedelta(hours=1):%Y%m%dT%H%M%SZ}" in body
+
+
+def test_public_feed_excludes_private_events(
+    calendar_svc: CalendarService, session: Session
+):
+    session.get(EventEntity, event_two.id).public = False
+    session.commit()
+    assert event_two.name not in _summaries(calendar_svc.get_public_feed().body)
+
+
+def test_feed_lines_are_escaped_and_folded(calendar_svc: CalendarService):
+    body = calendar_svc.get_public_feed().body
+    assert all(len(line.encode()) <= 75 for line in body.split("\r\n"))
+    # Commas in descriptions are escaped, and folded lines continue after a space
+    unfolded = body.replace("\r\n ", "")
+    assert (
+        "Carolina Data Challenge (CDC)! CDC is UNC's weekend-long datathon" in unfolded
+    )
+    assert (
+        "brings together hundreds of participants from across campus\\, numerous"
+        in (unfolded)
+    )
+
+
+def test_feed_is_cached_until_events_change(
+    calendar_svc: CalendarService, event_svc_integration: EventService
+):
+    feed = calendar_svc.get_public_feed()
+    assert calendar_svc.get_public_feed() is feed
+
+    event_svc_integration.update(
+        root, event_two.model_copy(update={"name": "Renamed Workshop"})
+    )
+
+    changed = calendar_svc.get_public_feed()
+    assert changed.etag != feed.etag
+    assert "Renamed Workshop" in _summaries(changed.body)
+
+
+def test_feed_changes_when_registrations_change(
+    calendar_svc: CalendarService, event_svc_integration: EventService
+):
+    feed = calendar_svc.get_public_feed()
+    event_svc_integration.register(
+        root, root, event_svc_integration.get_by_id(event_two.id)
+    )
+    assert calendar_svc.get_public_feed().etag != feed.etag
+
+
+def test_cached_feed_is_served_with_one_query(
+    calendar_svc: CalendarService, statement_budget
+):
+    calendar_svc.get_public_feed()
+    with statement_budget(1):
+        calendar_svc.get_public_feed()
+
+
+def test_organization_feed(calendar_svc: CalendarService):
+    cssg_feed = calendar_svc.get_organization_feed(cssg.slug)
+    assert _summaries(cssg_feed.body) == [
+        event_one.name,
+        event_two.name,
+        event_three.name,
+    ]
+    assert f"X-WR-CALNAME:{cssg.name}" in cssg_feed.body
+    assert _summaries(calendar_svc.get_organization_feed(cads.slug).body) == []
+
+
+def test_organization_feed_not_found(calendar_svc: CalendarService):
+    with pytest.raises(ResourceNotFoundException):
+        calendar_svc.get_organization_feed("not-an-organization")
+
+
+def test_user_feed(calendar_svc: CalendarService):
+    token = calendar_svc.get_feed_token(ambassador)
+    feed = calendar_svc.get_user_feed(token)
+    assert _summaries(feed.body) == [event_one.name, event_three.name]
+    assert "STATUS:TENTATIVE" not in feed.body
+
+
+def test_user_feed_marks_waitlisted_events_tentative(
+    calendar_svc: CalendarService, event_svc_integration: EventService
+):
+    token = calendar_svc.get_feed_token(user)
+    feed = calendar_svc.get_user_feed(token)
+    assert _summaries(feed.body) == [event_one.name]
+
+    event_svc_integration.register(
+        user, user, event_svc_integration.get_by_id(event_three.id)
+    )
+
+    changed = calendar_svc.get_user_feed(token)
+    assert changed.etag != feed.etag
+    assert _summaries(changed.body) == [event_one.name, event_three.name]
+    assert changed.body.count("STATUS:TENTATIVE") == 1
+
+
+def test_user_feed_with_invalid_token(calendar_svc: CalendarService):
+    token = calendar_svc.get_feed_token(user)
+    with pytest.raises(ResourceNotFoundException):
+        calendar_svc.get_user_feed(token[:-2])
+
+
+def test_reset_feed_token_revokes_earlier_tokens(calendar_svc: CalendarService):
+    token = calendar_svc.get_feed_token(ambassador)
+    calendar_svc.get_user_feed(token)
+
+    new_token = calendar_svc.reset_feed_token(ambassador)
+    assert new_token != token
+    assert calendar_svc.get_feed_token(ambassador) == new_token
+    with pytest.raises(ResourceNotFoundException):
+        calendar_svc.get_user_feed(token)
+    assert _summaries(calendar_svc.get_user_feed(new_token).body) == [
+        event_one.name,
+        event_three.name,
+    ]
+
+
+def test_reset_feed_token_only_revokes_own_tokens(calendar_svc: CalendarService):
+    token = calendar_svc.get_feed_token(user)
+    calendar_svc.reset_feed_token(ambassador)
+    assert _summaries(calendar_svc.get_user_feed(token).body) == [event_one.name]
+
+
+def test_cached_user_feed_is_served_with_two_queries(
+    calendar_svc: CalendarService, statement_budget
+):
+    token = calendar_svc.get_feed_token(ambassador)
+    calendar_svc.get_user_feed(token)
+    with statement_budget(2):
+        calendar_svc.get_user_feed(token)
@@ -1,12 +1,17 @@
 """Tests for the EventService class."""
 
 # PyTest
+import csv
+import io
 import pytest
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
 from unittest.mock import create_autospec
-from backend.models.pagination import PaginationParams
+from backend.models.pagination import PaginationParams, encode_cursor
 
 from backend.services.exceptions import (
     EventRegistrationException,
+    InvalidPaginationException,
     UserPermissionException,
     ResourceNotFoundException,
 )
@@ -17,7 +22,8 @@ from ....models.coworking.time_range import TimeRange
 from ..coworking.time import *
 
 # Tested Dependencies
-from ....models import Event, EventDetails
+from ....models import Event, EventDetails, RegistrationType, RegistrationWindow
+from ....entities import EventEntity, EventRegistrationEntity, UserEntity
 from ....services import EventService
 
 # Injected Service Fixtures
@@ -49,9 +55,10 @@ from ..user_data import root, ambassador, user
 # Test Functions
 
 
-def test_get_all(event_svc_integration: EventService):
+def test_get_all(event_svc_integration: EventService, statement_budget):
     """Test that all events can be retrieved."""
-    fetched_events = event_svc_integration.all(ambassador)
+    with statement_budget(3):
+        fetched_events = event_svc_integration.all(ambassador)
 
     assert fetched_events is not None
     assert len(fetched_events) == len(events)
@@ -62,6 +69,196 @@ def test_get_all(event_svc_integration: EventService):
     assert fetched_events[2].is_attendee == True
 
 
+def test_get_all_summarizes_registrations(event_svc_integration: EventService):
+    """Test that listings count attendees and load only organizer registrations."""
+    loaded: list[RegistrationType] = []
+
+    def on_load(registration: EventRegistrationEntity, context):
+        loaded.append(registration.registration_type)
+
+    event.listen(EventRegistrationEntity, "load", on_load)
+    try:
+        fetched_events = event_svc_integration.all(user)
+    finally:
+        event.remove(EventRegistrationEntity, "load", on_load)
+
+    assert [fetched.registration_count for fetched in fetched_events] == [1, 0, 1]
+    assert [fetched.is_organizer for fetched in fetched_events] == [True, False, False]
+    assert [fetched.is_attendee for fetched in fetched_events] == [False, False, False]
+    assert [organizer.id for organizer in fetched_events[0].organizers] == [user.id]
+    assert fetched_events[1].organizers == []
+    assert loaded == [RegistrationType.ORGANIZER]
+
+
+def test_get_paginated_events(event_svc_integration: EventService, statement_budget):
+    """Test that upcoming events are listed by time, with later pages continuing by cursor."""
+    pagination_params = PaginationParams(page_size=2, order_by="time")
+    with statement_budget(4):
+        first = event_svc_integration.get_paginated_events(
+            pagination_params, subject=ambassador
+        )
+
+    assert [event.id for event in first.items] == [event_one.id, event_two.id]
+    assert first.length == len(events)
+    assert first.items[0].is_attendee == True
+    assert first.items[0].organization.id == event_one.organization_id
+    assert first.next_cursor is not None
+
+    pagination_params = PaginationParams(
+        page_size=2, order_by="time", cursor=first.next_cursor, count=False
+    )
+    with statement_budget(3):
+        second = event_svc_integration.get_paginated_events(
+            pagination_params, subject=ambassador
+        )
+
+    assert [event.id for event in second.items] == [event_three.id]
+    assert second.items[0].is_attendee == True
+    assert second.length is None
+    assert second.next_cursor is None
+
+
+@pytest.mark.parametrize("value", ["not a time", 5, None])
+def test_get_paginated_events_tampered_cursor(
+    event_svc_integration: EventService, value
+):
+    """Test that a cursor must hold a time to continue an order by time."""
+    pagination_params = PaginationParams(
+        order_by="time", cursor=encode_cursor(["time", value, event_one.id])
+    )
+    with pytest.raises(InvalidPaginationException):
+        event_svc_integration.get_paginated_events(pagination_params)
+
+
+def test_get_paginated_events_in_time_range(event_svc_integration: EventService):
+    """Test that paginated events are limited to the requested time range."""
+    time_range = TimeRange(
+        start=event_one.time, end=event_one.time + timedelta(minutes=1)
+    )
+    page = event_svc_integration.get_paginated_events(
+        PaginationParams(order_by="time"), time_range
+    )
+
+    assert [event.id for event in page.items] == [event_one.id]
+    assert page.length == 1
+
+
+def test_get_paginated_events_excludes_past_events_by_default(
+    event_svc_integration: EventService, session: Session
+):
+    """Test that events which already took place are not listed unless requested."""
+    past = TimeRange(
+        start=datetime.now() - timedelta(days=7), end=datetime.now() - timedelta(days=1)
+    )
+    session.execute(update(EventEntity).values(time=past.start))
+    session.commit()
+
+    page = event_svc_integration.get_paginated_events(PaginationParams(order_by="time"))
+    assert page.items == []
+    assert page.length == 0
+
+    page = event_svc_integration.get_paginated_events(
+        PaginationParams(order_by="time"), past
+    )
+    assert page.length == len(events)
+
+
+def test_get_paginated_events_rejects_malformed_cursor(
+    event_svc_integration: EventService,
+):
+    """Test that a cursor which was not produced by a previous page is rejected."""
+    with pytest.raises(InvalidPaginationException):
+        event_svc_integration.get_paginated_events(
+            PaginationParams(order_by="time", cursor="not-a-cursor")
+        )
+
+
+def test_search(event_svc_integration: EventService, statement_budget):
+    """Test that events are found by the words of their name, location, and description."""
+    with statement_budget(4):
+        page = event_svc_integration.search(
+            PaginationParams(filter="workshop"), subject=ambassador
+        )
+    assert [event.id for event in page.items] == [event_two.id]
+    assert page.length == 1
+
+    page = event_svc_integration.search(PaginationParams(filter="Sitterson lobby"))
+    assert [event.id for event in page.items] == [event_one.id]
+
+
+def test_search_matches_prefixes(event_svc_integration: EventService):
+    """Test that each word of the query matches the beginning of a word, as when typing."""
+    page = event_svc_integration.search(PaginationParams(filter="Work"))
+    assert [event.id for event in page.items] == [event_two.id]
+
+
+def test_search_ranks_names_above_descriptions(
+    event_svc_integration: EventService, session: Session
+):
+    """Test that events whose name matches come before those whose description matches."""
+    session.execute(
+        update(EventEntity)
+        .where(EventEntity.id == event_one.id)
+        .values(description="Not as exclusive as it sounds.")
+    )
+    session.commit()
+
+    page = event_svc_integration.search(
+        PaginationParams(filter="exclusive", order_by="rank")
+    )
+    assert [event.id for event in page.items] == [event_three.id, event_one.id]
+    assert page.next_cursor is None
+
+
+def test_search_by_time_continues_by_cursor(event_svc_integration: EventService):
+    """Test that search results ordered by time are paged by cursor."""
+    params = PaginationParams(filter="sample", order_by="time", page_size=1)
+    first = event_svc_integration.search(params)
+    assert [event.id for event in first.items] == [event_two.id]
+    assert first.length == 2
+
+    params = params.model_copy(update={"cursor": first.next_cursor, "count": False})
+    second = event_svc_integration.search(params)
+    assert [event.id for event in second.items] == [event_three.id]
+
+
+def test_search_ranked_rejects_cursor(event_svc_integration: EventService):
+    """Test that ranked results, whose order depends on the query, cannot be continued by cursor."""
+    first = event_svc_integration.search(
+        PaginationParams(filter="sample", order_by="time", page_size=1)
+    )
+    with pytest.raises(InvalidPaginationException):
+        event_svc_integration.search(
+            PaginationParams(filter="sample", cursor=first.next_cursor)
+        )
+
+
+def test_search_in_time_range(event_svc_integration: EventService):
+    """Test that search results are limited to the requested time range."""
+    time_range = TimeRange(
+        start=event_one.time, end=event_one.time + timedelta(minutes=1)
+    )
+    page = event_svc_integration.search(PaginationParams(filter="CS"), time_range)
+    assert [event.id for event in page.items] == [event_one.id]
+
+
+def test_search_without_words_lists_by_time(event_svc_integration: EventService):
+    """Test that an empty query, or one without any words, matches every event."""
+    for query in ["", " & | !( "]:
+        page = event_svc_integration.search(PaginationParams(filter=query))
+        assert [event.id for event in page.items] == [
+            event_one.id,
+            event_two.id,
+            event_three.id,
+        ]
+
+
+def test_search_ignores_query_operators(event_svc_integration: EventService):
+    """Test that tsquery syntax in a query is not interpreted."""
+    page = event_svc_integration.search(PaginationParams(filter="workshop | !mixer:*"))
+    assert page.items == []
+
+
 def test_get_all_unauthenticated(event_svc_integration: EventService):
     """Test that all events can be retrieved."""
     fetched_events = event_svc_integration.all()
@@ -71,9 +268,10 @@ def test_get_all_unauthenticated(event_svc_integration: EventService):
     assert isinstance(fetched_events[0], EventDetails)
 
 
-def test_get_by_id(event_svc_integration: EventService):
+def test_get_by_id(event_svc_integration: EventService, statement_budget):
     """Test that events can be retrieved based on their ID."""
-    fetched_event = event_svc_integration.get_by_id(1, ambassador)
+    with statement_budget(3):
+        fetched_event = event_svc_integration.get_by_id(1, ambassador)
     assert fetched_event is not None
     assert isinstance(fetched_event, Event)
     assert fetched_event.id == event_one.id
@@ -263,11 +461,15 @@ def test_delete_on_invalid_event(event_svc_integration: EventService):
         event_svc_integration.delete(user, invalid_event.id)
 
 
-def test_register_for_event_as_user(event_svc_integration: EventService):
+def test_register_for_event_as_user(
+    event_svc_integration: EventService, statement_budget
+):
     """Test that a user is able to register for an event."""
     event_details = event_svc_integration.get_by_id(event_one.id, root)  # type: ignore
-    created_registration = event_svc_integration.register(root, root, event_details)  # type: ignore
+    with statement_budget(1):
+        created_registration = event_svc_integration.register(root, root, event_details)  # type: ignore
     assert created_registration is not None
+    assert created_registration.registration_type == RegistrationType.ATTENDEE
 
 
 def test_register_for_event_as_user_twice(event_svc_integration: EventService):
@@ -280,6 +482,18 @@ def test_register_for_event_as_user_twice(event_svc_integration: EventService):
     assert created_registration_1 == created_registration_2
 
 
+def test_register_counts_attendees(event_svc_integration: EventService):
+    """Test that registering and unregistering keep an event's attendee count current."""
+    event_details = event_svc_integration.get_by_id(event_one.id)  # type: ignore
+    assert event_details.registration_count == 1
+
+    event_svc_integration.register(root, root, event_details)
+    assert event_svc_integration.get_by_id(event_one.id).registration_count == 2
+
+    event_svc_integration.unregister(root, root, event_details)
+    assert event_svc_integration.get_by_id(event_one.id).registration_count == 1
+
+
 def test_register_for_event_enforces_permission(event_svc_integration: EventService):
     event_svc_integration._permission = create_autospec(
         event_svc_integration._permission
@@ -437,6 +651,22 @@ def test_get_registrations_of_user_outside_time_range(
     assert len(registrations) == 0
 
 
+def test_get_registrations_of_user_excludes_waitlist(
+    event_svc_integration: EventService, time: dict[str, datetime]
+):
+    """Test that a place on a waitlist is not among a user's registrations."""
+    event_details = event_svc_integration.get_by_id(event_three.id)  # type: ignore
+    event_svc_integration.register(user, user, event_details)
+
+    time_range = TimeRange(
+        start=event_three.time - ONE_DAY, end=event_three.time + ONE_DAY
+    )
+    registrations = event_svc_integration.get_registrations_of_user(
+        user, user, time_range
+    )
+    assert len(registrations) == 0
+
+
 def test_get_registrations_of_user_without_reservations(
     event_svc_integration: EventService, time: dict[str, datetime]
 ):
@@ -448,6 +678,71 @@ def test_get_registrations_of_user_without_reservations(
     assert len(registrations) == 0
 
 
+def test_get_registered_events_of_user(
+    event_svc_integration: EventService, statement_budget
+):
+    """Test that a user's registrations are found for several windows at once."""
+    windows = [
+        RegistrationWindow(
+            start=event_one.time - ONE_DAY, end=event_one.time + ONE_DAY
+        ),
+        RegistrationWindow(start=event_two.time, end=event_two.time + ONE_DAY),
+        RegistrationWindow(
+            start=event_one.time - ONE_DAY,
+            end=event_three.time + ONE_DAY,
+            organization_id=event_one.organization_id,
+        ),
+        RegistrationWindow(
+            start=event_one.time - ONE_DAY,
+            end=event_three.time + ONE_DAY,
+            organization_id=0,
+        ),
+    ]
+    with statement_budget(4):
+        found = event_svc_integration.get_registered_events_of_user(
+            ambassador, ambassador, windows
+        )
+
+    assert [[event.id for event in events] for events in found] == [
+        [event_one.id],
+        [event_three.id],
+        [event_one.id, event_three.id],
+        [],
+    ]
+    assert found[0][0].is_attendee
+
+
+def test_get_registered_events_of_user_uses_their_statuses(
+    event_svc_integration: EventService,
+):
+    """Test that events are described from the perspective of the registered user."""
+    window = RegistrationWindow(
+        start=event_one.time - ONE_DAY, end=event_one.time + ONE_DAY
+    )
+    found = event_svc_integration.get_registered_events_of_user(root, user, [window])
+    assert [event.id for event in found[0]] == [event_one.id]
+    assert found[0][0].is_organizer
+
+
+def test_get_registered_events_of_user_without_windows(
+    event_svc_integration: EventService, statement_budget
+):
+    with statement_budget(0):
+        found = event_svc_integration.get_registered_events_of_user(user, user, [])
+    assert found == []
+
+
+def test_get_registered_events_of_user_enforces_permission(
+    event_svc_integration: EventService,
+):
+    """Test that only administrators may find other users' registrations."""
+    window = RegistrationWindow(
+        start=event_one.time - ONE_DAY, end=event_one.time + ONE_DAY
+    )
+    with pytest.raises(UserPermissionException):
+        event_svc_integration.get_registered_events_of_user(user, ambassador, [window])
+
+
 def test_get_registrations_of_user_admin_authorization(
     event_svc_integration: EventService,
 ):
@@ -467,30 +762,193 @@ def test_get_registrations_of_user_admin_authorization(
     )
 
 
-def test_register_to_full_event(
+def test_register_to_full_event_joins_waitlist(
     event_svc_integration: EventService,
 ):
-    """Tests that a user cannot register for an event that is full."""
+    """Tests that a user who registers for an event that is full is waitlisted instead."""
     event_details = event_svc_integration.get_by_id(event_three.id)  # type: ignore
 
+    event_svc_integration.register(user, user, event_details)
+
+    event_details = event_svc_integration.get_by_id(event_three.id, user)
+    assert event_details.is_waitlisted
+    assert not event_details.is_attendee
+    assert event_details.registration_count == 1
+    assert event_svc_integration.get_waitlist_position(user, user, event_details) == 1
+
+
+def test_register_to_full_event_with_stale_details(
+    event_svc_integration: EventService,
+):
+    """Tests that the limit is enforced against the database, not the details passed in."""
+    event_details = event_svc_integration.get_by_id(event_three.id)  # type: ignore
+    stale_details = event_details.model_copy(update={"registration_count": 0})
+
+    event_svc_integration.register(user, user, stale_details)
+
+    event_details = event_svc_integration.get_by_id(event_three.id, user)
+    assert event_details.is_waitlisted
+    assert event_details.registration_count == 1
+
+
+def test_register_to_event_without_registration(event_svc_integration: EventService):
+    """Tests that a user cannot register for an event which does not take registrations."""
+    event_svc_integration.update(
+        root, event_two.model_copy(update={"registration_limit": 0})
+    )
+    event_details = event_svc_integration.get_by_id(event_two.id)  # type: ignore
+
     with pytest.raises(EventRegistrationException):
         event_svc_integration.register(user, user, event_details)
 
 
-def test_get_registered_users_of_event(event_svc_integration: EventService):
+def test_waitlist_positions(event_svc_integration: EventService):
+    """Tests that waitlisted users are in line in the order they registered."""
+    event_details = event_svc_integration.get_by_id(event_three.id)  # type: ignore
+    event_svc_integration.register(root, root, event_details)
+    event_svc_integration.register(user, user, event_details)
+
+    assert event_svc_integration.get_waitlist_position(root, root, event_details) == 1
+    assert event_svc_integration.get_waitlist_position(user, user, event_details) == 2
+    assert (
+        event_svc_integration.get_waitlist_position(
+            ambassador, ambassador, event_details
+        )
+        is None
+    )
+
+
+def test_waitlist_position_of_other_user_enforces_permission(
+    event_svc_integration: EventService,
+):
+    """Tests that only administrators may look up other users' waitlist positions."""
+    event_details = event_svc_integration.get_by_id(event_three.id)  # type: ignore
+    event_svc_integration.register(user, user, event_details)
+
+    with pytest.raises(UserPermissionException):
+        event_svc_integration.get_waitlist_position(ambassador, user, event_details)
+    assert event_svc_integration.get_waitlist_position(root, user, event_details) == 1
+
+
+def test_unregister_promotes_from_waitlist(event_svc_integration: EventService):
+    """Tests that the seat an attendee frees goes to the first user on the waitlist."""
+    event_details = event_svc_integration.get_by_id(event_three.id)  # type: ignore
+    event_svc_integration.register(root, root, event_details)
+    event_svc_integration.register(user, user, event_details)
+
+    event_svc_integration.unregister(ambassador, ambassador, event_details)
+
+    assert event_svc_integration.get_by_id(event_three.id, root).is_attendee
+    assert event_svc_integration.get_by_id(event_three.id, user).is_waitlisted
+    assert event_svc_integration.get_by_id(event_three.id).registration_count == 1
+    assert event_svc_integration.get_waitlist_position(user, user, event_details) == 1
+    assert (
+        event_svc_integration.get_waitlist_position(root, root, event_details) is None
+    )
+
+
+def test_leaving_waitlist_does_not_promote(event_svc_integration: EventService):
+    """Tests that a waitlisted user leaving frees no seat and moves others up in line."""
+    event_details = event_svc_integration.get_by_id(event_three.id)  # type: ignore
+    event_svc_integration.register(root, root, event_details)
+    event_svc_integration.register(user, user, event_details)
+
+    event_svc_integration.unregister(root, root, event_details)
+
+    assert event_svc_integration.get_by_id(event_three.id, user).is_waitlisted
+    assert event_svc_integration.get_by_id(event_three.id).registration_count == 1
+    assert event_svc_integration.get_waitlist_position(user, user, event_details) == 1
+
+
+def test_raising_limit_promotes_from_waitlist(event_svc_integration: EventService):
+    """Tests that seats opened by raising the registration limit are filled in order."""
+    event_details = event_svc_integration.get_by_id(event_three.id)  # type: ignore
+    event_svc_integration.register(root, root, event_details)
+    event_svc_integration.register(user, user, event_details)
+
+    event_svc_integration.update(
+        root, event_three.model_copy(update={"registration_limit": 2})
+    )
+
+    assert event_svc_integration.get_by_id(event_three.id, root).is_attendee
+    assert event_svc_integration.get_by_id(event_three.id, user).is_waitlisted
+    assert event_svc_integration.get_by_id(event_three.id).registration_count == 2
+
+
+def test_get_registrations_of_event_excludes_waitlist(
+    event_svc_integration: EventService,
+):
+    """Tests that waitlisted users are not listed among an event's registrations."""
+    event_details = event_svc_integration.get_by_id(event_three.id, root)  # type: ignore
+    event_svc_integration.register(user, user, event_details)
+
+    registrations = event_svc_integration.get_registrations_of_event(
+        root, event_details
+    )
+    assert [registration.id for registration in registrations] == [ambassador.id]
+
+
+def test_register_to_full_event_when_registered(event_svc_integration: EventService):
+    """Tests that registering again for a full event returns the existing registration."""
+    event_details = event_svc_integration.get_by_id(event_three.id)  # type: ignore
+
+    registration = event_svc_integration.register(ambassador, ambassador, event_details)
+    assert registration.id == ambassador.id
+    assert registration.registration_type == RegistrationType.ATTENDEE
+
+
+def test_register_to_full_event_is_waitlisted(event_svc_integration: EventService):
+    """Tests that registering for a full event reports that the user was waitlisted."""
+    event_details = event_svc_integration.get_by_id(event_three.id)  # type: ignore
+
+    registration = event_svc_integration.register(user, user, event_details)
+    assert registration.id == user.id
+    assert registration.registration_type == RegistrationType.WAITLIST
+
+    registration = event_svc_integration.register(user, user, event_details)
+    assert registration.registration_type == RegistrationType.WAITLIST
+
+
+def test_get_registered_users_of_event(
+    event_svc_integration: EventService, statement_budget
+):
     """Tests querying for registered users of events as a paginated list"""
     pagination_params = PaginationParams(
         page=0, page_size=10, order_by="first_name", filter=""
     )
-    page = event_svc_integration.get_registered_users_of_event(
-        root, event_one.id, pagination_params
-    )
+    with statement_budget(9):
+        page = event_svc_integration.get_registered_users_of_event(
+            root, event_one.id, pagination_params
+        )
 
     assert len(page.items) == 1
     assert page.length == 1
     assert page.items[0].id == ambassador.id
 
 
+def test_get_registered_users_of_event_by_cursor(
+    event_svc_integration: EventService, statement_budget
+):
+    """Tests that later pages of registered users can skip counting and offsets"""
+    pagination_params = PaginationParams(page=0, page_size=1, order_by="first_name")
+    first = event_svc_integration.get_registered_users_of_event(
+        root, event_one.id, pagination_params
+    )
+    assert first.next_cursor is not None
+
+    pagination_params = PaginationParams(
+        page_size=1, order_by="first_name", cursor=first.next_cursor, count=False
+    )
+    with statement_budget(8):
+        page = event_svc_integration.get_registered_users_of_event(
+            root, event_one.id, pagination_params
+        )
+
+    assert page.items == []
+    assert page.length is None
+    assert page.next_cursor is None
+
+
 def test_organizer_get_registered_users_of_event(event_svc_integration: EventService):
     """Tests that organizers for an event can retrieve registered users"""
     # Setup to test permission enforcement on the PermissionService.
@@ -565,3 +1023,78 @@ def test_get_registered_users_of_event_without_permissions(
         "organization.events.manage_registrations",
         f"organization/{event_one.organization_id}",
     )
+
+
+def test_export_registrations_csv(event_svc_integration: EventService):
+    """Test that an organizer can export the roster of their event, attendees first."""
+    rows = list(
+        csv.reader(
+            io.StringIO(
+                "".join(
+                    event_svc_integration.export_registrations_csv(user, event_one.id)
+                )
+            )
+        )
+    )
+    assert rows == [
+        [
+            "pid",
+            "onyen",
+            "first_name",
+            "last_name",
+            "pronouns",
+            "email",
+            "registration_type",
+        ],
+        [
+            str(ambassador.pid),
+            ambassador.onyen,
+            ambassador.first_name,
+            ambassador.last_name,
+            ambassador.pronouns,
+            ambassador.email,
+            "ATTENDEE",
+        ],
+        [
+            str(user.pid),
+            user.onyen,
+            user.first_name,
+            user.last_name,
+            user.pronouns,
+            user.email,
+            "ORGANIZER",
+        ],
+    ]
+
+
+def test_export_registrations_csv_streams_in_batches(
+    event_svc_integration: EventService, monkeypatch
+):
+    """Test that the roster is read in batches, each written as its own chunk."""
+    monkeypatch.setattr("backend.services.event.ROSTER_EXPORT_BATCH_SIZE", 1)
+    chunks = list(event_svc_integration.export_registrations_csv(root, event_one.id))
+    # The header, then one chunk per registration
+    assert len(chunks) == 3
+    assert chunks[1].startswith(str(ambassador.pid))
+
+
+def test_export_registrations_csv_escapes_formulas(
+    event_svc_integration: EventService, session: Session
+):
+    """Test that names cannot be evaluated as formulas when the export is opened."""
+    session.execute(
+        update(UserEntity)
+        .where(UserEntity.id == ambassador.id)
+        .values(first_name="=HYPERLINK(0)")
+    )
+    session.commit()
+    roster = "".join(event_svc_integration.export_registrations_csv(root, event_one.id))
+    assert "'=HYPERLINK(0)" in roster
+
+
+def test_export_registrations_csv_enforces_permission(
+    event_svc_integration: EventService,
+):
+    """Test that permission is checked before any of the roster is read."""
+    with pytest.raises(UserPermissionException):
+        event_svc_integration.export_registrations_csv(user, event_two.id)
@@ -0,0 +1,94 @@
+"""Load tests for registering many users for an event at once, as at a popular release."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import Engine, create_engine, select
+from sqlalchemy.orm import Session
+
+from ....entities import EventEntity, EventRegistrationEntity, UserEntity
+from ....models import User
+from ....services import EventService, PermissionService
+
+# Explicitly import Data Fixture to load entities in database
+from ..core_data import setup_insert_data_fixture
+
+from .event_test_data import event_two
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+LIMIT = 10
+ATTENDEES = 25
+ATTEMPTS_PER_ATTENDEE = 2
+
+
+def _insert_attendees(session: Session) -> list[User]:
+    entities = [
+        UserEntity(
+            pid=200_000_000 + n,
+            onyen=f"rusher{n}",
+            email=f"rusher{n}@unc.edu",
+            first_name="Rush",
+            last_name=f"Attendee {n}",
+        )
+        for n in range(ATTENDEES)
+    ]
+    session.add_all(entities)
+    session.commit()
+    return [entity.to_model() for entity in entities]
+
+
+def test_concurrent_registrations_do_not_exceed_limit(
+    session: Session, test_engine: Engine
+):
+    """Every attendee registers, twice, at the same moment, each in their own session.
+
+    The first LIMIT to get through take the seats and the rest are waitlisted."""
+    session.get(EventEntity, event_two.id).registration_limit = LIMIT
+    session.commit()
+    attendees = _insert_attendees(session)
+    attempts = attendees * ATTEMPTS_PER_ATTENDEE
+    start = threading.Barrier(len(attempts))
+    # Each attempt holds its own connection while waiting for the others to be ready
+    engine = create_engine(test_engine.url, pool_size=len(attempts), max_overflow=0)
+
+    def register(attendee: User) -> bool:
+        with Session(engine) as attendee_session:
+            event_svc = EventService(
+                attendee_session, PermissionService(attendee_session)
+            )
+            event = event_svc.get_by_id(event_two.id, attendee)
+            start.wait()
+            event_svc.register(attendee, attendee, event)
+            return event_svc.get_by_id(event_two.id, attendee).is_waitlisted
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(attempts)) as pool:
+            outcomes = list(pool.map(register, attempts))
+    finally:
+        engine.dispose()
+
+    registrations = dict(
+        session.execute(
+            select(
+                EventRegistrationEntity.user_id,
+                EventRegistrationEntity.waitlist_position,
+            ).where(EventRegistrationEntity.event_id == event_two.id)
+        ).all()
+    )
+    assert len(registrations) == ATTENDEES
+    registered = {
+        user_id for user_id, position in registrations.items() if position is None
+    }
+    assert len(registered) == LIMIT
+    # Everyone else is waitlisted exactly once, each at their own position
+    positions = [
+        position for position in registrations.values() if position is not None
+    ]
+    assert len(set(positions)) == ATTENDEES - LIMIT
+    # Both attempts of an attendee agree on whether they got a seat or a place in line
+    assert outcomes == [attendee.id not in registered for attendee in attempts]
+
+    session.expire_all()
+    assert session.get(EventEntity, event_two.id).registration_count == LIMIT
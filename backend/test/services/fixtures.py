@@ -6,9 +6,11 @@ from sqlalchemy.orm import Session
 from ...services import (
     PermissionService,
     UserService,
+    UserImportService,
     RoleService,
     OrganizationService,
     EventService,
+    CalendarService,
     RoomService,
     ProductivityService,
 )
@@ -41,6 +43,12 @@ def user_svc_integration(session: Session):
     return UserService(session, PermissionService(session))
 
 
+@pytest.fixture()
+def user_import_svc_integration(session: Session):
+    """This fixture is used to test the UserImportService class with a real PermissionService."""
+    return UserImportService(session, PermissionService(session))
+
+
 @pytest.fixture()
 def role_svc(session: Session, permission_svc_mock: PermissionService):
     return RoleService(session, permission_svc_mock)
@@ -58,6 +66,12 @@ def event_svc_integration(session: Session, user_svc_integration: UserService):
     return EventService(session, PermissionService(session))
 
 
+@pytest.fixture()
+def calendar_svc(session: Session):
+    """CalendarService fixture."""
+    return CalendarService(session)
+
+
 @pytest.fixture()
 def room_svc(session: Session):
     """RoomService fixture."""
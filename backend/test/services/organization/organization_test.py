@@ -2,7 +2,9 @@
 
 # PyTest
 import pytest
+from datetime import datetime, timedelta
 from unittest.mock import create_autospec
+from sqlalchemy.orm import Session
 
 from backend.services.exceptions import (
     UserPermissionException,
@@ -10,8 +12,13 @@ from backend.services.exceptions import (
 )
 
 # Tested Dependencies
+from ....entities import EventEntity, OrganizationEntity, OrganizationVersionEntity
 from ....models import Organization
 from ....services import OrganizationService
+from ....services.organization import (
+    UPCOMING_EVENTS_LIMIT,
+    organization_directory_cache,
+)
 
 # Injected Service Fixtures
 from ..fixtures import organization_svc_integration
@@ -24,8 +31,10 @@ from .organization_test_data import (
     organizations,
     to_add,
     cads,
+    cssg,
     new_cads,
 )
+from ..event.event_test_data import events
 from ..user_data import root, user
 
 __authors__ = ["Ajay Gandecha"]
@@ -56,6 +65,161 @@ def test_get_by_slug(organization_svc_integration: OrganizationService):
     assert fetched_organization.slug == cads.slug
 
 
+def test_get_by_slug_includes_upcoming_events(
+    organization_svc_integration: OrganizationService,
+):
+    """Test that an organization's details include its upcoming events and their organizers."""
+    fetched_organization = organization_svc_integration.get_by_slug(cssg.slug)
+    assert [event.id for event in fetched_organization.events] == [
+        event.id for event in sorted(events, key=lambda event: (event.time, event.id))
+    ]
+    assert fetched_organization.upcoming_event_count == len(events)
+    assert fetched_organization.event_count == len(events)
+    assert [
+        organizer.id for organizer in fetched_organization.events[0].organizers
+    ] == [user.id]
+
+
+def test_get_by_slug_bounds_events(
+    organization_svc_integration: OrganizationService,
+    session: Session,
+    statement_budget,
+):
+    """Test that an organization's details only include its next few events, however many
+    it has hosted, at a fixed number of statements once the directory is loaded."""
+    organization_svc_integration.get_directory()
+    now = datetime.now()
+    for days in range(-20, 10):
+        session.add(
+            EventEntity(
+                name=f"Weekly Meeting {days}",
+                time=now + timedelta(days=days, hours=1),
+                location="SN156",
+                description="Every week.",
+                public=True,
+                registration_limit=50,
+                organization_id=cssg.id,
+            )
+        )
+    session.commit()
+
+    with statement_budget(3):
+        fetched_organization = organization_svc_integration.get_by_slug(cssg.slug)
+
+    assert len(fetched_organization.events) == UPCOMING_EVENTS_LIMIT
+    times = [event.time for event in fetched_organization.events]
+    assert times == sorted(times)
+    assert all(time >= now for time in times)
+    assert fetched_organization.upcoming_event_count == len(events) + 10
+    assert fetched_organization.event_count == len(events) + 30
+
+
+def test_get_by_slug_without_events(organization_svc_integration: OrganizationService):
+    """Test that the details of an organization without events are empty."""
+    fetched_organization = organization_svc_integration.get_by_slug(cads.slug)
+    assert fetched_organization.events == []
+    assert fetched_organization.upcoming_event_count == 0
+    assert fetched_organization.event_count == 0
+
+
+# Test `OrganizationService.get()`
+
+
+def test_get(organization_svc_integration: OrganizationService):
+    """Test that an organization can be retrieved without its events."""
+    fetched_organization = organization_svc_integration.get(cads.slug)
+    assert type(fetched_organization) is Organization
+    assert fetched_organization.slug == cads.slug
+
+
+def test_get_not_found(organization_svc_integration: OrganizationService):
+    """Test that retrieving an organization with an unknown slug raises an exception."""
+    with pytest.raises(ResourceNotFoundException):
+        organization_svc_integration.get("unknown")
+
+
+# Test `OrganizationService.get_directory()`
+
+
+def test_get_directory(organization_svc_integration: OrganizationService):
+    """Test that the directory indexes all organizations by id and slug."""
+    directory = organization_svc_integration.get_directory()
+    assert [organization.id for organization in directory.organizations] == sorted(
+        organization.id for organization in organizations
+    )
+    assert directory.by_id[cads.id].slug == cads.slug
+    assert directory.by_slug[cssg.slug].id == cssg.id
+    assert directory.etag.startswith('"')
+
+
+def test_organizations_are_copied_from_directory(
+    organization_svc_integration: OrganizationService,
+):
+    """Test that modifying an organization that was looked up leaves the directory intact."""
+    listed = organization_svc_integration.all()
+    listed[0].name = "Renamed"
+    fetched = organization_svc_integration.get(cads.slug)
+    fetched.slug = "renamed"
+
+    directory = organization_svc_integration.get_directory()
+    assert directory.organizations[0].name != "Renamed"
+    assert directory.by_slug[cads.slug].slug == cads.slug
+    assert organization_svc_integration.get(cads.slug).slug == cads.slug
+    assert "Renamed" not in directory.body
+
+
+def test_directory_served_without_queries(
+    organization_svc_integration: OrganizationService, statement_budget
+):
+    """Test that, once loaded, organizations are served without querying the database."""
+    organization_svc_integration.get_directory()
+    with statement_budget(0):
+        assert len(organization_svc_integration.all()) == len(organizations)
+        assert organization_svc_integration.get(cads.slug).id == cads.id
+
+
+def test_directory_checks_version_once_untrusted(
+    organization_svc_integration: OrganizationService,
+    session: Session,
+    statement_budget,
+    monkeypatch,
+):
+    """Test that a directory whose version is unchanged is kept after checking the version."""
+    monkeypatch.setattr(organization_directory_cache, "_check_seconds", 0.0)
+    directory = organization_svc_integration.get_directory()
+    # Changes made without incrementing the version are not noticed
+    session.get(OrganizationEntity, cads.id).name = "Renamed"
+    session.commit()
+    with statement_budget(1):
+        assert organization_svc_integration.get_directory() is directory
+
+
+def test_directory_reloaded_on_version_change(
+    organization_svc_integration: OrganizationService,
+    session: Session,
+    monkeypatch,
+):
+    """Test that a change committed by another process is loaded once the version is checked."""
+    monkeypatch.setattr(organization_directory_cache, "_check_seconds", 0.0)
+    directory = organization_svc_integration.get_directory()
+    session.get(OrganizationEntity, cads.id).name = "Renamed"
+    session.merge(OrganizationVersionEntity(id=1, version=directory.version + 1))
+    session.commit()
+    reloaded = organization_svc_integration.get_directory()
+    assert reloaded.by_slug[cads.slug].name == "Renamed"
+    assert reloaded.etag != directory.etag
+
+
+def test_directory_trusted_until_checked(
+    organization_svc_integration: OrganizationService, session: Session
+):
+    """Test that the directory is trusted, without checking the version, for a while."""
+    directory = organization_svc_integration.get_directory()
+    session.merge(OrganizationVersionEntity(id=1, version=directory.version + 1))
+    session.commit()
+    assert organization_svc_integration.get_directory() is directory
+
+
 # Test `OrganizationService.create()`
 
 
@@ -81,6 +245,17 @@ def test_create_organization_as_root(organization_svc_integration: OrganizationS
     assert created_organization.id is not None
 
 
+def test_create_organization_refreshes_directory(
+    organization_svc_integration: OrganizationService,
+):
+    """Test that a created organization is in the directory right away."""
+    etag = organization_svc_integration.get_directory().etag
+    organization_svc_integration.create(root, to_add)
+    directory = organization_svc_integration.get_directory()
+    assert directory.by_slug[to_add.slug].name == to_add.name
+    assert directory.etag != etag
+
+
 def test_create_organization_as_user(organization_svc_integration: OrganizationService):
     """Test that any user is *unable* to create new organizations."""
     with pytest.raises(UserPermissionException):
@@ -102,6 +277,17 @@ def test_update_organization_as_root(
     )
 
 
+def test_update_organization_refreshes_directory(
+    organization_svc_integration: OrganizationService,
+):
+    """Test that updates are in the directory right away, also in other worker processes."""
+    version = organization_svc_integration.get_directory().version
+    organization_svc_integration.update(root, new_cads)
+    directory = organization_svc_integration.get_directory()
+    assert directory.by_id[cads.id].website == new_cads.website
+    assert directory.version == version + 1
+
+
 def test_update_organization_as_user(organization_svc_integration: OrganizationService):
     """Test that any user is *unable* to update new organizations."""
     with pytest.raises(UserPermissionException):
@@ -125,9 +311,11 @@ def test_delete_enforces_permission(organization_svc_integration: OrganizationSe
 
 def test_delete_organization_as_root(organization_svc_integration: OrganizationService):
     """Test that the root user is able to delete organizations."""
+    organization_svc_integration.get_directory()
     organization_svc_integration.delete(root, cads.slug)
     with pytest.raises(ResourceNotFoundException):
         organization_svc_integration.get_by_slug(cads.slug)
+    assert cads.id not in organization_svc_integration.get_directory().by_id
 
 
 def test_delete_organization_as_user(organization_svc_integration: OrganizationService):
@@ -0,0 +1,85 @@
+"""Tests for the PermissionIndex used by the PermissionService."""
+
+from ...models import Permission
+from ...services.permission_index import PermissionIndex
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def _index(*grants: tuple[str, str]) -> PermissionIndex:
+    return PermissionIndex(
+        Permission(action=action, resource=resource) for action, resource in grants
+    )
+
+
+def test_empty_index_allows_nothing():
+    index = _index()
+    assert index.allows("checkin.create", "checkin") is False
+    assert index.allows("", "") is False
+
+
+def test_exact_grant():
+    index = _index(("checkin.create", "checkin"))
+    assert index.allows("checkin.create", "checkin")
+    assert index.allows("checkin.create", "checkin/1") is False
+    assert index.allows("checkin.creat", "checkin") is False
+    assert index.allows("checkin.create", "checki") is False
+
+
+def test_dot_is_not_a_wildcard():
+    index = _index(("checkin.create", "checkin"), ("room.update", "room.1*"))
+    assert index.allows("checkinXcreate", "checkin") is False
+    assert index.allows("room.update", "room.12")
+    assert index.allows("room.update", "room/12") is False
+
+
+def test_catch_all_grant():
+    index = _index(("*", "*"))
+    assert index.allows("permission.grant", "*")
+    assert index.allows("checkin.delete", "checkin/1")
+    assert index.allows("", "")
+
+
+def test_trailing_wildcards():
+    index = _index(
+        ("coworking.reservation.*", "*"), ("organization.*", "organization/1")
+    )
+    assert index.allows("coworking.reservation.read", "user/2")
+    assert index.allows("coworking.reservation.", "")
+    assert index.allows("coworking.reservations", "user/2") is False
+    assert index.allows("organization.update", "organization/1")
+    assert index.allows("organization.update", "organization/12") is False
+
+
+def test_wildcards_within_patterns():
+    index = _index(("organization.*.manage", "organization/*/events/*"))
+    assert index.allows("organization.events.manage", "organization/1/events/2")
+    assert index.allows("organization..manage", "organization//events/")
+    assert index.allows("organization.events.manage", "organization/1/events") is False
+    assert index.allows("organization.events.view", "organization/1/events/2") is False
+
+
+def test_consecutive_wildcards():
+    index = _index(("a**b", "*"))
+    assert index.allows("ab", "x")
+    assert index.allows("axyzb", "x")
+    assert index.allows("axyz", "x") is False
+
+
+def test_resources_are_matched_per_action():
+    index = _index(("checkin.create", "checkin"), ("checkin.delete", "checkin/*"))
+    assert index.allows("checkin.create", "checkin")
+    assert index.allows("checkin.delete", "checkin/1")
+    assert index.allows("checkin.create", "checkin/1") is False
+    assert index.allows("checkin.delete", "checkin") is False
+
+
+def test_many_grants():
+    index = _index(
+        *[(f"organization.{i}.manage", f"organization/{i}") for i in range(1000)]
+    )
+    assert index.allows("organization.999.manage", "organization/999")
+    assert index.allows("organization.999.manage", "organization/998") is False
+    assert len(index.permissions) == 1000
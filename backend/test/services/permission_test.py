@@ -5,6 +5,7 @@ import pytest
 # Tested Dependencies
 from ...models import Permission, User
 from ...services import PermissionService
+from ...entities import user_role_table
 
 # Data Setup and Injected Service Fixtures
 from .core_data import setup_insert_data_fixture
@@ -124,6 +125,101 @@ def test_check_specific_permission(permission_svc: PermissionService):
     )
 
 
-def test_get_user_roles_permissions(permission_svc: PermissionService):
-    """Test covers an edge case of _get_user_roles_permissions when user does not exist"""
-    assert permission_svc._get_user_roles_permissions(User(id=423)) == []
+def test_check_matches_dots_literally(permission_svc: PermissionService):
+    """Tests that a "." in a grant matches only a ".", not any character as it once did"""
+    p = Permission(action="checkin.delete", resource="room.1*")
+    permission_svc.grant(root, ambassador, p)
+    assert permission_svc.check(ambassador, "checkin.delete", "room.1")
+    assert permission_svc.check(ambassador, "checkin.delete", "room.12")
+    assert permission_svc.check(ambassador, "checkinXdelete", "room.1") is False
+    assert permission_svc.check(ambassador, "checkin.delete", "room/1") is False
+
+
+def test_get_permission_set_of_unknown_user(permission_svc: PermissionService):
+    """Test covers an edge case of _get_permission_index when user does not exist"""
+    assert permission_svc._get_permission_index(User(id=423)).permissions == []
+
+
+def test_get_permissions_includes_user_and_role_permissions(
+    permission_svc: PermissionService,
+):
+    """The user's own permissions come first, followed by those granted via roles"""
+    p = Permission(action="checkin.delete", resource="checkin")
+    permission_svc.grant(root, ambassador, p)
+    permissions = permission_svc.get_permissions(ambassador)
+    assert [(p.action, p.resource) for p in permissions] == [
+        ("checkin.delete", "checkin"),
+        ("checkin.create", "checkin"),
+        ("coworking.reservation.*", "*"),
+    ]
+
+
+def test_permission_set_is_loaded_once(
+    permission_svc: PermissionService, statement_budget
+):
+    """Repeated checks for a subject within a request reuse its loaded permissions"""
+    with statement_budget(2):
+        assert permission_svc.check(ambassador, "checkin.create", "checkin")
+        assert permission_svc.check(ambassador, "checkin.delete", "checkin") is False
+        permission_svc.enforce(ambassador, "checkin.create", "checkin")
+        assert len(permission_svc.get_permissions(ambassador)) == 2
+
+
+def test_check_many(permission_svc: PermissionService, statement_budget):
+    """A batch of checks loads the subject's permissions once and answers in order"""
+    with statement_budget(2):
+        assert permission_svc.check_many(
+            ambassador,
+            [
+                ("checkin.create", "checkin"),
+                ("checkin.delete", "checkin"),
+                ("coworking.reservation.read", "user/3"),
+                ("admin.view", "admin/"),
+            ],
+        ) == [True, False, True, False]
+
+
+def test_check_many_empty(permission_svc: PermissionService):
+    assert permission_svc.check_many(user, []) == []
+
+
+def test_invalidate(permission_svc: PermissionService, session):
+    """Changes made outside of grant and revoke are seen after invalidation"""
+    assert permission_svc.check(user, "checkin.create", "checkin") is False
+    session.execute(
+        user_role_table.insert().values(user_id=user.id, role_id=ambassador_role.id)
+    )
+    assert permission_svc.check(user, "checkin.create", "checkin") is False
+    permission_svc.invalidate()
+    assert permission_svc.check(user, "checkin.create", "checkin")
+
+
+def test_permission_set_is_cached_across_requests(
+    permission_svc: PermissionService, session, statement_budget
+):
+    """Later requests only read the permission version when the cache is current"""
+    assert permission_svc.check(ambassador, "checkin.create", "checkin")
+    with statement_budget(1):
+        next_request = PermissionService(session)
+        assert next_request.check(ambassador, "checkin.create", "checkin")
+
+
+def test_grant_invalidates_cached_permission_sets(
+    permission_svc: PermissionService, session
+):
+    """Permission sets cached by other requests are reloaded after a grant"""
+    assert permission_svc.check(ambassador, "checkin.delete", "checkin") is False
+    p = Permission(action="checkin.delete", resource="checkin")
+    PermissionService(session).grant(root, ambassador_role, p)
+    next_request = PermissionService(session)
+    assert next_request.check(ambassador, "checkin.delete", "checkin")
+
+
+def test_revoke_invalidates_cached_permission_sets(
+    permission_svc: PermissionService, session
+):
+    """Permission sets cached by other requests are reloaded after a revoke"""
+    assert permission_svc.check(ambassador, "checkin.create", "checkin")
+    PermissionService(session).revoke(root, ambassador_permission)
+    next_request = PermissionService(session)
+    assert next_request.check(ambassador, "checkin.create", "checkin") is False
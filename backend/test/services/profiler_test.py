@@ -0,0 +1,66 @@
+"""Tests for the ProfilerService."""
+
+import pytest
+from unittest.mock import create_autospec
+
+from ...instrumentation import SamplingProfiler
+from ...models import ProfilerSettings
+from ...services import PermissionService
+from ...services.exceptions import UserPermissionException
+from ...services.profiler import ProfilerService
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+from .fixtures import permission_svc
+
+# Import the setup_teardown fixture explicitly to load entities in database
+from .core_data import setup_insert_data_fixture
+
+# Import the fake model data in a namespace for test assertions
+from .core_data import user_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+@pytest.fixture()
+def profiler_svc(permission_svc: PermissionService):
+    """ProfilerService fixture controlling a profiler of its own rather than the process-wide one."""
+    profiler_svc = ProfilerService(permission_svc)
+    profiler_svc._profiler = SamplingProfiler()
+    return profiler_svc
+
+
+def test_start_and_stop_as_root(profiler_svc: ProfilerService):
+    status = profiler_svc.start(
+        user_data.root, ProfilerSettings(fraction=0.25, duration_seconds=30)
+    )
+    assert status.active
+    assert status.fraction == 0.25
+    assert status.until is not None
+
+    status = profiler_svc.stop(user_data.root)
+    assert not status.active
+    assert status.until is None
+    assert profiler_svc.status(user_data.root) == status
+    assert profiler_svc.collapsed_stacks(user_data.root) == ""
+
+
+def test_start_enforces_permission(profiler_svc: ProfilerService):
+    profiler_svc._permission = create_autospec(profiler_svc._permission)
+    profiler_svc.start(user_data.root, ProfilerSettings())
+    profiler_svc._permission.enforce.assert_called_with(
+        user_data.root, "profiler.manage", "profiler"
+    )
+
+
+def test_user_cannot_manage_profiler(profiler_svc: ProfilerService):
+    with pytest.raises(UserPermissionException):
+        profiler_svc.start(user_data.user, ProfilerSettings())
+    with pytest.raises(UserPermissionException):
+        profiler_svc.stop(user_data.user)
+    with pytest.raises(UserPermissionException):
+        profiler_svc.status(user_data.user)
+    with pytest.raises(UserPermissionException):
+        profiler_svc.collapsed_stacks(user_data.user)
+    assert not profiler_svc._profiler.active
@@ -0,0 +1,137 @@
+"""Helpers for asserting on the Postgres query plans of service queries.
+
+The `capture_query_plans` context manager records each SELECT statement a service issues
+and, once the block exits, asks Postgres to EXPLAIN it with the same parameters. Plans are
+gathered with sequential scans disabled, so that the assertions stay meaningful on the
+small, seeded test database where a sequential scan would otherwise always be cheapest.
+With sequential scans disabled, Postgres falls back to reading a table in full through any
+index, such as its primary key, when no index condition applies. `QueryPlan.full_scans`
+treats such a scan the same as a `Seq Scan`.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Iterator
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+_SCANS = ("Seq Scan", "Index Scan", "Index Only Scan", "Bitmap Heap Scan")
+_INDEX_SCANS = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+
+
+class QueryPlan:
+    """The estimated plan of a single SQL statement."""
+
+    statement: str
+    root: dict[str, Any]
+
+    def __init__(self, statement: str, root: dict[str, Any]):
+        self.statement = statement
+        self.root = root
+
+    @property
+    def rows(self) -> int:
+        """The number of rows the planner estimates the statement returns."""
+        return self.root["Plan Rows"]
+
+    def nodes(self) -> list[dict[str, Any]]:
+        """All nodes of the plan tree in depth-first order."""
+        nodes: list[dict[str, Any]] = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(reversed(node.get("Plans", [])))
+        return nodes
+
+    def scans(self, relation: str) -> list[dict[str, Any]]:
+        """Plan nodes that read rows of the given table."""
+        return [
+            node
+            for node in self.nodes()
+            if node["Node Type"] in _SCANS and node.get("Relation Name") == relation
+        ]
+
+    def full_scans(self) -> list[str]:
+        """Names of the tables read in full, by a sequential scan or an unconditioned index scan."""
+        return [
+            node["Relation Name"]
+            for node in self.nodes()
+            if node["Node Type"] == "Seq Scan"
+            or (
+                node["Node Type"] in ("Index Scan", "Index Only Scan")
+                and "Index Cond" not in node
+            )
+        ]
+
+    def indexes(self) -> list[str]:
+        """Names of the indexes used by the plan."""
+        return [
+            node["Index Name"]
+            for node in self.nodes()
+            if node["Node Type"] in _INDEX_SCANS
+        ]
+
+    def nested_loops(self) -> list[dict[str, Any]]:
+        """Nested loop join nodes of the plan."""
+        return [node for node in self.nodes() if node["Node Type"] == "Nested Loop"]
+
+    def has_unindexed_nested_loop(self) -> bool:
+        """Whether a nested loop join rescans its inner side without the help of an index."""
+        for loop in self.nested_loops():
+            inner = loop["Plans"][1]
+            inner_nodes = QueryPlan(self.statement, inner).nodes()
+            if not any(node["Node Type"] in _INDEX_SCANS for node in inner_nodes):
+                return True
+        return False
+
+
+class QueryPlans(list[QueryPlan]):
+    """The plans of the statements captured by `capture_query_plans`."""
+
+    def touching(self, relation: str) -> "QueryPlans":
+        """The plans that read rows of the given table."""
+        return QueryPlans(plan for plan in self if plan.scans(relation))
+
+
+@contextmanager
+def capture_query_plans(session: Session) -> Iterator[QueryPlans]:
+    """Capture the estimated plans of SELECT statements executed by the block.
+
+    Args:
+        session (Session): The session whose engine the service under test uses.
+
+    Returns:
+        Iterator[QueryPlans]: Populated with one plan per SELECT once the block exits.
+    """
+    statements: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = session.get_bind()
+    plans = QueryPlans()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield plans
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    # Refresh planner statistics so that row estimates reflect the seeded data
+    session.execute(text("ANALYZE"))
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT capture_query_plans")
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        for statement, parameters in statements:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plans.append(QueryPlan(statement, cursor.fetchone()[0][0]["Plan"]))
+        cursor.execute("ROLLBACK TO SAVEPOINT capture_query_plans")
+    finally:
+        cursor.close()
@@ -0,0 +1,273 @@
+"""Query-plan regression tests for hot service queries.
+
+Each test runs a frequently used service method and asserts on the plans Postgres chooses
+for the SQL it issues. A failure here usually means a change to a query's filter or join
+no longer lines up with the indexes that exist to serve it.
+"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ...models.coworking import TimeRange
+from ...models.pagination import PaginationParams
+from ...models.event_registration import RegistrationWindow
+from ...services import (
+    UserService,
+    OrganizationService,
+    EventService,
+    PermissionService,
+)
+from ...services.coworking import ReservationService
+
+from .query_plan import capture_query_plans
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+from .fixtures import (
+    user_svc_integration,
+    organization_svc_integration,
+    event_svc_integration,
+)
+from .coworking.fixtures import (
+    reservation_svc,
+    permission_svc,
+    seat_svc,
+    policy_svc,
+    operating_hours_svc,
+)
+from .coworking.time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+from .core_data import setup_insert_data_fixture as insert_order_0
+from .coworking.operating_hours_data import fake_data_fixture as insert_order_1
+from .room_data import fake_data_fixture as insert_order_2
+from .coworking.seat_data import fake_data_fixture as insert_order_3
+from .coworking.reservation.reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from .coworking import seat_data
+from . import user_data
+from .organization import organization_test_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+HISTORICAL_RESERVATIONS = 2000
+
+
+@pytest.fixture(autouse=True)
+def insert_order_5(session: Session, insert_order_4):
+    """Seed a history of past reservations so that time-range filters are selective.
+
+    With only a handful of reservations, every plan is trivially cheap and nothing can be
+    learned from it. Past reservations are what accumulate in production, so they are what
+    the time index must let the hot queries skip over."""
+    session.execute(
+        text(
+            """
+            INSERT INTO coworking__reservation
+                (id, start, "end", state, walkin, room_id, created_at, updated_at)
+            SELECT 1000 + n, now() - n * interval '1 hour' - interval '2 days',
+                   now() - n * interval '1 hour' - interval '2 days' + interval '1 hour',
+                   'CHECKED_OUT', false, NULL, now(), now()
+            FROM generate_series(1, :count) AS n
+            """
+        ),
+        {"count": HISTORICAL_RESERVATIONS},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO coworking__reservation_user (reservation_id, user_id)
+            SELECT 1000 + n, :user_id FROM generate_series(1, :count) AS n
+            """
+        ),
+        {"count": HISTORICAL_RESERVATIONS, "user_id": user_data.ambassador.id},
+    )
+    session.execute(
+        text(
+            """
+            INSERT INTO coworking__reservation_seat (reservation_id, seat_id)
+            SELECT 1000 + n, :seat_id FROM generate_series(1, :count) AS n
+            """
+        ),
+        {"count": HISTORICAL_RESERVATIONS, "seat_id": seat_data.monitor_seat_01.id},
+    )
+    session.commit()
+
+
+def _upcoming(time: dict[str, datetime]) -> TimeRange:
+    return TimeRange(start=time[NOW], end=time[IN_THREE_HOURS])
+
+
+def test_active_reservations_for_user_use_time_index(
+    reservation_svc: ReservationService, session: Session, time
+):
+    with capture_query_plans(session) as plans:
+        reservation_svc._get_active_reservations_for_user(
+            user_data.ambassador, _upcoming(time)
+        )
+
+    plan = plans.touching("coworking__reservation")[0]
+    assert "coworking__reservation_time_idx" in plan.indexes()
+    assert plan.full_scans() == []
+    assert not plan.has_unindexed_nested_loop()
+    assert plan.rows < HISTORICAL_RESERVATIONS / 10
+
+
+def test_seat_reservations_use_time_index(
+    reservation_svc: ReservationService, session: Session, time
+):
+    with capture_query_plans(session) as plans:
+        reservation_svc.get_seat_reservations(seat_data.seats, _upcoming(time))
+
+    plan = plans.touching("coworking__reservation")[0]
+    assert "coworking__reservation_time_idx" in plan.indexes()
+    assert plan.full_scans() == []
+    assert not plan.has_unindexed_nested_loop()
+    assert plan.rows < HISTORICAL_RESERVATIONS / 10
+
+
+def test_user_get_by_pid_uses_unique_index(
+    user_svc_integration: UserService, session: Session
+):
+    with capture_query_plans(session) as plans:
+        user_svc_integration.get(user_data.ambassador.pid)
+
+    plan = plans.touching("user")[0]
+    assert plan.indexes() == ["ix_user_pid"]
+    assert plan.full_scans() == []
+    assert plan.rows == 1
+
+
+def test_user_search_uses_trigram_index(
+    user_svc_integration: UserService, session: Session
+):
+    if not user_svc_integration._trigram_search_available():
+        pytest.skip("The pg_trgm extension is not installed")
+
+    with capture_query_plans(session) as plans:
+        user_svc_integration.search(user_data.ambassador, "ambas")
+
+    plan = plans.touching("user")[0]
+    assert "ix_user_search_trgm" in plan.indexes()
+    assert plan.full_scans() == []
+
+
+def test_user_search_by_pid_prefix_uses_pid_index(
+    user_svc_integration: UserService, session: Session
+):
+    if not user_svc_integration._trigram_search_available():
+        pytest.skip("The pg_trgm extension is not installed")
+
+    with capture_query_plans(session) as plans:
+        user_svc_integration.search(user_data.ambassador, "8888")
+
+    plan = plans.touching("user")[0]
+    assert "ix_user_pid" in plan.indexes()
+    assert "ix_user_search_trgm" in plan.indexes()
+    assert plan.full_scans() == []
+
+
+def test_user_list_after_cursor_seeks_name_index(
+    user_svc_integration: UserService, session: Session
+):
+    params = PaginationParams(page_size=1, order_by="first_name", count=False)
+    first = user_svc_integration.list(user_data.root, params)
+    params = PaginationParams(
+        page_size=1, order_by="first_name", cursor=first.next_cursor, count=False
+    )
+    with capture_query_plans(session) as plans:
+        user_svc_integration.list(user_data.root, params)
+
+    plan = plans.touching("user")[-1]
+    assert "ix_user_first_name_id" in plan.indexes()
+    assert plan.full_scans() == []
+
+
+def test_organization_entity_by_slug_uses_unique_index(
+    organization_svc_integration: OrganizationService, session: Session
+):
+    with capture_query_plans(session) as plans:
+        organization_svc_integration._get_entity(organization_test_data.cads.slug)
+
+    plan = plans.touching("organization")[0]
+    assert plan.indexes() == ["organization_slug_key"]
+    assert plan.full_scans() == []
+    assert plan.rows == 1
+
+
+def test_event_registration_lookup_uses_primary_key(
+    event_svc_integration: EventService, session: Session
+):
+    event = event_svc_integration.get_by_id(1)
+    with capture_query_plans(session) as plans:
+        event_svc_integration.get_registration(
+            user_data.ambassador, user_data.ambassador, event
+        )
+
+    plan = plans.touching("event_registration")[0]
+    # Either index covering both columns of the primary key serves the lookup
+    assert {"event_registration_pkey", "ix_event_registration_user_id_event_id"} & set(
+        plan.indexes()
+    )
+    assert "event_registration" not in plan.full_scans()
+    assert not plan.has_unindexed_nested_loop()
+    assert plan.rows == 1
+
+
+def test_event_list_after_cursor_seeks_time_index(
+    event_svc_integration: EventService, session: Session
+):
+    params = PaginationParams(page_size=1, order_by="time", count=False)
+    first = event_svc_integration.get_paginated_events(params)
+    params = PaginationParams(
+        page_size=1, order_by="time", cursor=first.next_cursor, count=False
+    )
+    with capture_query_plans(session) as plans:
+        event_svc_integration.get_paginated_events(params, subject=user_data.ambassador)
+
+    plan = plans.touching("event")[0]
+    assert "ix_event_time_id" in plan.indexes()
+    assert plan.full_scans() == []
+
+
+def test_registered_events_of_user_use_user_index(
+    event_svc_integration: EventService, session: Session
+):
+    window = RegistrationWindow(
+        start=datetime.now(), end=datetime.now() + timedelta(days=7)
+    )
+    with capture_query_plans(session) as plans:
+        event_svc_integration.get_registered_events_of_user(
+            user_data.ambassador, user_data.ambassador, [window, window]
+        )
+
+    plan = plans.touching("event_registration")[0]
+    assert "ix_event_registration_user_id_event_id" in plan.indexes()
+    assert plan.full_scans() == []
+    assert not plan.has_unindexed_nested_loop()
+
+
+def test_event_search_uses_search_index(
+    event_svc_integration: EventService, session: Session
+):
+    with capture_query_plans(session) as plans:
+        event_svc_integration.search(PaginationParams(filter="work", count=False))
+
+    plan = plans.touching("event")[0]
+    assert "ix_event_search" in plan.indexes()
+    assert plan.full_scans() == []
+
+
+def test_permission_set_uses_grantee_indexes(
+    permission_svc: PermissionService, session: Session
+):
+    with capture_query_plans(session) as plans:
+        permission_svc.get_permissions(user_data.ambassador)
+
+    plan = plans.touching("permission")[0]
+    assert "ix_permission_user_id" in plan.indexes()
+    assert "ix_permission_role_id" in plan.indexes()
+    assert plan.full_scans() == []
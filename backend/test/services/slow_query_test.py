@@ -0,0 +1,96 @@
+"""Tests for the slow-query log's capture of statements, callers, and plans."""
+
+import json
+import pytest
+from pathlib import Path
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ...instrumentation.slow_query import SlowQueryLog, _is_explainable
+from ...services import UserService
+
+# Data Setup and Injected Service Fixtures
+from .core_data import setup_insert_data_fixture
+from .fixtures import user_svc, permission_svc_mock
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def _records(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.fixture()
+def slow_query_path(session: Session, tmp_path: Path):
+    """Install a slow-query log with EXPLAIN capture that logs every statement."""
+    path = tmp_path / "slow_queries.jsonl"
+    log = SlowQueryLog(str(path), threshold_ms=0, explain=True)
+    engine = session.get_bind()
+    log.install(engine)
+    yield path
+    log.uninstall(engine)
+
+
+def test_logs_statement_caller_and_plan(user_svc: UserService, slow_query_path: Path):
+    """A service's SELECT is logged with its parameters, calling method, and plan."""
+    user_svc.search(None, "amy")  # type: ignore
+
+    # The first search in a process also checks once whether pg_trgm is installed
+    records = [
+        record
+        for record in _records(slow_query_path)
+        if record["caller"] != "UserService._trigram_search_available"
+    ]
+    assert len(records) == 1
+    record = records[0]
+    assert record["caller"] == "UserService.search"
+    assert 'FROM "user"' in record["statement"]
+    assert "%amy%" in json.dumps(record["parameters"])
+    assert record["duration_ms"] >= 0
+    plan = record["plan"][0]
+    assert "Plan" in plan
+    assert "Execution Time" in plan
+
+
+def test_does_not_explain_writes(session: Session, slow_query_path: Path):
+    """Statements with side effects are logged but never executed again by EXPLAIN."""
+    session.execute(text("UPDATE \"user\" SET pronouns = 'they' WHERE id = 1"))
+
+    records = _records(slow_query_path)
+    assert records[0]["plan"] is None
+    assert records[0]["caller"] is None
+
+
+@pytest.mark.parametrize(
+    "locking_clause",
+    ["FOR UPDATE", "FOR NO KEY UPDATE", "FOR SHARE", "FOR KEY SHARE", "FOR\n  UPDATE"],
+)
+def test_does_not_explain_locking_selects(locking_clause: str):
+    """SELECTs with any row-locking clause would take their locks again under EXPLAIN."""
+    statement = f'SELECT id FROM "user" WHERE id = 1 {locking_clause} SKIP LOCKED'
+    assert _is_explainable(statement, executemany=False) is False
+    assert _is_explainable('SELECT id FROM "user" WHERE id = 1', executemany=False)
+
+
+def test_explain_keeps_transaction_usable(session: Session, slow_query_path: Path):
+    """The savepoint around EXPLAIN keeps the caller's transaction usable."""
+    session.execute(text("SELECT 1 WHERE 1 = :value"), {"value": 1})
+    assert session.execute(text("SELECT 2")).scalar() == 2
+    assert len(_records(slow_query_path)) == 2
+
+
+def test_threshold(session: Session, tmp_path: Path):
+    """Statements faster than the threshold are not logged."""
+    path = tmp_path / "slow_queries.jsonl"
+    log = SlowQueryLog(str(path), threshold_ms=60_000)
+    engine = session.get_bind()
+    log.install(engine)
+    try:
+        session.execute(text("SELECT 1"))
+    finally:
+        log.uninstall(engine)
+    assert _records(path) == []
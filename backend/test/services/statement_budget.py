@@ -0,0 +1,53 @@
+"""Helpers for asserting on the number of SQL statements a block of code executes.
+
+An unexpected lazy relationship load or an extra permission lookup does not change what a
+service returns, so it slips past functional tests and shows up in production as latency.
+Wrapping hot paths in `max_statements` turns such a change into a test failure that lists
+every statement the block issued.
+"""
+
+from contextlib import contextmanager
+from typing import Iterator
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+@contextmanager
+def max_statements(session: Session, budget: int) -> Iterator[list[str]]:
+    """Assert that the block executes at most `budget` SQL statements.
+
+    Args:
+        session (Session): The session whose engine the code under test uses.
+        budget (int): The maximum number of statements the block may execute.
+
+    Returns:
+        Iterator[list[str]]: The statements executed so far, for ad hoc inspection.
+
+    Raises:
+        AssertionError: If the block executes more than `budget` statements.
+    """
+    statements: list[str] = []
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    if len(statements) > budget:
+        listing = "\n\n".join(
+            f"{i}. {statement}" for i, statement in enumerate(statements, start=1)
+        )
+        raise AssertionError(
+            f"Expected at most {budget} SQL statements, but {len(statements)} were executed:\n\n{listing}"
+        )
@@ -0,0 +1,79 @@
+"""Tests for the UserCache consulted when authenticating bearer tokens."""
+
+from unittest.mock import patch
+
+from ...models import UserDetails
+from ...services import user_cache as user_cache_module
+from ...services.user_cache import UserCache
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def _user(pid: int) -> UserDetails:
+    return UserDetails(id=pid, pid=pid, onyen=f"user{pid}", email=f"user{pid}@unc.edu")
+
+
+def test_get_unknown_token():
+    assert UserCache().get("token") is None
+
+
+def test_put_and_get():
+    cache = UserCache()
+    user = _user(1)
+    cache.put("token", user)
+    assert cache.get("token") is user
+
+
+def test_least_recently_used_token_is_evicted():
+    cache = UserCache(max_size=2)
+    cache.put("a", _user(1))
+    cache.put("b", _user(2))
+    cache.get("a")
+    cache.put("c", _user(3))
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_entries_expire_after_ttl():
+    cache = UserCache(ttl_seconds=60)
+    with patch.object(user_cache_module, "monotonic", return_value=1000.0):
+        cache.put("token", _user(1))
+    with patch.object(user_cache_module, "monotonic", return_value=1059.0):
+        assert cache.get("token") is not None
+    with patch.object(user_cache_module, "monotonic", return_value=1060.0):
+        assert cache.get("token") is None
+
+
+def test_entries_expire_with_token():
+    cache = UserCache(ttl_seconds=60)
+    with patch.object(user_cache_module, "monotonic", return_value=1000.0):
+        cache.put("token", _user(1), token_ttl_seconds=5)
+    with patch.object(user_cache_module, "monotonic", return_value=1005.0):
+        assert cache.get("token") is None
+
+
+def test_expired_token_is_not_cached():
+    cache = UserCache()
+    cache.put("token", _user(1), token_ttl_seconds=-1)
+    assert cache.get("token") is None
+
+
+def test_invalidate_forgets_all_tokens_of_user():
+    cache = UserCache()
+    cache.put("a", _user(1))
+    cache.put("b", _user(1))
+    cache.put("c", _user(2))
+    cache.invalidate(1)
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_clear():
+    cache = UserCache()
+    cache.put("a", _user(1))
+    cache.clear()
+    assert cache.get("a") is None
@@ -0,0 +1,236 @@
+"""Tests for the UserImportService class."""
+
+import io
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ...entities import UserEntity
+from ...entities.academics import SectionMemberEntity
+from ...models.roster_role import RosterRole
+from ...services import UserImportService
+from ...services.exceptions import (
+    ResourceNotFoundException,
+    UserPermissionException,
+)
+
+# Data Setup and Injected Service Fixtures
+from .fixtures import user_import_svc_integration
+from .core_data import setup_insert_data_fixture as insert_order_0
+from .academics.term_data import fake_data_fixture as insert_order_1
+from .academics.course_data import fake_data_fixture as insert_order_2
+from .academics.section_data import fake_data_fixture as insert_order_3
+
+# Data Models for Fake Data Inserted in Setup
+from .user_data import root, ambassador, user
+from .academics import section_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+HEADER = "pid,onyen,email,first_name,last_name,pronouns\n"
+
+
+def _csv(*rows: str, header: str = HEADER) -> io.StringIO:
+    return io.StringIO(header + "".join(f"{row}\n" for row in rows))
+
+
+def _get(session: Session, pid: int) -> UserEntity | None:
+    return session.scalar(select(UserEntity).where(UserEntity.pid == pid))
+
+
+def test_import_creates_and_updates_users(
+    user_import_svc_integration: UserImportService, session: Session
+):
+    summary = user_import_svc_integration.import_csv(
+        root,
+        _csv(
+            "123456789,newbie,newbie@unc.edu,New,Bie,They / Them",
+            f"{ambassador.pid},{ambassador.onyen},{ambassador.email},Andy,Ambassy,",
+        ),
+    )
+    assert (summary.created, summary.updated, summary.errors) == (1, 1, [])
+
+    created = _get(session, 123456789)
+    assert created is not None
+    assert (created.onyen, created.first_name, created.github) == ("newbie", "New", "")
+    updated = _get(session, ambassador.pid)
+    assert updated is not None
+    session.refresh(updated)
+    assert (updated.id, updated.first_name) == (ambassador.id, "Andy")
+
+
+def test_import_many_users(
+    user_import_svc_integration: UserImportService, session: Session, statement_budget
+):
+    rows = [
+        f"{100000000 + n},onyen{n},u{n}@unc.edu,First{n},Last{n}," for n in range(2000)
+    ]
+    with statement_budget(4):
+        summary = user_import_svc_integration.import_csv(root, _csv(*rows))
+    assert summary.created == 2000
+    assert _get(session, 100001999) is not None
+
+
+def test_import_optional_columns(user_import_svc_integration: UserImportService):
+    summary = user_import_svc_integration.import_csv(
+        root, _csv("123456789,newbie,newbie@unc.edu", header="pid,onyen,email\n")
+    )
+    assert summary.created == 1
+
+
+def test_import_keeps_columns_missing_from_file(
+    user_import_svc_integration: UserImportService, session: Session
+):
+    summary = user_import_svc_integration.import_csv(
+        root,
+        _csv(
+            f"{ambassador.pid},{ambassador.onyen}",
+            f"{user.pid},{user.onyen}",
+            header="pid,onyen\n",
+        ),
+    )
+    assert (summary.created, summary.updated, summary.errors) == (0, 2, [])
+
+    for model in (ambassador, user):
+        entity = _get(session, model.pid)
+        session.refresh(entity)
+        assert (entity.email, entity.first_name, entity.last_name, entity.pronouns) == (
+            model.email,
+            model.first_name,
+            model.last_name,
+            model.pronouns,
+        )
+
+
+def test_import_keeps_blank_fields(
+    user_import_svc_integration: UserImportService, session: Session
+):
+    summary = user_import_svc_integration.import_csv(
+        root, _csv(f"{ambassador.pid},{ambassador.onyen},{ambassador.email},Andy,,")
+    )
+    assert summary.updated == 1
+
+    updated = _get(session, ambassador.pid)
+    session.refresh(updated)
+    assert (updated.first_name, updated.last_name) == ("Andy", ambassador.last_name)
+
+
+def test_import_requires_emails_of_new_users(
+    user_import_svc_integration: UserImportService, session: Session
+):
+    summary = user_import_svc_integration.import_csv(
+        root,
+        _csv(
+            f"{ambassador.pid},{ambassador.onyen}",
+            "123456789,newbie",
+            "234567890,another",
+            header="pid,onyen\n",
+        ),
+    )
+    assert (summary.created, summary.updated) == (0, 0)
+    assert summary.errors == [
+        "PID 123456789: email is required to create a user",
+        "PID 234567890: email is required to create a user",
+    ]
+    assert _get(session, 123456789) is None
+
+
+def test_import_rejects_blank_and_duplicate_emails(
+    user_import_svc_integration: UserImportService, session: Session
+):
+    summary = user_import_svc_integration.import_csv(
+        root,
+        _csv(
+            "123456789,newbie,,New,Bie,",
+            "234567890,another,same@unc.edu,Ano,Ther,",
+            "345678901,third,SAME@unc.edu,Th,Ird,",
+        ),
+    )
+    assert summary.errors == [
+        "Line 2: email is required",
+        "Line 4: email appears more than once",
+    ]
+    assert _get(session, 234567890) is None
+
+
+def test_import_reports_invalid_rows_and_imports_nothing(
+    user_import_svc_integration: UserImportService, session: Session
+):
+    summary = user_import_svc_integration.import_csv(
+        root,
+        _csv(
+            "123456789,newbie,newbie@unc.edu,New,Bie,",
+            "12345,short,short@unc.edu,Short,Pid,",
+            "123456789,again,again@unc.edu,Dup,Pid,",
+            f"234567890,{'x' * 33},long@unc.edu,Long,Onyen,",
+        ),
+    )
+    assert (summary.created, summary.updated) == (0, 0)
+    assert summary.errors == [
+        "Line 3: pid must be 9 digits",
+        "Line 4: pid appears more than once",
+        "Line 5: onyen is longer than 32 characters",
+    ]
+    assert _get(session, 123456789) is None
+
+
+def test_import_requires_columns(user_import_svc_integration: UserImportService):
+    summary = user_import_svc_integration.import_csv(
+        root, _csv("newbie", header="onyen\n")
+    )
+    assert summary.errors == ["Missing column(s): pid"]
+
+
+def test_import_reports_conflicts_with_other_users(
+    user_import_svc_integration: UserImportService, session: Session
+):
+    summary = user_import_svc_integration.import_csv(
+        root,
+        _csv(
+            "123456789,newbie,newbie@unc.edu,New,Bie,",
+            f"234567890,other,{user.email},Email,Taken,",
+        ),
+    )
+    assert (summary.created, summary.updated) == (0, 0)
+    assert len(summary.errors) == 1
+    assert _get(session, 123456789) is None
+
+
+def test_import_roster(
+    user_import_svc_integration: UserImportService, session: Session
+):
+    section_id = section_data.comp_101_001.id
+    summary = user_import_svc_integration.import_csv(
+        root,
+        _csv(
+            "123456789,newbie,newbie@unc.edu,New,Bie,,",
+            f"{user.pid},{user.onyen},{user.email},Sally,Student,,uta",
+            header="pid,onyen,email,first_name,last_name,pronouns,roster_role\n",
+        ),
+        section_id,
+    )
+    assert (summary.created, summary.updated, summary.enrolled) == (1, 1, 2)
+
+    roles = session.execute(
+        select(UserEntity.pid, SectionMemberEntity.member_role)
+        .join(SectionMemberEntity, SectionMemberEntity.user_id == UserEntity.id)
+        .where(SectionMemberEntity.section_id == section_id)
+    ).all()
+    assert (123456789, RosterRole.STUDENT) in roles
+    assert (user.pid, RosterRole.UTA) in roles
+
+
+def test_import_roster_of_nonexistent_section(
+    user_import_svc_integration: UserImportService,
+):
+    with pytest.raises(ResourceNotFoundException):
+        user_import_svc_integration.import_csv(root, _csv(), 423)
+
+
+def test_import_enforces_permission(user_import_svc_integration: UserImportService):
+    with pytest.raises(UserPermissionException):
+        user_import_svc_integration.import_csv(
+            ambassador, _csv("123456789,newbie,newbie@unc.edu,New,Bie,")
+        )
@@ -1,12 +1,20 @@
 """Tests for the UserService class."""
 
 import pytest
+from pydantic import ValidationError
+from sqlalchemy import update
+from sqlalchemy.orm import Session
 
 # Tested Dependencies
 from ...models.user import User, NewUser
-from ...models.pagination import PaginationParams
+from ...models.pagination import MAX_PAGE_SIZE, PaginationParams, encode_cursor
 from ...services import UserService, PermissionService
-from ...services.exceptions import ResourceNotFoundException
+from ...services.exceptions import (
+    ResourceNotFoundException,
+    InvalidPaginationException,
+)
+from ...entities import UserEntity
+from ...services.user_cache import user_cache
 
 # Data Setup and Injected Service Fixtures
 from .core_data import setup_insert_data_fixture
@@ -44,6 +52,30 @@ def test_get_nonexistent(user_svc_integration: UserService):
     assert user_svc_integration.get(423) is None
 
 
+def test_get_by_pid_does_not_load_permissions(
+    user_svc: UserService, permission_svc_mock: PermissionService
+):
+    """Test that resolving a user by PID, as done for every request, skips their permissions."""
+    user = user_svc.get_by_pid(ambassador.pid)
+    assert user == ambassador
+    permission_svc_mock.get_permissions.assert_not_called()
+
+
+def test_get_by_pid_nonexistent(user_svc: UserService):
+    """Test that a nonexistent PID returns None."""
+    assert user_svc.get_by_pid(423) is None
+
+
+def test_get_details(user_svc_integration: UserService):
+    """Test that a user's permissions are attached to them on demand."""
+    user = user_svc_integration.get_details(ambassador)
+    assert user.id == ambassador.id
+    assert user.permissions == [
+        ambassador_permission,
+        ambassador_permission_coworking_reservation,
+    ]
+
+
 def test_get_by_id(user_svc_integration: UserService):
     """Test that a user can be retrieved by their ID"""
     user = user_svc_integration.get_by_id(ambassador.id)  # type: ignore
@@ -110,6 +142,45 @@ def test_search_no_match(user_svc: UserService):
     assert len(users) == 0
 
 
+def test_search_ranks_onyen_prefix_first(user_svc: UserService):
+    """Test that users whose onyen begins with the query are listed first."""
+    users = user_svc.search(ambassador, "u")
+    assert len(users) == len(user_data.users)
+    assert users[0].id == user.id
+
+
+def test_search_by_pid_prefix(user_svc: UserService):
+    """Test that a user can be retrieved by Searching for the beginning of their PID."""
+    users = user_svc.search(ambassador, "8888")
+    assert [u.id for u in users] == [ambassador.id]
+    users = user_svc.search(ambassador, str(ambassador.pid))
+    assert [u.id for u in users] == [ambassador.id]
+
+
+@pytest.mark.parametrize("query", ["²", "٣", "8²"])
+def test_search_by_non_ascii_digits(user_svc: UserService, query: str):
+    """Test that digits other than 0-9, which `int` rejects, are not matched against PIDs."""
+    criteria = user_svc._search_criteria(query)
+    assert "pid" not in str(criteria.compile())
+
+
+def test_search_criteria_match_pid_prefix(user_svc: UserService):
+    """Test that a query of ASCII digits is matched against PIDs."""
+    assert "pid" in str(user_svc._search_criteria("8888").compile())
+
+
+@pytest.fixture()
+def trigram_search(user_svc: UserService):
+    if not user_svc._trigram_search_available():
+        pytest.skip("The pg_trgm extension is not installed")
+
+
+def test_search_tolerates_typos(user_svc: UserService, trigram_search):
+    """Test that similar, but not identical, names match with trigram search."""
+    users = user_svc.search(ambassador, "ambasador")
+    assert users[0].id == ambassador.id
+
+
 def test_list(user_svc: UserService):
     """Test that a paginated list of users can be produced."""
     pagination_params = PaginationParams(page=0, page_size=2, order_by="id", filter="")
@@ -157,6 +228,122 @@ def test_list_filter(user_svc: UserService):
     assert users.items[0].id == ambassador.id
 
 
+def _filtered(user_svc: UserService, filter: str) -> list[int]:
+    pagination_params = PaginationParams(order_by="id", filter=filter)
+    return [u.id for u in user_svc.list(ambassador, pagination_params).items]
+
+
+def test_list_filter_by_email(user_svc: UserService):
+    """Test that the user list, like search, is filtered by part of users' emails."""
+    assert _filtered(user_svc, "amam@") == [ambassador.id]
+
+
+def test_list_filter_by_pid_prefix(user_svc: UserService):
+    """Test that the user list is filtered by the beginning of users' PIDs."""
+    assert _filtered(user_svc, "1111") == [user.id]
+    assert _filtered(user_svc, "1112") == []
+
+
+def test_search_across_name_columns(user_svc: UserService):
+    """Test that a query spanning a user's first and last names matches them."""
+    users = user_svc.search(ambassador, "amy amb")
+    assert [u.id for u in users] == [ambassador.id]
+    assert _filtered(user_svc, "amy amb") == [ambassador.id]
+
+
+def test_list_filter_tolerates_typos(user_svc: UserService, trigram_search):
+    """Test that the user list is filtered by similar, but not identical, names."""
+    assert ambassador.id in _filtered(user_svc, "ambasador")
+
+
+def test_list_by_cursor(user_svc: UserService):
+    """Test that pages continue after the cursor of the previous page."""
+    pagination_params = PaginationParams(page_size=2, order_by="first_name")
+    first = user_svc.list(ambassador, pagination_params)
+    assert first.next_cursor is not None
+
+    pagination_params = PaginationParams(
+        page_size=2, order_by="first_name", cursor=first.next_cursor, count=False
+    )
+    second = user_svc.list(ambassador, pagination_params)
+    assert second.length is None
+    assert second.next_cursor is None
+
+    by_first_name = sorted(user_data.users, key=lambda user: user.first_name)
+    listed = [user.id for user in first.items + second.items]
+    assert listed == [user.id for user in by_first_name]
+
+
+def test_list_cursor_breaks_ties_by_id(user_svc: UserService, session: Session):
+    """Test that users sharing a sort value are neither skipped nor repeated across pages."""
+    session.execute(update(UserEntity).values(last_name="Same"))
+    pagination_params = PaginationParams(page_size=1, order_by="last_name")
+    listed = []
+    while True:
+        page = user_svc.list(ambassador, pagination_params)
+        listed += [user.id for user in page.items]
+        if page.next_cursor is None:
+            break
+        pagination_params = PaginationParams(
+            page_size=1, order_by="last_name", cursor=page.next_cursor
+        )
+    assert listed == [user.id for user in user_data.users]
+
+
+def test_list_without_count(user_svc: UserService):
+    """Test that counting all users can be skipped."""
+    pagination_params = PaginationParams(page_size=2, order_by="id", count=False)
+    users = user_svc.list(ambassador, pagination_params)
+    assert users.length is None
+    assert len(users.items) == 2
+
+
+def test_list_unsortable_column(user_svc: UserService):
+    """Test that users cannot be ordered by columns outside of the allow-list."""
+    pagination_params = PaginationParams(order_by="pronouns")
+    with pytest.raises(InvalidPaginationException):
+        user_svc.list(ambassador, pagination_params)
+
+
+def test_list_malformed_cursor(user_svc: UserService):
+    """Test that a cursor must be one produced for the same order."""
+    first = user_svc.list(ambassador, PaginationParams(page_size=1, order_by="id"))
+    with pytest.raises(InvalidPaginationException):
+        user_svc.list(
+            ambassador,
+            PaginationParams(order_by="onyen", cursor=first.next_cursor or ""),
+        )
+    with pytest.raises(InvalidPaginationException):
+        user_svc.list(ambassador, PaginationParams(order_by="id", cursor="garbage"))
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["first_name", "Amy"],
+        ["first_name", 5, 1],
+        ["first_name", None, 1],
+        ["first_name", "Amy", "1"],
+        ["first_name", "Amy", True],
+        ["first_name", ["Amy"], 1],
+    ],
+)
+def test_list_tampered_cursor(user_svc: UserService, values: list):
+    """Test that cursor values must match the types of the columns they are compared with."""
+    pagination_params = PaginationParams(
+        order_by="first_name", cursor=encode_cursor(values)
+    )
+    with pytest.raises(InvalidPaginationException):
+        user_svc.list(ambassador, pagination_params)
+
+
+@pytest.mark.parametrize("page_size", [0, -1, MAX_PAGE_SIZE + 1])
+def test_list_page_size_out_of_range(page_size: int):
+    """Test that pages must hold at least one, and at most MAX_PAGE_SIZE, results."""
+    with pytest.raises(ValidationError):
+        PaginationParams(page_size=page_size)
+
+
 def test_list_enforces_permission(
     user_svc: UserService, permission_svc_mock: PermissionService
 ):
@@ -223,6 +410,21 @@ def test_update_user_as_root(
     assert updated_user.last_name == "Ambassy"
 
 
+def test_update_user_invalidates_cached_user(
+    user_svc: UserService, permission_svc_mock: PermissionService
+):
+    """Test that a user's cached bearer tokens must be resolved again after an update."""
+    permission_svc_mock.get_permissions.return_value = []
+    user = user_svc.get(ambassador.pid)
+    assert user is not None
+    user_cache.put("ambassador-token", user)
+    user_cache.put("root-token", user_svc.get(root.pid))
+    user.first_name = "Andy"
+    user_svc.update(ambassador, user)
+    assert user_cache.get("ambassador-token") is None
+    assert user_cache.get("root-token") is not None
+
+
 def test_update_user_enforces_permission(
     user_svc: UserService, permission_svc_mock: PermissionService
 ):
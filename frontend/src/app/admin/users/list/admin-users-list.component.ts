@@ -4,7 +4,11 @@ import { Profile } from 'src/app/profile/profile.service';
 import { UserAdminService } from 'src/app/admin/users/user-admin.service';
 import { permissionGuard } from 'src/app/permission.guard';
 
-import { Paginated } from 'src/app/pagination';
+import {
+  Paginated,
+  pageEventParams,
+  withLength
+} from 'src/app/pagination';
 import { PageEvent } from '@angular/material/paginator';
 
 @Component({
@@ -54,11 +58,9 @@ export class AdminUsersListComponent {
   }
 
   handlePageEvent(e: PageEvent) {
-    let paginationParams = this.page.params;
-    paginationParams.page = e.pageIndex;
-    paginationParams.page_size = e.pageSize;
+    let paginationParams = pageEventParams(this.page, e);
     this.userAdminService
       .list(paginationParams)
-      .subscribe((page) => (this.page = page));
+      .subscribe((page) => (this.page = withLength(page, this.page)));
   }
 }
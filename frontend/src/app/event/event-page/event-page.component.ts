@@ -7,7 +7,7 @@
  * @license MIT
  */
 
-import { Component, HostListener, OnInit } from '@angular/core';
+import { Component, HostListener, OnDestroy, OnInit } from '@angular/core';
 import { profileResolver } from 'src/app/profile/profile.resolver';
 import { eventResolver } from '../event.resolver';
 import { ActivatedRoute } from '@angular/router';
@@ -16,13 +16,22 @@ import { Event } from '../event.model';
 import { DatePipe } from '@angular/common';
 import { EventFilterPipe } from '../event-filter/event-filter.pipe';
 import { EventService } from '../event.service';
+import {
+  Subject,
+  Subscription,
+  debounceTime,
+  distinctUntilChanged,
+  map,
+  of,
+  switchMap
+} from 'rxjs';
 
 @Component({
   selector: 'app-event-page',
   templateUrl: './event-page.component.html',
   styleUrls: ['./event-page.component.css']
 })
-export class EventPageComponent implements OnInit {
+export class EventPageComponent implements OnInit, OnDestroy {
   /** Route information to be used in App Routing Module */
   public static Route = {
     path: '',
@@ -50,6 +59,10 @@ export class EventPageComponent implements OnInit {
   /** Stores the width of the window. */
   public innerWidth: any;
 
+  /** Search bar queries, searched for by the backend once typing pauses */
+  private searchQueries = new Subject<string>();
+  private searchSubscription: Subscription;
+
   /** Constructor for the events page. */
   constructor(
     private route: ActivatedRoute,
@@ -72,6 +85,21 @@ export class EventPageComponent implements OnInit {
     if (data.events.length > 0) {
       this.selectedEvent = eventFilterPipe.transform(data.events, '')[0];
     }
+
+    // Show the events matching the latest query, or all upcoming events without one
+    this.searchSubscription = this.searchQueries
+      .pipe(
+        debounceTime(250),
+        distinctUntilChanged(),
+        switchMap((query) =>
+          query.trim()
+            ? eventService.searchEvents(query).pipe(map((page) => page.items))
+            : of(this.events)
+        )
+      )
+      .subscribe((events) => {
+        this.eventsPerDay = eventService.groupEventsByDate(events);
+      });
   }
 
   /** Runs when the frontend UI loads */
@@ -80,6 +108,11 @@ export class EventPageComponent implements OnInit {
     this.innerWidth = window.innerWidth;
   }
 
+  /** Runs when the frontend UI is destroyed */
+  ngOnDestroy() {
+    this.searchSubscription.unsubscribe();
+  }
+
   /** Handler that runs when the window resizes */
   @HostListener('window:resize', ['$event'])
   onResize(_: UIEvent) {
@@ -91,7 +124,7 @@ export class EventPageComponent implements OnInit {
    * @param query: Search bar query to filter the items
    */
   onSearchBarQueryChange(query: string) {
-    this.eventsPerDay = this.eventService.groupEventsByDate(this.events, query);
+    this.searchQueries.next(query);
   }
 
   /** Handler that runs when an event card is clicked.
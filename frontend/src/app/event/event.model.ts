@@ -25,6 +25,7 @@ export interface Event {
   registration_count: number;
   is_attendee: boolean;
   is_organizer: boolean;
+  is_waitlisted: boolean;
   organizers: PublicProfile[];
 }
 
@@ -46,6 +47,7 @@ export interface EventJson {
   registration_count: number;
   is_attendee: boolean;
   is_organizer: boolean;
+  is_waitlisted: boolean;
   organizers: PublicProfile[];
 }
 
@@ -60,7 +62,8 @@ export const parseEventJson = (eventJson: EventJson): Event => {
 
 export enum RegistrationType {
   ATTENDEE,
-  ORGANIZER
+  ORGANIZER,
+  WAITLIST
 }
 
 export interface EventRegistration {
@@ -70,4 +73,12 @@ export interface EventRegistration {
   event: Event | null;
   user: Profile | null;
   is_organizer: boolean | null;
+  registration_type?: RegistrationType;
+}
+
+/** A period, optionally limited to an organization, to find a user's registrations in. */
+export interface RegistrationWindow {
+  start: Date;
+  end: Date;
+  organization_id?: number | null;
 }
@@ -38,6 +38,7 @@ export const eventDetailResolver: ResolveFn<Event | undefined> = (
       registration_count: 0,
       is_attendee: false,
       is_organizer: false,
+      is_waitlisted: false,
       organizers: []
     };
   }
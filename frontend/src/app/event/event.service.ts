@@ -14,12 +14,13 @@ import {
   Event,
   EventJson,
   EventRegistration,
+  RegistrationWindow,
   parseEventJson
 } from './event.model';
 import { DatePipe } from '@angular/common';
 import { EventFilterPipe } from './event-filter/event-filter.pipe';
 import { Profile, ProfileService } from '../profile/profile.service';
-import { Paginated, PaginationParams } from '../pagination';
+import { Paginated, PaginationParams, paginationQuery } from '../pagination';
 
 @Injectable({
   providedIn: 'root'
@@ -43,18 +44,22 @@ export class EventService {
    * @returns {Observable<Paginated<Profile>>}
    */
   getRegisteredUsersForEvent(event_id: number, params: PaginationParams) {
-    let paramStrings = {
-      page: params.page.toString(),
-      page_size: params.page_size.toString(),
-      order_by: params.order_by,
-      filter: params.filter
-    };
-    let query = new URLSearchParams(paramStrings);
+    let query = paginationQuery(params);
     return this.http.get<Paginated<Profile>>(
       `/api/events/${event_id}/registrations/users?` + query.toString()
     );
   }
 
+  /** Returns the registrations of an event as a CSV file, for organizers to download.
+   * @param event_id: number representing the Event ID
+   * @returns {Observable<Blob>}
+   */
+  exportRegistrations(event_id: number): Observable<Blob> {
+    return this.http.get(`/api/events/${event_id}/registrations/csv`, {
+      responseType: 'blob'
+    });
+  }
+
   /** Returns all event entries from the backend database table using the backend HTTP get request.
    * @returns {Observable<Event[]>}
    */
@@ -71,6 +76,30 @@ export class EventService {
     }
   }
 
+  /** Returns upcoming events matching a search query, searched for by the backend.
+   * @param query: Words the name, location, or description of events begin with
+   * @param params: Pagination parameters, whose filter is replaced by the query
+   * @returns {Observable<Paginated<Event>>}
+   */
+  searchEvents(
+    query: string,
+    params: PaginationParams = {
+      page: 0,
+      page_size: 100,
+      order_by: 'time',
+      filter: ''
+    }
+  ): Observable<Paginated<Event>> {
+    let search = paginationQuery({ ...params, filter: query });
+    search.set('start', new Date().toISOString());
+    let route = this.profile
+      ? '/api/events/search?'
+      : '/api/events/search/unauthenticated?';
+    return this.http.get<Paginated<EventJson>>(route + search.toString()).pipe(
+      map((page) => ({ ...page, items: page.items.map(parseEventJson) }))
+    );
+  }
+
   /** Returns the event object from the backend database table using the backend HTTP get request.
    * @param id: ID of the event to retrieve
    * @returns {Observable<Event>}
@@ -87,22 +116,27 @@ export class EventService {
     }
   }
 
-  /** Returns the event object from the backend database table using the backend HTTP get request.
+  /** Returns a page of the upcoming events of an organization from the backend.
    * @param slug: Slug of the organization to retrieve
-   * @returns {Observable<Event[]>}
+   * @param params: Pagination parameters
+   * @returns {Observable<Paginated<Event>>}
    */
-  getEventsByOrganization(slug: string): Observable<Event[]> {
-    if (this.profile) {
-      return this.http
-        .get<EventJson[]>('/api/events/organization/' + slug)
-        .pipe(map((eventJsons) => eventJsons.map(parseEventJson)));
-    } else {
-      return this.http
-        .get<EventJson[]>(
-          '/api/events/organization/' + slug + '/unauthenticated'
-        )
-        .pipe(map((eventJsons) => eventJsons.map(parseEventJson)));
+  getEventsByOrganization(
+    slug: string,
+    params: PaginationParams = {
+      page: 0,
+      page_size: 100,
+      order_by: 'time',
+      filter: ''
     }
+  ): Observable<Paginated<Event>> {
+    let query = paginationQuery(params);
+    let route = this.profile
+      ? `/api/events/organization/${slug}/paginated?`
+      : `/api/events/organization/${slug}/paginated/unauthenticated?`;
+    return this.http.get<Paginated<EventJson>>(route + query.toString()).pipe(
+      map((page) => ({ ...page, items: page.items.map(parseEventJson) }))
+    );
   }
 
   /** Returns the new event object from the backend database table using the backend HTTP get request.
@@ -182,6 +216,30 @@ export class EventService {
     return this.http.get<number>(`/api/events/${event_id}/registration/count`);
   }
 
+  /** Return the events the user is registered for in each of several windows of time, at once
+   * @param windows: RegistrationWindow[] representing the periods to search
+   * @returns Observable<Event[][]> with the events of each window, in order
+   */
+  getRegisteredEvents(windows: RegistrationWindow[]): Observable<Event[][]> {
+    return this.http
+      .post<EventJson[][]>('/api/events/registrations/user', windows)
+      .pipe(
+        map((windowJsons) =>
+          windowJsons.map((eventJsons) => eventJsons.map(parseEventJson))
+        )
+      );
+  }
+
+  /** Return the place in line of the user on the waitlist of an event
+   * @param event_id: number representing the Event ID
+   * @returns Observable<number>
+   */
+  getWaitlistPosition(event_id: number): Observable<number> {
+    return this.http.get<number>(
+      `/api/events/${event_id}/registration/waitlist_position`
+    );
+  }
+
   /** Create a new registration for an event using the backend HTTP create request.
    * @param event_id: number representing the Event ID
    * @returns Observable<EventRegistration>
@@ -8,7 +8,7 @@
  */
 
 import { Component, Input, OnInit } from '@angular/core';
-import { Event, EventRegistration } from '../../event.model';
+import { Event, EventRegistration, RegistrationType } from '../../event.model';
 import { MatSnackBar } from '@angular/material/snack-bar';
 import { EventService } from '../../event.service';
 import { Observable } from 'rxjs';
@@ -104,8 +104,8 @@ export class EventDetailCard implements OnInit {
       this.eventService
         .unregisterForEvent(event_registration_id)
         .subscribe(() => {
-          this.event.is_attendee = false;
-          this.event.registration_count -= 1;
+          // Someone on the waitlist may have taken the seat, so reload the count
+          this.refreshEvent();
           this.snackBar.open('Successfully Unregistered!', '', {
             duration: 2000
           });
@@ -117,9 +117,29 @@ export class EventDetailCard implements OnInit {
    * @returns {void}
    */
   private onSuccess(event_registration: EventRegistration): void {
-    this.event.is_attendee = true;
-    this.event.registration_count += 1;
-    this.snackBar.open('Thanks for registering!', '', { duration: 2000 });
+    this.refreshEvent();
+    if (event_registration.registration_type === RegistrationType.WAITLIST) {
+      this.eventService
+        .getWaitlistPosition(this.event.id!)
+        .subscribe((position) =>
+          this.snackBar.open(
+            `The event is full. You are #${position} on the waitlist.`,
+            '',
+            { duration: 4000 }
+          )
+        );
+    } else {
+      this.snackBar.open('Thanks for registering!', '', { duration: 2000 });
+    }
+  }
+
+  /** Reloads the event to reflect registration changes made by the backend.
+   * @returns {void}
+   */
+  private refreshEvent(): void {
+    this.eventService
+      .getEvent(this.event.id!)
+      .subscribe((event) => (this.event = event));
   }
 
   /** Opens a confirmation snackbar when there is an error creating an event.
@@ -9,7 +9,11 @@
 
 import { Component, Input, OnInit } from '@angular/core';
 import { PageEvent } from '@angular/material/paginator';
-import { Paginated } from 'src/app/pagination';
+import {
+  Paginated,
+  pageEventParams,
+  withLength
+} from 'src/app/pagination';
 import { Profile } from 'src/app/models.module';
 import { EventService } from '../../event.service';
 import { Event } from '../../event.model';
@@ -44,11 +48,20 @@ export class EventUsersList implements OnInit {
   }
 
   handlePageEvent(e: PageEvent) {
-    let paginationParams = this.page.params;
-    paginationParams.page = e.pageIndex;
-    paginationParams.page_size = e.pageSize;
+    let paginationParams = pageEventParams(this.page, e);
     this.eventService
       .getRegisteredUsersForEvent(this.event.id!, paginationParams)
-      .subscribe((page) => (this.page = page));
+      .subscribe((page) => (this.page = withLength(page, this.page)));
+  }
+
+  /** Downloads the event's registrations as a CSV file. */
+  exportRegistrations() {
+    this.eventService.exportRegistrations(this.event.id!).subscribe((csv) => {
+      const link = document.createElement('a');
+      link.href = URL.createObjectURL(csv);
+      link.download = `event-${this.event.id}-registrations.csv`;
+      link.click();
+      URL.revokeObjectURL(link.href);
+    });
   }
 }
@@ -25,5 +25,8 @@ export interface Organization {
   public: boolean;
   slug: string;
   shorthand: string;
+  /** The next few upcoming events, see `OrganizationService.getOrganizationEvents` for all */
   events: Event[] | null;
+  upcoming_event_count: number;
+  event_count: number;
 }
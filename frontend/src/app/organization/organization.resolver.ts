@@ -45,7 +45,9 @@ export const organizationDetailResolver: ResolveFn<Organization | undefined> = (
       youtube: '',
       heel_life: '',
       public: false,
-      events: null
+      events: null,
+      upcoming_event_count: 0,
+      event_count: 0
     };
   }
 
@@ -61,12 +63,12 @@ export const organizationDetailResolver: ResolveFn<Organization | undefined> = (
     );
 };
 
-/** This resolver injects the events for a given organization into the organization component. */
+/** This resolver injects the upcoming events for a given organization into the organization component. */
 export const organizationEventsResolver: ResolveFn<Event[] | undefined> = (
   route,
   state
 ) => {
-  return inject(EventService).getEventsByOrganization(
-    route.paramMap.get('slug')!
-  );
+  return inject(EventService)
+    .getEventsByOrganization(route.paramMap.get('slug')!)
+    .pipe(map((page) => page.items));
 };
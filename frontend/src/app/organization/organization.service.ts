@@ -11,8 +11,10 @@ import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
 import { AuthenticationService } from '../authentication.service';
 import { MatSnackBar } from '@angular/material/snack-bar';
-import { Observable } from 'rxjs';
+import { Observable, map } from 'rxjs';
 import { Organization } from './organization.model';
+import { Event, EventJson, parseEventJson } from '../event/event.model';
+import { Paginated, PaginationParams, paginationQuery } from '../pagination';
 
 @Injectable({
   providedIn: 'root'
@@ -39,6 +41,30 @@ export class OrganizationService {
     return this.http.get<Organization>('/api/organizations/' + slug);
   }
 
+  /** Returns a page of all the events an organization has hosted, past and upcoming.
+   * @param slug: String representing the organization slug
+   * @param params: Pagination parameters
+   * @returns {Observable<Paginated<Event>>}
+   */
+  getOrganizationEvents(
+    slug: string,
+    params: PaginationParams = {
+      page: 0,
+      page_size: 10,
+      order_by: 'time',
+      filter: ''
+    }
+  ): Observable<Paginated<Event>> {
+    let query = paginationQuery(params);
+    return this.http
+      .get<Paginated<EventJson>>(
+        '/api/organizations/' + slug + '/events?' + query.toString()
+      )
+      .pipe(
+        map((page) => ({ ...page, items: page.items.map(parseEventJson) }))
+      );
+  }
+
   /** Returns the new organization object from the backend database table using the backend HTTP post request.
    * @param organization: OrganizationSummary representing the new organization
    * @returns {Observable<Organization>}
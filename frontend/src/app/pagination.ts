@@ -1,12 +1,70 @@
+import { PageEvent } from '@angular/material/paginator';
+
 export interface PaginationParams {
   page: number;
   page_size: number;
   order_by: string;
   filter: string;
+  cursor?: string;
+  count?: boolean;
 }
 
 export interface Paginated<T> {
   items: T[];
-  length: number;
+  length: number | null;
   params: PaginationParams;
+  next_cursor: string | null;
+}
+
+/** Converts pagination parameters to the query string parameters the backend expects. */
+export function paginationQuery(params: PaginationParams): URLSearchParams {
+  let paramStrings: Record<string, string> = {
+    page: params.page.toString(),
+    page_size: params.page_size.toString(),
+    order_by: params.order_by,
+    filter: params.filter
+  };
+  if (params.cursor) {
+    paramStrings['cursor'] = params.cursor;
+  }
+  if (params.count === false) {
+    paramStrings['count'] = 'false';
+  }
+  return new URLSearchParams(paramStrings);
+}
+
+/** Produces the parameters for the page a paginator moved to.
+ *
+ * Moving forward by one page continues after the current page's cursor and skips counting,
+ * since the length is already known. Any other move requests the page by number.
+ */
+export function pageEventParams<T>(
+  current: Paginated<T>,
+  e: PageEvent
+): PaginationParams {
+  let params: PaginationParams = {
+    ...current.params,
+    page: e.pageIndex,
+    page_size: e.pageSize,
+    cursor: undefined,
+    count: true
+  };
+  if (
+    current.next_cursor &&
+    current.length !== null &&
+    e.pageIndex === current.params.page + 1 &&
+    e.pageSize === current.params.page_size
+  ) {
+    params.cursor = current.next_cursor;
+    params.count = false;
+  }
+  return params;
+}
+
+/** Carries the known length over to a page that was retrieved without counting. */
+export function withLength<T>(
+  page: Paginated<T>,
+  previous: Paginated<T>
+): Paginated<T> {
+  return page.length === null ? { ...page, length: previous.length } : page;
 }